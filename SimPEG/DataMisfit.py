@@ -1,4 +1,7 @@
 from __future__ import print_function
+import hashlib
+import weakref
+
 import numpy as np
 import properties
 
@@ -38,6 +41,39 @@ class BaseDataMisfit(ObjectiveFunction.L2ObjectiveFunction):
         else:
             return '*'
 
+    def dpred(self, m, f=None):
+        """dpred(m, f=None)
+
+            Predicted data of the survey. The data of the last fields object
+            are kept (as long as the fields exist), so the misfit, its
+            derivative and the inversion share a single projection.
+        """
+        if f is None:
+            f = self.prob.fields(m)
+        key = hashlib.sha1(np.ascontiguousarray(m)).hexdigest()
+        cache = getattr(self, '_dpred_cache', None)
+        if (
+            cache is not None and cache['key'] == key and
+            cache['fields']() is f
+        ):
+            return cache['dpred']
+
+        dpred = self.survey.dpred(m, f=f)
+        try:
+            self._dpred_cache = {
+                'key': key, 'fields': weakref.ref(f), 'dpred': dpred
+            }
+        except TypeError:  # fields that can not be referenced are not kept
+            self._dpred_cache = None
+        return dpred
+
+    def residual(self, m, f=None):
+        """residual(m, f=None)
+
+            Data residual, d_pred - d_obs, from the shared predicted data.
+        """
+        return Utils.mkvc(self.dpred(m, f=f) - self.survey.dobs)
+
     @property
     def Wd(self):
         raise AttributeError(
@@ -122,7 +158,7 @@ class l2_DataMisfit(BaseDataMisfit):
         "__call__(m, f=None)"
         if f is None:
             f = self.prob.fields(m)
-        R = self.W * self.survey.residual(m, f)
+        R = self.W * self.residual(m, f=f)
         return 0.5*np.vdot(R, R)
 
     @Utils.timeIt
@@ -143,7 +179,7 @@ class l2_DataMisfit(BaseDataMisfit):
         if f is None:
             f = self.prob.fields(m)
         return self.prob.Jtvec(
-            m, self.W.T * (self.W * self.survey.residual(m, f=f)), f=f
+            m, self.W.T * (self.W * self.residual(m, f=f)), f=f
         )
 
     @Utils.timeIt
@@ -156,11 +192,15 @@ class l2_DataMisfit(BaseDataMisfit):
             \mathbf{J}^{\top} \mathbf{W}^{\top} \mathbf{W} \mathbf{J}
 
         :param numpy.ndarray m: model
-        :param numpy.ndarray v: vector
+        :param numpy.ndarray v: vector, or vectors as the columns of an (nP, nV) array
         :param SimPEG.Fields.Fields f: fields object
         """
         if f is None:
             f = self.prob.fields(m)
+        if np.ndim(v) == 2:
+            return self.prob.Jtvec_block(
+                m, self.W * (self.W * self.prob.Jvec_block(m, v, f=f)), f=f
+            )
         return self.prob.Jtvec_approx(
             m, self.W * (self.W * self.prob.Jvec_approx(m, v, f=f)), f=f
         )
@@ -2,9 +2,9 @@ from __future__ import print_function
 
 import properties
 import numpy as np
-import matplotlib.pyplot as plt
 import warnings
 import os
+from multiprocessing.pool import ThreadPool
 
 from . import Utils
 from . import Regularization, DataMisfit, ObjectiveFunction
@@ -105,6 +105,9 @@ class InversionDirective(properties.HasProperties):
         """
         return [objfcts.prob for objfcts in self.dmisfit.objfcts]
 
+    #: Attributes saved by :meth:`checkpoint` to resume the inversion
+    _checkpoint_attrs = []
+
     def initialize(self):
         pass
 
@@ -117,6 +120,25 @@ class InversionDirective(properties.HasProperties):
     def validate(self, directiveList=None):
         return True
 
+    def checkpoint(self):
+        """
+        The state of the directive needed to resume the inversion.
+        """
+        return dict(
+            (name, getattr(self, name)) for name in self._checkpoint_attrs
+            if getattr(self, name, None) is not None
+        )
+
+    def resume(self, state):
+        """
+        Continue an inversion from a checkpoint. By default the directive is
+        initialized again (at the restored model and beta) and then the saved
+        state is set.
+        """
+        self.initialize()
+        for name, value in state.items():
+            setattr(self, name, value)
+
 
 class DirectiveList(object):
 
@@ -178,6 +200,19 @@ class DirectiveList(object):
         [directive.validate(self) for directive in self.dList]
         return True
 
+    def checkpoint(self):
+        return [
+            (directive.__class__.__name__, directive.checkpoint())
+            for directive in self.dList
+        ]
+
+    def resume(self, states):
+        assert [name for name, _ in states] == [
+            directive.__class__.__name__ for directive in self.dList
+        ], 'The directives do not match those of the checkpoint'
+        for directive, (_, state) in zip(self.dList, states):
+            directive.resume(state)
+
 
 class BetaEstimate_ByEig(InversionDirective):
     """BetaEstimate"""
@@ -185,6 +220,22 @@ class BetaEstimate_ByEig(InversionDirective):
     beta0 = None       #: The initial Beta (regularization parameter)
     beta0_ratio = 1e2  #: estimateBeta0 is used with this ratio
 
+    #: 'Rayleigh', 'Power' or 'Lanczos', see :func:`SimPEG.Utils.eigEstMax`
+    method = 'Rayleigh'
+    nVectors = 1  #: Number of random vectors in a block
+    nIter = 4  #: Number of iterations of the power and Lanczos methods
+    n_cpu = 1  #: Estimate the two eigenvalues concurrently if > 1
+    seed = 1  #: Seed of the random vectors
+
+    beta0_band = None  #: (low, high) beta0 given the errors of the eigenvalues
+
+    _checkpoint_attrs = ['beta0', 'beta0_band']
+
+    def resume(self, state):
+        # beta is restored with the inverse problem, no need to estimate it
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def initialize(self):
         """
             The initial beta is calculated by comparing the estimated
@@ -207,6 +258,10 @@ class BetaEstimate_ByEig(InversionDirective):
             .. math::
                 \\beta_0 = \gamma \\frac{\mathbf{x^\\top J^\\top J x}}{\mathbf{x^\\top W^\\top W x}}
 
+            The power and Lanczos methods iterate on blocks of nVectors
+            random vectors for a better estimate of the eigenvalues. The
+            errors of the eigenvalues give the band beta0_band around beta0.
+
             :rtype: float
             :return: beta0
         """
@@ -216,23 +271,46 @@ class BetaEstimate_ByEig(InversionDirective):
 
         m = self.invProb.model
         f = self.invProb.getFields(m, store=True, deleteWarmstart=False)
+        if not isinstance(f, list):
+            f = [f]
 
         # Fix the seed for random vector for consistent result
-        np.random.seed(1)
-        x0 = np.random.rand(*m.shape)
-
-        t, b = 0, 0
-        i_count = 0
-        for dmis, reg in zip(self.dmisfit.objfcts, self.reg.objfcts):
-            # check if f is list
-            if len(self.dmisfit.objfcts) > 1:
-                t += x0.dot(dmis.deriv2(m, x0, f=f[i_count]))
-            else:
-                t += x0.dot(dmis.deriv2(m, x0, f=f))
-            b += x0.dot(reg.deriv2(m, v=x0))
-            i_count += 1
+        np.random.seed(self.seed)
+        x0 = np.random.rand(len(m), self.nVectors)
+
+        def dmisfitOp(V):
+            # the stored fields are used by all the products
+            return self.dmisfit.deriv2(m, V, f=f)
+
+        regH = self.reg.deriv2(m)
 
+        def regOp(V):
+            return regH.dot(V)
+
+        def eig(op):
+            return Utils.eigEstMax(
+                op, len(m), k=self.nVectors, nIter=self.nIter,
+                approach=self.method, X0=x0
+            )
+
+        if self.n_cpu > 1:
+            pool = ThreadPool(2)
+            eig_d, eig_m = pool.map(eig, [dmisfitOp, regOp])
+            pool.close()
+            pool.join()
+        else:
+            eig_d, eig_m = eig(dmisfitOp), eig(regOp)
+
+        (t, t_err), (b, b_err) = eig_d, eig_m
         self.beta0 = self.beta0_ratio*(t/b)
+        self.beta0_band = (
+            self.beta0_ratio*t/(b + b_err),
+            self.beta0_ratio*(t + t_err)/(b - b_err) if b > b_err else np.inf
+        )
+        if self.debug:
+            print('beta0: {0:.3e} in [{1:.3e}, {2:.3e}]'.format(
+                self.beta0, *self.beta0_band
+            ))
         self.invProb.beta = self.beta0
 
 
@@ -301,6 +379,8 @@ class SaveEveryIteration(InversionDirective):
         default="InversionModel"
     )
 
+    _checkpoint_attrs = ['_fileName']
+
     @properties.validator('directory')
     def _ensure_abspath(self, change):
         val = change['value']
@@ -318,6 +398,31 @@ class SaveEveryIteration(InversionDirective):
             )
         return self._fileName
 
+    def resume(self, state):
+        # keep writing to the files of the interrupted inversion
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @property
+    def writer(self):
+        """
+        Background writer of the output files, so that the inversion does not
+        wait on the disk.
+        """
+        if getattr(self, '_writer', None) is None:
+            self._writer = Utils.BackgroundWriter()
+        return self._writer
+
+    def flush(self):
+        """Wait until the output files are written"""
+        if getattr(self, '_writer', None) is not None:
+            self._writer.flush()
+
+    def finish(self):
+        if getattr(self, '_writer', None) is not None:
+            self._writer.close()
+            self._writer = None
+
 
 class SaveModelEveryIteration(SaveEveryIteration):
     """SaveModelEveryIteration
@@ -336,7 +441,7 @@ class SaveModelEveryIteration(SaveEveryIteration):
         )
 
     def endIter(self):
-        np.save(
+        self.writer.save(
             '{0!s}{1:03d}-{2!s}'.format(
                 self.directory + os.path.sep, self.opt.iter, self.fileName
             ), self.opt.xc
@@ -357,16 +462,19 @@ class SaveOutputEveryIteration(SaveEveryIteration):
     phi_m_smooth_z = None
     phi = None
 
+    _checkpoint_attrs = SaveEveryIteration._checkpoint_attrs + [
+        'header', 'beta', 'phi_d', 'phi_m', 'phi_m_small', 'phi_m_smooth_x',
+        'phi_m_smooth_y', 'phi_m_smooth_z', 'phi'
+    ]
+
     def initialize(self):
         if self.save_txt is True:
             print(
                 "SimPEG.SaveOutputEveryIteration will save your inversion "
                 "progress as: '###-{0!s}.txt'".format(self.fileName)
             )
-            f = open(self.fileName+'.txt', 'w')
             self.header = "  #     beta     phi_d     phi_m   phi_m_small     phi_m_smoomth_x     phi_m_smoomth_y     phi_m_smoomth_z      phi\n"
-            f.write(self.header)
-            f.close()
+            self.writer.write_text(self.fileName+'.txt', self.header, mode='w')
 
         # Create a list of each
 
@@ -383,24 +491,15 @@ class SaveOutputEveryIteration(SaveEveryIteration):
 
         phi_s, phi_x, phi_y, phi_z = 0, 0, 0, 0
         for reg in self.reg.objfcts:
-            phi_s += (
-                reg.objfcts[0](self.invProb.model) * reg.alpha_s
-            )
-            phi_x += (
-                reg.objfcts[1](self.invProb.model) * reg.alpha_x
-            )
+            phi = self._objfct_values(reg)
+            phi_s += phi[0] * reg.alpha_s
+            phi_x += phi[1] * reg.alpha_x
 
             if reg.regmesh.dim == 2:
-                phi_y += (
-                    reg.objfcts[2](self.invProb.model) * reg.alpha_y
-                )
+                phi_y += phi[2] * reg.alpha_y
             elif reg.regmesh.dim == 3:
-                phi_y += (
-                    reg.objfcts[2](self.invProb.model) * reg.alpha_y
-                )
-                phi_z += (
-                    reg.objfcts[3](self.invProb.model) * reg.alpha_z
-                )
+                phi_y += phi[2] * reg.alpha_y
+                phi_z += phi[3] * reg.alpha_z
 
         self.beta.append(self.invProb.beta)
         self.phi_d.append(self.invProb.phi_d)
@@ -412,8 +511,8 @@ class SaveOutputEveryIteration(SaveEveryIteration):
         self.phi.append(self.opt.f)
 
         if self.save_txt:
-            f = open(self.fileName+'.txt', 'a')
-            f.write(
+            self.writer.write_text(
+                self.fileName+'.txt',
                 ' {0:3d} {1:1.4e} {2:1.4e} {3:1.4e} {4:1.4e} {5:1.4e} '
                 '{6:1.4e}  {7:1.4e}  {8:1.4e}\n'.format(
                     self.opt.iter,
@@ -427,10 +526,30 @@ class SaveOutputEveryIteration(SaveEveryIteration):
                     self.phi[self.opt.iter-1]
                 )
             )
-            f.close()
+
+    def _objfct_values(self, reg):
+        """
+        Values of the objective functions of reg at the current model. Those
+        of the evaluation of the inversion at that model are reused, or the
+        IRLS state of a sparse regularization at that model.
+        """
+        model = self.invProb.model
+        values = reg.last_values(model)
+        if values is not None:
+            return values
+        if (
+            getattr(reg, 'model', None) is not None and
+            np.array_equal(reg.model, model) and
+            hasattr(reg, 'irls_state')
+        ):
+            return [state['value'] for state in reg.irls_state]
+        return [objfct(model) for objfct in reg.objfcts]
 
     def load_results(self):
-        results = np.loadtxt(self.fileName+str(".txt"), comments="#")
+        self.flush()
+        results = np.loadtxt(
+            self.fileName+str(".txt"), comments="#", ndmin=2
+        )
         self.beta = results[:, 1]
         self.phi_d = results[:, 2]
         self.phi_m = results[:, 3]
@@ -471,6 +590,7 @@ class SaveOutputEveryIteration(SaveEveryIteration):
                 i_target += 1
             self.i_target = i_target
 
+        import matplotlib.pyplot as plt
         fig = plt.figure(figsize=(5, 2))
         ax = plt.subplot(111)
         ax_1 = ax.twinx()
@@ -535,6 +655,7 @@ class SaveOutputEveryIteration(SaveEveryIteration):
                 i_target += 1
             self.i_target = i_target
 
+        import matplotlib.pyplot as plt
         fig = plt.figure(figsize=(5, 8))
         ax1 = plt.subplot(311)
         ax2 = plt.subplot(312)
@@ -579,8 +700,18 @@ class SaveOutputDictEveryIteration(SaveEveryIteration):
     outDict = {}
     saveOnDisk = False
 
+    _checkpoint_attrs = SaveEveryIteration._checkpoint_attrs + [
+        'outDict', '_new_file'
+    ]
+
     def initialize(self):
-        print("SimPEG.SaveOutputDictEveryIteration will save your inversion progress as dictionary: '###-{0!s}.npz'".format(self.fileName))
+        if self.saveOnDisk:
+            print(
+                "SimPEG.SaveOutputDictEveryIteration will save your inversion "
+                "progress as records in: '{0!s}.rec' (see "
+                "SimPEG.Utils.read_records)".format(self.fileName)
+            )
+        self._new_file = True
 
     def endIter(self):
 
@@ -617,10 +748,18 @@ class SaveOutputDictEveryIteration(SaveEveryIteration):
             iterDict['lps'] = self.reg.objfcts[0].norms[0][0]
             iterDict['lpx'] = self.reg.objfcts[0].norms[0][1]
 
-        # Save the file as a npz
+        # Append the record to the file, in the background
         if self.saveOnDisk:
-
-            np.savez('{:03d}-{:s}'.format(self.opt.iter, self.fileName), iterDict)
+            record = dict(iterDict)
+            if isinstance(record['dpred'], list):
+                # one array per data misfit
+                for i, dpred in enumerate(record.pop('dpred')):
+                    record['dpred{:d}'.format(i)] = dpred
+            self.writer.write_record(
+                self.fileName + '.rec', record,
+                mode='wb' if getattr(self, '_new_file', True) else 'ab'
+            )
+            self._new_file = False
 
         self.outDict[self.opt.iter] = iterDict
 
@@ -658,6 +797,41 @@ class Update_IRLS(InversionDirective):
     silent = False
     fix_Jmatrix = False
 
+    _checkpoint_attrs = [
+        'mode', 'IRLSiter', 'iterStart', 'f_old', 'f_change', 'norms',
+        'updateBeta', 'sphericalDomain', 'phi_dm', 'phi_dmx', '_target',
+        '_start'
+    ]
+
+    def checkpoint(self):
+        """
+        The IRLS state, with that of the regularizations: their model,
+        thresholds, norms, scales and stashed IRLS weights (R, which can be
+        from an earlier model).
+        """
+        state = super(Update_IRLS, self).checkpoint()
+        state['regs'] = [
+            {
+                'model': reg.model, 'eps_p': reg.eps_p, 'eps_q': reg.eps_q,
+                'norms': reg.norms,
+                'scales': getattr(reg, 'scales', None),
+                'stashedR': [comp.stashedR for comp in reg.objfcts]
+            }
+            for reg in self.reg.objfcts
+        ]
+        return state
+
+    def resume(self, state):
+        state = dict(state)
+        for reg, reg_state in zip(self.reg.objfcts, state.pop('regs')):
+            for name in ['norms', 'eps_p', 'eps_q', 'model', 'scales']:
+                if reg_state[name] is not None:  # e.g. eps before the IRLS
+                    setattr(reg, name, reg_state[name])
+            for comp, R in zip(reg.objfcts, reg_state['stashedR']):
+                comp.stashedR = R
+        for name, value in state.items():
+            setattr(self, name, value)
+
     @property
     def target(self):
         if getattr(self, '_target', None) is None:
@@ -705,8 +879,7 @@ class Update_IRLS(InversionDirective):
             reg.model = self.invProb.model
 
         for reg in self.reg.objfcts:
-            for comp in reg.objfcts:
-                self.f_old += np.sum(comp.f_m**2. / (comp.f_m**2. + comp.epsilon**2.)**(1 - comp.norm/2.))
+            self.f_old += np.sum([state['phi'] for state in reg.irls_state])
 
         self.phi_dm = []
         self.phi_dmx = []
@@ -757,17 +930,11 @@ class Update_IRLS(InversionDirective):
 
         phim_new = 0
         for reg in self.reg.objfcts:
-            for comp in reg.objfcts:
-                phim_new += np.sum(
-                    comp.f_m**2. /
-                    (comp.f_m**2. + comp.epsilon**2.)**(1 - comp.norm/2.)
-                )
+            phim_new += np.sum([state['phi'] for state in reg.irls_state])
 
         # Update the model used by the regularization
-        phi_m_last = []
         for reg in self.reg.objfcts:
             reg.model = self.invProb.model
-            phi_m_last += [reg(self.invProb.model)]
 
         # After reaching target misfit with l2-norm, switch to IRLS (mode:2)
         if np.all([self.invProb.phi_d < self.start, self.mode == 1]):
@@ -821,12 +988,6 @@ class Update_IRLS(InversionDirective):
                 if getattr(dmis, 'stashedR', None) is not None:
                     dmis.stashedR = None
 
-            # Compute new model objective function value
-
-            phi_m_new = []
-            for reg in self.reg.objfcts:
-                phi_m_new += [reg(self.invProb.model)]
-
             self.f_change = np.abs(self.f_old - phim_new) / self.f_old
 
             if not self.silent:
@@ -905,10 +1066,8 @@ class Update_IRLS(InversionDirective):
         """
         # Currently implemented for MVI-S only
         max_p = []
-        for reg in self.reg.objfcts[0].objfcts:
-            eps_p = reg.epsilon
-            f_m = abs(reg.f_m)
-            max_p += [np.max(f_m)]
+        for state in self.reg.objfcts[0].irls_state:
+            max_p += [np.max(np.abs(state['f_m']))]
 
         max_p = np.asarray(max_p).max()
 
@@ -963,15 +1122,7 @@ class UpdatePreconditioner(InversionDirective):
 
             JtJdiag = np.zeros_like(self.invProb.model)
             for prob, dmisfit in zip(self.prob, self.dmisfit.objfcts):
-
-                    if getattr(prob, 'getJtJdiag', None) is None:
-                        assert getattr(prob, 'getJ', None) is not None, (
-                        "Problem does not have a getJ attribute." +
-                        "Cannot form the sensitivity explicitely"
-                        )
-                        JtJdiag += np.sum(np.power((dmisfit.W*prob.getJ(m)), 2), axis=0)
-                    else:
-                        JtJdiag += prob.getJtJdiag(m, W=dmisfit.W)
+                JtJdiag += prob.getJtJdiag(m, W=dmisfit.W)
 
             self.opt.JtJdiag = JtJdiag
 
@@ -1006,6 +1157,8 @@ class Update_Wj(InversionDirective):
     """
     k = None  # Number of probing cycles
     itr = None  # Iteration number to update Wj, or always update if None
+    blockSize = 10  # Number of probing vectors per Jvec_block and Jtvec_block
+    n_cpu = 1  # Number of threads of Jvec_block and Jtvec_block
 
     def endIter(self):
 
@@ -1013,15 +1166,20 @@ class Update_Wj(InversionDirective):
 
             m = self.invProb.model
             if self.k is None:
-                self.k = int(self.survey.nD/10)
+                self.k = int(np.sum([survey.nD for survey in self.survey])/10)
 
-            def JtJv(v):
+            fields = [prob.fields(m) for prob in self.prob]
 
-                Jv = self.prob.Jvec(m, v)
+            def JtJv(V):
+                JtJV = np.zeros_like(V)
+                for prob, f in zip(self.prob, fields):
+                    JV = prob.Jvec_block(m, V, f=f, n_cpu=self.n_cpu)
+                    JtJV += prob.Jtvec_block(m, JV, f=f, n_cpu=self.n_cpu)
+                return JtJV
 
-                return self.prob.Jtvec(m, Jv)
-
-            JtJdiag = Utils.diagEst(JtJv, len(m), k=self.k)
+            JtJdiag = Utils.diagEst(
+                JtJv, len(m), k=self.k, blockSize=self.blockSize
+            )
             JtJdiag = JtJdiag / max(JtJdiag)
 
             self.reg.wght = JtJdiag
@@ -1067,8 +1225,9 @@ class UpdateSensitivityWeights(InversionDirective):
 
     def getJtJdiag(self):
         """
-            Compute explicitely the main diagonal of JtJ
-            Good for any problem where J is formed explicitely
+            Compute the main diagonal of JtJ of each problem, explicitely if
+            J is formed, otherwise it is estimated (see
+            :meth:`SimPEG.Problem.BaseProblem.getJtJdiag`)
         """
         self.JtJdiag = []
         m = self.invProb.model
@@ -1077,16 +1236,7 @@ class UpdateSensitivityWeights(InversionDirective):
             self.prob,
             self.dmisfit.objfcts
         ):
-
-            if getattr(prob, 'getJtJdiag', None) is None:
-                assert getattr(prob, 'getJ', None) is not None, (
-                    "Problem does not have a getJ attribute." +
-                    "Cannot form the sensitivity explicitely"
-                )
-
-                self.JtJdiag += [mkvc(np.sum((dmisfit.W*prob.getJ(m))**(2.), axis=0))]
-            else:
-                self.JtJdiag += [prob.getJtJdiag(m, W=dmisfit.W)]
+            self.JtJdiag += [mkvc(prob.getJtJdiag(m, W=dmisfit.W))]
 
         return self.JtJdiag
 
@@ -75,13 +75,14 @@ class BaseFDEMProblem(BaseEMProblem):
         f = self.fieldsPair(self.mesh, self.survey)
 
         for freq in self.survey.freqs:
-            A = self.getA(freq)
-            rhs = self.getRHS(freq)
-            Ainv = self.Solver(A, **self.solverOpts)
-            u = Ainv * rhs
-            Srcs = self.survey.getSrcByFreq(freq)
-            f[Srcs, self._solutionType] = u
-            Ainv.clean()
+            with Utils.profiler.span('frequency', freq=freq):
+                A = self.getA(freq)
+                rhs = self.getRHS(freq)
+                Ainv = self.Solver(A, **self.solverOpts)
+                u = Ainv * rhs
+                Srcs = self.survey.getSrcByFreq(freq)
+                f[Srcs, self._solutionType] = u
+                Ainv.clean()
         return f
 
     def Jvec(self, m, v, f=None):
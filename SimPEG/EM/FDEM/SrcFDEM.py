@@ -3,7 +3,6 @@ import numpy as np
 from scipy.constants import mu_0
 import warnings
 
-from geoana.em.static import MagneticDipoleWholeSpace, CircularLoopWholeSpace
 
 from SimPEG.Utils import Zero
 from SimPEG import Survey, Problem, Utils
@@ -311,6 +310,7 @@ class MagDipole(BaseFDEMSrc):
 
     def _srcFct(self, obsLoc, coordinates="cartesian"):
         if getattr(self, '_dipole', None) is None:
+            from geoana.em.static import MagneticDipoleWholeSpace
             self._dipole = MagneticDipoleWholeSpace(
                 mu=self.mu, orientation=self.orientation, location=self.loc,
                 moment=self.moment
@@ -466,6 +466,7 @@ class MagDipole_Bfield(MagDipole):
 
     def _srcFct(self, obsLoc, coordinates="cartesian"):
         if getattr(self, '_dipole', None) is None:
+            from geoana.em.static import MagneticDipoleWholeSpace
             self._dipole = MagneticDipoleWholeSpace(
                 mu=self.mu, orientation=self.orientation, location=self.loc,
                 moment=self.moment
@@ -548,6 +549,7 @@ class CircularLoop(MagDipole):
 
     def _srcFct(self, obsLoc, coordinates="cartesian"):
         if getattr(self, '_loop', None) is None:
+            from geoana.em.static import CircularLoopWholeSpace
             self._loop = CircularLoopWholeSpace(
                 mu=self.mu, location=self.loc,
                 orientation=self.orientation, radius=self.radius,
@@ -2,7 +2,6 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-import matplotlib.pyplot as plt
 import numpy as np
 import numpy.lib.recfunctions as recFunc
 from scipy.constants import mu_0
@@ -13,7 +12,7 @@ from SimPEG.EM.NSEM.SurveyNSEM import Survey, Data
 from SimPEG.EM.NSEM.RxNSEM import (Point_impedance1D,
     Point_impedance3D, Point_tipper3D)
 from SimPEG.EM.NSEM.SrcNSEM import Planewave_xy_1Dprimary
-from SimPEG.EM.NSEM.Utils import MT1Danalytic, plotDataTypes as pDt
+from SimPEG.EM.NSEM.Utils import MT1Danalytic
 
 
 
@@ -288,6 +287,9 @@ def makeAnalyticSolution(mesh, model, elev, freqs):
 
 def plotMT1DModelData(problem, models, symList=None):
 
+    import matplotlib.pyplot as plt
+    from SimPEG.EM.NSEM.Utils import plotDataTypes as pDt
+
     # Setup the figure
     fontSize = 15
 
@@ -383,6 +385,9 @@ def plotImpAppRes(dataArrays, plotLoc, textStr=[]):
     '''
     Plots amplitude impedance and phase
     '''
+    import matplotlib.pyplot as plt
+    from SimPEG.EM.NSEM.Utils import plotDataTypes as pDt
+
     # Make the figure and axes
     fig,axT=plt.subplots(2, 2, sharex=True)
     axes = axT.ravel()
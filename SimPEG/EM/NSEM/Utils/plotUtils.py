@@ -2,8 +2,9 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import division
 
-import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
 
 import properties
 from SimPEG.EM.Utils.EMUtils import mu_0, omega
@@ -50,11 +51,11 @@ class BaseDataNSEMPlots(properties.HasProperties):
     """
     fig = properties.Instance(
         'Figure plotting',
-        plt.Figure,
+        Figure,
         required=False)
     axes = properties.List(
         'List of plot axes',
-        properties.Instance('Axes to plot the on', plt.Axes),
+        properties.Instance('Axes to plot the on', Axes),
         required=False)
 
     def setup(self):
@@ -99,6 +100,7 @@ class TipperAmplitudeStationPlot(BaseDataNSEMPlots):
         """
         Setup a station data plot figure.
         """
+        import matplotlib.pyplot as plt
         self.fig, axes_temp = plt.subplots(1, 2, sharex=True)
         self.axes = axes_temp.ravel().tolist()
         self.fig.set_size_inches((13.5, 4.0))
@@ -176,6 +178,7 @@ class ApperentResPhsStationPlot(BaseDataNSEMPlots):
         """
         Setup a station data plot figure.
         """
+        import matplotlib.pyplot as plt
         self.fig, axes_temp = plt.subplots(2, 2, sharex=True)
         self.axes = axes_temp.ravel().tolist()
         self.fig.set_size_inches((13.5, 7.0))
@@ -302,6 +305,7 @@ class DataNSEMPlotMethods(object):
 
         """
         if ax is None:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(1, 1)
             ax.invert_xaxis()
             ax.set_xscale('log')
@@ -350,6 +354,7 @@ class DataNSEMPlotMethods(object):
         :type comp_plot_dict: dict
         """
         if ax is None:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(1, 1)
             ax.invert_xaxis()
             ax.set_xscale('log')
@@ -397,6 +402,7 @@ class DataNSEMPlotMethods(object):
         :type comp_plot_dict: dict
         """
         if ax is None:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(1, 1)
             ax.invert_xaxis()
             ax.set_xscale('log')
@@ -445,6 +451,7 @@ class DataNSEMPlotMethods(object):
         :type comp_plot_dict: dict
         """
         if ax is None:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(1, 1)
             ax.invert_xaxis()
             ax.set_xscale('log')
@@ -502,6 +509,7 @@ class DataNSEMPlotMethods(object):
         )
         # Make the figure and the axes
         if ax is None:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(1, 1)
         else:
             fig = ax.get_figure()
@@ -526,6 +534,7 @@ class DataNSEMPlotMethods(object):
 
         # Sort the axes
         if ax is None:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(1, 1)
         else:
             fig = ax.get_figure()
@@ -555,6 +564,7 @@ class DataNSEMPlotMethods(object):
 
         # Sort the axes
         if ax is None:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(1, 1)
         else:
             fig = ax.get_figure()
@@ -579,6 +589,7 @@ class DataNSEMPlotMethods(object):
         :param matplotlib.lines.Line2D keyword_arguments plot_kwargs)
 
         """
+        import matplotlib.pyplot as plt
 
         # Sort the axes
         if ax is None:
@@ -1,6 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib
 import properties
 import warnings
 
@@ -634,6 +632,9 @@ class IO(properties.HasProperties):
         """
             Plot 2D pseudo-section for DC-IP data
         """
+        import matplotlib
+        import matplotlib.pyplot as plt
+
         matplotlib.rcParams['font.size'] = 12
 
         if ax is None:
@@ -0,0 +1,364 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import numpy as np
+import properties
+
+from SimPEG import Utils
+from . import RxDC as Rx
+from . import SrcDC as Src
+
+
+class SurveyArrays(properties.HasProperties):
+    """
+    Columnar representation of a DC survey
+
+    Every datum is described by the indices of its A, B, M and N electrodes
+    in a table of unique electrode locations. Pole electrodes (B for pole
+    sources, N for pole receivers) are flagged with an index of -1 and are
+    treated as being at infinity.
+
+    All geometry calculations are done on the index arrays, so surveys with
+    millions of quadripoles never need to be expanded into lists of
+    :class:`SrcDC.BaseSrc` and :class:`RxDC.BaseRx` objects. Use
+    :meth:`to_srcList` (or :meth:`to_survey`) when the objects are needed
+    for a simulation.
+    """
+
+    electrodes = properties.Array(
+        "unique locations of a, b, m, n electrodes",
+        shape=('*', '*'),  # ('*', 3) for 3D or ('*', 2) for 2D
+        dtype=float
+    )
+
+    a = properties.Array(
+        "indices of the positive (+) current electrodes",
+        shape=('*',),
+        dtype=int
+    )
+
+    b = properties.Array(
+        "indices of the negative (-) current electrodes (-1 for a pole)",
+        shape=('*',),
+        dtype=int
+    )
+
+    m = properties.Array(
+        "indices of the positive (+) potential electrodes",
+        shape=('*',),
+        dtype=int
+    )
+
+    n = properties.Array(
+        "indices of the negative (-) potential electrodes (-1 for a pole)",
+        shape=('*',),
+        dtype=int
+    )
+
+    def __init__(self, electrodes, a, b, m, n, **kwargs):
+        super(SurveyArrays, self).__init__(**kwargs)
+        self.electrodes = np.atleast_2d(electrodes)
+        self.a = np.asarray(a)
+        self.b = np.asarray(b)
+        self.m = np.asarray(m)
+        self.n = np.asarray(n)
+        self.validate()
+
+    @properties.validator
+    def _check_lengths(self):
+        nD = self.a.size
+        if not (self.b.size == self.m.size == self.n.size == nD):
+            raise properties.ValidationError(
+                "a, b, m and n must have the same number of data"
+            )
+        if np.any(self.a < 0) or np.any(self.m < 0):
+            raise properties.ValidationError(
+                "a and m electrodes can not be poles at infinity"
+            )
+        nE = self.electrodes.shape[0]
+        for ind in [self.a, self.b, self.m, self.n]:
+            if nD > 0 and ind.max() >= nE:
+                raise properties.ValidationError(
+                    "electrode indices exceed the number of electrodes"
+                )
+
+    @classmethod
+    def from_locations(
+        cls, a_locations, b_locations=None, m_locations=None,
+        n_locations=None
+    ):
+        """
+        Build the columnar survey from (nD x dim) electrode location arrays.
+        Pass None for b_locations (pole sources) or n_locations (pole
+        receivers); rows of NaN flag individual poles.
+        """
+        a_locations = np.atleast_2d(a_locations)
+        nD, dim = a_locations.shape
+        if m_locations is None:
+            raise Exception("m_locations are required")
+
+        locs = np.vstack([
+            np.full((nD, dim), np.nan) if loc is None else np.atleast_2d(loc)
+            for loc in [a_locations, b_locations, m_locations, n_locations]
+        ])
+        isElectrode = ~np.isnan(locs[:, 0])
+
+        electrodes, _, invInd = Utils.uniqueRows(locs[isElectrode])
+        inds = -np.ones(4*nD, dtype=int)
+        inds[isElectrode] = invInd
+
+        return cls(electrodes, *inds.reshape((4, nD)))
+
+    @classmethod
+    def from_survey(cls, survey):
+        """
+        Build the columnar survey from a list-based DC survey. Pole
+        electrodes are detected from the source and receiver types.
+        """
+        a, b, m, n = [], [], [], []
+        for src in survey.srcList:
+            if isinstance(src, Src.Dipole):
+                locA, locB = src.loc[0], src.loc[1]
+            else:
+                locA, locB = src.loc, np.nan*np.asarray(src.loc, dtype=float)
+            for rx in src.rxList:
+                nRx = rx.nD
+                a.append(np.repeat(np.atleast_2d(locA), nRx, axis=0))
+                b.append(np.repeat(np.atleast_2d(locB), nRx, axis=0))
+                if isinstance(rx, (Rx.Dipole, Rx.Dipole_ky)):
+                    m.append(rx.locs[0])
+                    n.append(rx.locs[1])
+                else:
+                    m.append(rx.locs)
+                    n.append(np.full(rx.locs.shape, np.nan))
+
+        return cls.from_locations(*[np.vstack(loc) for loc in [a, b, m, n]])
+
+    @property
+    def nD(self):
+        """Number of data"""
+        return self.a.size
+
+    @property
+    def dim(self):
+        """Dimension of the electrode locations"""
+        return self.electrodes.shape[1]
+
+    @property
+    def survey_type(self):
+        """
+        Survey type shared by all data ('dipole-dipole', 'pole-dipole',
+        'dipole-pole' or 'pole-pole'), None if the survey is mixed
+        """
+        src = np.unique(self.b >= 0)
+        rx = np.unique(self.n >= 0)
+        if src.size > 1 or rx.size > 1:
+            return None
+        return "{}-{}".format(
+            "dipole" if src[0] else "pole", "dipole" if rx[0] else "pole"
+        )
+
+    def _locations(self, ind, fallback):
+        return self.electrodes[np.where(ind >= 0, ind, fallback)]
+
+    @property
+    def a_locations(self):
+        """Locations of the A electrodes"""
+        return self.electrodes[self.a]
+
+    @property
+    def b_locations(self):
+        """Locations of the B electrodes, A locations for pole sources"""
+        return self._locations(self.b, self.a)
+
+    @property
+    def m_locations(self):
+        """Locations of the M electrodes"""
+        return self.electrodes[self.m]
+
+    @property
+    def n_locations(self):
+        """Locations of the N electrodes, M locations for pole receivers"""
+        return self._locations(self.n, self.m)
+
+    def _distance(self, ind0, ind1):
+        r = np.linalg.norm(
+            self.electrodes[ind0] - self.electrodes[ind1], axis=1
+        )
+        r[(ind0 < 0) | (ind1 < 0)] = np.inf
+        return r
+
+    def electrode_separations(self, electrode_pair='All'):
+        """
+        Calculate electrode separation distances. Separations involving a
+        pole at infinity are returned as inf.
+
+        :param list electrode_pair: pairs to compute, a subset of
+            ['AB', 'MN', 'AM', 'AN', 'BM', 'BN']
+        :rtype: dict
+        :return: electrode separation distances keyed by electrode pair
+        """
+        if isinstance(electrode_pair, str) and electrode_pair == 'All':
+            electrode_pair = ['AB', 'MN', 'AM', 'AN', 'BM', 'BN']
+        elif isinstance(electrode_pair, str):
+            electrode_pair = [electrode_pair]
+
+        inds = {'A': self.a, 'B': self.b, 'M': self.m, 'N': self.n}
+        return {
+            pair: self._distance(inds[pair[0]], inds[pair[1]])
+            for pair in electrode_pair
+        }
+
+    def geometric_factor(self, survey_type=None, space_type='half-space'):
+        """
+        Calculate the geometric factor assuming that data are normalized
+        voltages.
+
+        :param str survey_type: ignore the B and/or N electrodes as for the
+            given survey type. If None, poles are taken from the indices
+        :param str space_type: 'whole-space' | 'half-space'
+        :rtype: numpy.ndarray
+        :return: geometric factor
+        """
+        if space_type == 'whole-space':
+            spaceFact = 4.
+        elif space_type == 'half-space':
+            spaceFact = 2.
+        else:
+            raise Exception(
+                """'space_type must be 'whole-space' | 'half-space'"""
+            )
+
+        b, n = self.b, self.n
+        if survey_type is not None:
+            if survey_type not in [
+                'dipole-dipole', 'pole-dipole', 'dipole-pole', 'pole-pole'
+            ]:
+                raise Exception(
+                    """survey_type must be 'dipole-dipole' | 'pole-dipole' |
+                    'dipole-pole' | 'pole-pole'"""
+                    " not {}".format(survey_type)
+                )
+            src_type, rx_type = survey_type.split('-')
+            if src_type == 'pole':
+                b = -np.ones_like(b)
+            if rx_type == 'pole':
+                n = -np.ones_like(n)
+
+        # 1/r vanishes for electrodes at infinity
+        G = (
+            1./self._distance(self.a, self.m) -
+            1./self._distance(b, self.m) -
+            1./self._distance(self.a, n) +
+            1./self._distance(b, n)
+        )
+        return G/(spaceFact*np.pi)
+
+    def apparent_resistivity(
+        self, dobs, survey_type=None, space_type='half-space', eps=1e-10
+    ):
+        """
+        Calculate apparent resistivity from normalized voltages (V/A)
+
+        :param numpy.ndarray dobs: normalized voltage measurements [V/A]
+        :param str survey_type: see :meth:`geometric_factor`
+        :param str space_type: 'whole-space' | 'half-space'
+        :param float eps: Regularizer in case of a null geometric factor
+        :rtype: numpy.ndarray
+        :return: apparent resistivity
+        """
+        G = self.geometric_factor(
+            survey_type=survey_type, space_type=space_type
+        )
+        return np.abs(dobs*(1./(G+eps)))
+
+    def source_receiver_midpoints(self):
+        """
+        Calculate the pseudo-section location of every datum
+
+        :rtype: tuple
+        :return: midpoints x location, midpoints z location
+        """
+        A, M = self.a_locations, self.m_locations
+        B, N = self.b_locations, self.n_locations
+        Cmid = (A[:, 0] + B[:, 0])/2.
+        Pmid = (M[:, 0] + N[:, 0])/2.
+        zsrc = (A[:, -1] + B[:, -1])/2.
+
+        midx = (Cmid + Pmid)/2.
+        midz = -np.abs(Cmid - Pmid)/2. + zsrc
+        return midx, midz
+
+    def to_srcList(self, ky=False):
+        """
+        Expand the columnar survey into a list of sources. Consecutive data
+        sharing the same A and B electrodes are grouped into one source and,
+        within a source, consecutive data of the same receiver type into one
+        receiver, so the data order is preserved.
+
+        :param bool ky: use the 2.5D receivers
+        :rtype: list
+        :return: list of DC sources
+        """
+        if ky:
+            rxDipole, rxPole = Rx.Dipole_ky, Rx.Pole_ky
+        else:
+            rxDipole, rxPole = Rx.Dipole, Rx.Pole
+
+        nD = self.nD
+        if nD == 0:
+            return []
+
+        isDipoleRx = self.n >= 0
+        srcBreaks = np.r_[
+            True, (self.a[1:] != self.a[:-1]) | (self.b[1:] != self.b[:-1])
+        ]
+        rxBreaks = srcBreaks | np.r_[True, isDipoleRx[1:] != isDipoleRx[:-1]]
+        srcStarts = np.r_[np.flatnonzero(srcBreaks), nD]
+        rxStarts = np.r_[np.flatnonzero(rxBreaks), nD]
+
+        srcList = []
+        irx = 0
+        for isrc in range(srcStarts.size - 1):
+            start, end = srcStarts[isrc], srcStarts[isrc+1]
+            rxList = []
+            while rxStarts[irx] < end:
+                inds = slice(rxStarts[irx], rxStarts[irx+1])
+                if isDipoleRx[rxStarts[irx]]:
+                    rxList.append(rxDipole(
+                        self.electrodes[self.m[inds]],
+                        self.electrodes[self.n[inds]]
+                    ))
+                else:
+                    rxList.append(rxPole(self.electrodes[self.m[inds]]))
+                irx += 1
+
+            locA = self.electrodes[self.a[start]]
+            if self.b[start] >= 0:
+                src = Src.Dipole(
+                    rxList, locA, self.electrodes[self.b[start]]
+                )
+            else:
+                src = Src.Pole(rxList, locA)
+            srcList.append(src)
+
+        return srcList
+
+    def to_survey(self, ky=None):
+        """
+        Create a DC survey backed by these arrays. The list of sources is
+        only built when it is first accessed.
+
+        :param bool ky: create a 2.5D survey, defaults to True for 2D
+            electrode locations
+        :rtype: SimPEG.EM.Static.DC.Survey
+        :return: DC survey
+        """
+        from .SurveyDC import Survey, Survey_ky
+        if ky is None:
+            ky = self.dim == 2
+        if ky:
+            return Survey_ky(survey_arrays=self)
+        return Survey(survey_arrays=self)
@@ -6,6 +6,7 @@ from __future__ import unicode_literals
 import SimPEG
 from . import RxDC as Rx
 from . import SrcDC as Src
+from .SurveyArrays import SurveyArrays
 from SimPEG.EM.Base import BaseEMSurvey
 import numpy as np
 from scipy.interpolate import interp1d, NearestNDInterpolator
@@ -67,9 +68,52 @@ class Survey(BaseEMSurvey, properties.HasProperties):
 
     electrodes_info = None
     topo_function = None
-
-    def __init__(self, srcList, **kwargs):
-        BaseEMSurvey.__init__(self, srcList, **kwargs)
+    survey_arrays = None  #: columnar SurveyArrays backing a lazy srcList
+
+    _ky = False  # use the 2.5D receivers when expanding survey_arrays
+
+    def __init__(self, srcList=None, survey_arrays=None, **kwargs):
+        if srcList is None:
+            if survey_arrays is None:
+                raise Exception("Provide either a srcList or survey_arrays")
+            # the srcList is built from the arrays on first access
+            self.survey_arrays = survey_arrays
+            SimPEG.Survey.BaseSurvey.__init__(self, **kwargs)
+        else:
+            BaseEMSurvey.__init__(self, srcList, **kwargs)
+
+    @property
+    def srcList(self):
+        """Source List"""
+        if (
+            getattr(self, '_srcList', None) is None and
+            self.survey_arrays is not None
+        ):
+            self.srcList = self.survey_arrays.to_srcList(ky=self._ky)
+        return getattr(self, '_srcList', None)
+
+    @srcList.setter
+    def srcList(self, value):
+        SimPEG.Survey.BaseSurvey.srcList.fset(self, value)
+
+    @property
+    def nD(self):
+        """Number of data"""
+        if (
+            getattr(self, '_srcList', None) is None and
+            self.survey_arrays is not None
+        ):
+            return self.survey_arrays.nD
+        return BaseEMSurvey.nD.fget(self)
+
+    def get_survey_arrays(self):
+        """
+        Columnar representation of the survey, built from the srcList if
+        the survey was not created from arrays.
+        """
+        if self.survey_arrays is None:
+            self.survey_arrays = SurveyArrays.from_survey(self)
+        return self.survey_arrays
 
     def set_geometric_factor(
         self,
@@ -92,6 +136,13 @@ class Survey(BaseEMSurvey, properties.HasProperties):
         return geometric_factor
 
     def getABMN_locations(self):
+        if self.survey_arrays is not None:
+            self.a_locations = self.survey_arrays.a_locations
+            self.b_locations = self.survey_arrays.b_locations
+            self.m_locations = self.survey_arrays.m_locations
+            self.n_locations = self.survey_arrays.n_locations
+            return
+
         a_locations = []
         b_locations = []
         m_locations = []
@@ -315,6 +366,9 @@ class Survey(BaseEMSurvey, properties.HasProperties):
                     "Input valid survey survey_geometry: surface or borehole"
                     )
 
+        # Sources and receivers were moved, rebuild the arrays when needed
+        self.survey_arrays = None
+
 
 class Survey_ky(Survey):
     """
@@ -323,9 +377,12 @@ class Survey_ky(Survey):
     rxPair = Rx.BaseRx
     srcPair = Src.BaseSrc
     _pred = None
+    _ky = True
 
-    def __init__(self, srcList, **kwargs):
-        BaseEMSurvey.__init__(self, srcList, **kwargs)
+    def __init__(self, srcList=None, survey_arrays=None, **kwargs):
+        Survey.__init__(
+            self, srcList=srcList, survey_arrays=survey_arrays, **kwargs
+        )
 
     def eval(self, f):
         """
@@ -1,6 +1,7 @@
 from .ProblemDC import Problem3D_CC, Problem3D_N, BaseDCProblem
 from .ProblemDC_2D import Problem2D_CC, Problem2D_N, BaseDCProblem_2D
 from .SurveyDC import Survey, Survey_ky
+from .SurveyArrays import SurveyArrays
 from . import SrcDC as Src   # Pole
 from . import RxDC as Rx
 from .FieldsDC import FieldsDC, Fields_CC, Fields_N
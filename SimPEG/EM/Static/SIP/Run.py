@@ -1,8 +1,5 @@
 import numpy as np
-from SimPEG import (
-    Maps, DataMisfit, Regularization,
-    Optimization, Inversion, InvProblem, Directives
-)
+from SimPEG import Maps, DataMisfit, Regularization, InvProblem
 
 
 def spectral_ip_mappings(
@@ -89,6 +86,8 @@ def run_inversion(
     """
     Run Spectral Spectral IP inversion
     """
+    from SimPEG import Optimization, Inversion, Directives
+
     dmisfit = DataMisfit.l2_DataMisfit(survey)
     uncert = abs(survey.dobs) * std + eps
     dmisfit.W = 1./uncert
@@ -5,12 +5,23 @@ from __future__ import unicode_literals
 
 import numpy as np
 from numpy import matlib
+from scipy.spatial import cKDTree
 
 from SimPEG import Utils, Mesh
 from SimPEG.EM.Static import DC
 from SimPEG.Utils import asArray_N_x_Dim, uniqueRows
 
 
+def _survey_arrays(dc_survey):
+    """
+        Return the columnar DC.SurveyArrays backing dc_survey, or None for a
+        list-based survey.
+    """
+    if isinstance(dc_survey, DC.SurveyArrays):
+        return dc_survey
+    return getattr(dc_survey, 'survey_arrays', None)
+
+
 def electrode_separations(
     dc_survey, survey_type='dipole-dipole', electrode_pair='All'
 ):
@@ -25,7 +36,20 @@ def electrode_separations(
         Output:
         :return list ***: electrodes [A,B] separation distances
 
+        .. note::
+
+            For surveys backed by DC.SurveyArrays the separations are
+            computed on the electrode index arrays, separations to a pole
+            are returned as inf.
+
     """
+    survey_arrays = _survey_arrays(dc_survey)
+    if survey_arrays is not None:
+        if isinstance(electrode_pair, np.ndarray):
+            electrode_pair = list(electrode_pair)
+        return survey_arrays.electrode_separations(
+            electrode_pair=electrode_pair
+        )
 
     if not isinstance(electrode_pair, np.ndarray):
         if electrode_pair == 'All':
@@ -138,6 +162,9 @@ def source_receiver_midpoints(dc_survey, survey_type='dipole-dipole', dim=2):
         :return numpy.ndarray midx: midpoints x location
         :return numpy.ndarray midz: midpoints  z location
     """
+    survey_arrays = _survey_arrays(dc_survey)
+    if survey_arrays is not None:
+        return survey_arrays.source_receiver_midpoints()
 
     # Pre-allocate
     midx = []
@@ -221,6 +248,12 @@ def geometric_factor(
         :return numpy.ndarray G: Geometric Factor
 
     """
+    survey_arrays = _survey_arrays(dc_survey)
+    if survey_arrays is not None:
+        return survey_arrays.geometric_factor(
+            survey_type=survey_type, space_type=space_type
+        )
+
     # Set factor for whole-space or half-space assumption
     if space_type == 'whole-space':
         spaceFact = 4.
@@ -627,6 +660,94 @@ def gen_DCIPsurvey(endl, survey_type, a, b, n, dim=3, d2flag='2.5D'):
     return survey
 
 
+def gen_DCIPsurvey_arrays(endl, survey_type, a, b, n, dim=3):
+    """
+        Vectorized counterpart of gen_DCIPsurvey. The stations are generated
+        as columnar arrays of electrode indices and no Src or Rx objects are
+        created until the srcList of the returned survey is accessed.
+
+        Input:
+        :param numpy.ndarray endl: input endpoints [x1, y1, z1, x2, y2, z2]
+        :param str survey_type: 'dipole-dipole' | 'pole-dipole' |
+            'dipole-pole' | 'pole-pole'
+        :param int a: pole seperation
+        :param int b: dipole separation
+        :param int n: number of rx dipoles per tx
+        :param int dim: dimension of the electrode locations
+
+        Output:
+        :return SimPEG.EM.Static.DC.SurveyArrays survey_arrays: DC survey in
+            columnar form, use survey_arrays.to_survey() for a DC survey
+    """
+    if survey_type not in [
+        'dipole-dipole', 'pole-dipole', 'dipole-pole', 'pole-pole'
+    ]:
+        raise Exception(
+            """survey_type must be either 'pole-dipole', 'dipole-dipole',
+            'dipole-pole' or 'pole-pole'"""
+            " not {}".format(survey_type)
+        )
+    dipoleSrc = survey_type.startswith('dipole')
+    dipoleRx = survey_type.endswith('dipole')
+
+    # Mesure survey length and direction
+    dl_len = np.sqrt(
+        (endl[1, 0] - endl[0, 0])**2. + (endl[1, 1] - endl[0, 1])**2.
+    )
+    dl_x = (endl[1, 0] - endl[0, 0]) / dl_len
+    dl_y = (endl[1, 1] - endl[0, 1]) / dl_len
+
+    nstn = int(np.floor(dl_len / a))
+
+    # Compute discrete pole location along line
+    stn_x = endl[0, 0] + np.arange(nstn)*dl_x*a
+    stn_y = endl[0, 1] + np.arange(nstn)*dl_y*a
+
+    if dim == 2:
+        ztop = np.ones(nstn)*endl[0, 1]
+        M = np.c_[stn_x, ztop]
+        N = np.c_[stn_x+a*dl_x, ztop]
+    elif dim == 3:
+        stn_z = np.ones(nstn)*endl[0, 2]
+        M = np.c_[stn_x, stn_y, stn_z]
+        N = np.c_[stn_x+a*dl_x, stn_y+a*dl_y, stn_z]
+    else:
+        raise Exception("dim must be 2 or 3, not {}".format(dim))
+
+    # Current electrode separation to the end of the line for each source
+    src = np.arange(nstn - 1)
+    ref = N[src] if dipoleSrc else M[src]
+    AB = np.sqrt(
+        (endl[1, 0] - ref[:, 0])**2. + (endl[1, 1] - ref[:, 1])**2.
+    )
+
+    # Number of receivers fitting after each source
+    nRx = np.minimum(np.floor((AB - b) / a), n).astype(int)
+    src, nRx = src[nRx > 0], nRx[nRx > 0]
+
+    # One row per datum: source index and receiver number k along the line
+    src = np.repeat(src, nRx)
+    k = np.arange(nRx.sum()) - np.repeat(np.cumsum(nRx) - nRx, nRx)
+
+    rx_x = N[src, 0] + dl_x*b + k*dl_x*a
+    rx_y = N[src, 1] + dl_y*b + k*dl_y*a
+    if dim == 3:
+        rx_z = np.ones(src.size)*endl[0, 2]
+        P1 = np.c_[rx_x, rx_y, rx_z]
+        P2 = np.c_[rx_x+a*dl_x, rx_y+a*dl_y, rx_z]
+    else:
+        rx_z = np.ones(src.size)*endl[0, 1]
+        P1 = np.c_[rx_x, rx_z]
+        P2 = np.c_[rx_x+a*dl_x, rx_z]
+
+    return DC.SurveyArrays.from_locations(
+        M[src],
+        N[src] if dipoleSrc else None,
+        P1,
+        P2 if dipoleRx else None
+    )
+
+
 def writeUBC_DCobs(
     fileName, dc_survey, dim, format_type,
     survey_type='dipole-dipole', ip_type=0,
@@ -1485,79 +1606,23 @@ def gettopoCC(mesh, actind, option="top"):
     """
         Get topography from active indices of mesh.
     """
+    surface_index = Utils.get_surface_index(mesh)
 
     if mesh._meshType == "TENSOR":
+        _, topoCC = surface_index.surface(actind, option=option)
 
         if mesh.dim == 3:
-
             mesh2D = Mesh.TensorMesh([mesh.hx, mesh.hy], mesh.x0[:2])
-            zc = mesh.gridCC[:, 2]
-            ACTIND = actind.reshape(
-                (mesh.vnC[0]*mesh.vnC[1], mesh.vnC[2]),
-                order='F'
-                )
-            ZC = zc.reshape((mesh.vnC[0]*mesh.vnC[1], mesh.vnC[2]), order='F')
-            topoCC = np.zeros(ZC.shape[0])
-
-            for i in range(ZC.shape[0]):
-                ind = np.argmax(ZC[i, :][ACTIND[i, :]])
-                if option == "top":
-                    dz = mesh.hz[ACTIND[i, :]][ind] * 0.5
-                elif option == "center":
-                    dz = 0.
-                else:
-                    raise Exception()
-                topoCC[i] = (
-                    ZC[i, :][ACTIND[i, :]].max() + dz
-                    )
             return mesh2D, topoCC
 
         elif mesh.dim == 2:
-
             mesh1D = Mesh.TensorMesh([mesh.hx], [mesh.x0[0]])
-            yc = mesh.gridCC[:, 1]
-            ACTIND = actind.reshape((mesh.vnC[0], mesh.vnC[1]), order='F')
-            YC = yc.reshape((mesh.vnC[0], mesh.vnC[1]), order='F')
-            topoCC = np.zeros(YC.shape[0])
-            for i in range(YC.shape[0]):
-                ind = np.argmax(YC[i, :][ACTIND[i, :]])
-                if option == "top":
-                    dy = mesh.hy[ACTIND[i, :]][ind] * 0.5
-                elif option == "center":
-                    dy = 0.
-                else:
-                    raise Exception()
-                topoCC[i] = (
-                    YC[i, :][ACTIND[i, :]].max() + dy
-                    )
             return mesh1D, topoCC
 
     elif mesh._meshType == "TREE":
         if mesh.dim == 3:
-            core_inds = np.isin(
-                mesh.h_gridded,
-                np.r_[mesh.hx.min(), mesh.hy.min(), mesh.hz.min()]
-            ).all(axis=1)
-
-            act_core_inds = actind[core_inds]
-
-            uniqXY = uniqueRows(mesh.gridCC[core_inds, :2])
-            npts = uniqXY[0].shape[0]
-            ZC = mesh.gridCC[core_inds, 2]
-            topoCC = np.zeros(npts)
-            if option == "top":
-                # TODO: this assume same hz, need to be modified
-                dz = mesh.hz.min() * 0.5
-            elif option == "center":
-                dz = 0.
-            for i in range(npts):
-                inds = uniqXY[2] == i
-                actind_z = act_core_inds[inds]
-                if actind_z.sum() > 0.:
-                    topoCC[i] = (ZC[inds][actind_z]).max() + dz
-                else:
-                    topoCC[i] = (ZC[inds]).max() + dz
-            return uniqXY[0], topoCC
+            # Columns of the core (finest) cells
+            return surface_index.surface(actind, option=option)
         else:
             raise NotImplementedError(
                 "gettopoCC is not implemented for Quad tree mesh"
@@ -1580,18 +1645,20 @@ def drapeTopotoLoc(mesh, pts, actind=None, option="top", topo=None):
     if actind is None:
         actind = Utils.surface2ind_topo(mesh, topo)
     if mesh._meshType == "TENSOR":
-        meshtemp, topoCC = gettopoCC(mesh, actind, option=option)
-        inds = Utils.closestPoints(meshtemp, pts)
-        topo = topoCC[inds]
+        _, topo = Utils.get_surface_index(mesh).drape(
+            pts, actind, option=option
+        )
         if mesh.dim == 3:
             out = np.c_[pts[:, :2], topo]
         else:
             out = np.c_[pts, topo]
     elif mesh._meshType == "TREE":
         if mesh.dim == 3:
-            uniqXYlocs, topoCC = gettopoCC(mesh, actind, option=option)
-            inds = closestPointsGrid(uniqXYlocs, pts)
-            out = np.c_[uniqXYlocs[inds, :], topoCC[inds]]
+            uniqXYlocs, _ = gettopoCC(mesh, actind, option=option)
+            inds, topo = Utils.get_surface_index(mesh).drape(
+                pts, actind, option=option
+            )
+            out = np.c_[uniqXYlocs[inds, :], topo]
         else:
             raise NotImplementedError()
     else:
@@ -1630,15 +1697,8 @@ def closestPointsGrid(grid, pts, dim=2):
     """
 
     pts = asArray_N_x_Dim(pts, dim)
-    nodeInds = np.empty(pts.shape[0], dtype=int)
-
-    for i, pt in enumerate(pts):
-        if dim == 1:
-            nodeInds[i] = ((pt - grid)**2.).argmin()
-        else:
-            nodeInds[i] = (
-                (np.tile(
-                    pt, (grid.shape[0], 1)) - grid)**2.).sum(axis=1).argmin()
+    grid = np.asarray(grid, dtype=float).reshape((-1, pts.shape[1]))
+    _, nodeInds = cKDTree(grid).query(pts)
 
     return nodeInds
 
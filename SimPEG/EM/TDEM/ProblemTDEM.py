@@ -83,9 +83,10 @@ class BaseTDEMProblem(Problem.BaseTimeProblem, BaseEMProblem):
                 print('    Solving...   (tInd = {:d})'.format(tInd+1))
 
             # taking a step
-            sol = Ainv * (
-                rhs - Asubdiag * f[:, (self._fieldType + 'Solution'), tInd]
-            )
+            with Utils.profiler.span('timestep', tInd=tInd+1, dt=dt):
+                sol = Ainv * (
+                    rhs - Asubdiag * f[:, (self._fieldType + 'Solution'), tInd]
+                )
 
             if self.verbose:
                 print('    Done...')
@@ -5,7 +5,6 @@ from scipy.constants import mu_0
 import properties
 import warnings
 
-from geoana.em.static import MagneticDipoleWholeSpace, CircularLoopWholeSpace
 
 from SimPEG import Utils
 from SimPEG.Utils import Zero, Identity
@@ -323,6 +322,7 @@ class MagDipole(BaseTDEMSrc):
 
     def _srcFct(self, obsLoc, coordinates="cartesian"):
         if getattr(self, '_dipole', None) is None:
+            from geoana.em.static import MagneticDipoleWholeSpace
             self._dipole = MagneticDipoleWholeSpace(
                 mu=self.mu, orientation=self.orientation, location=self.loc,
                 moment=self.moment
@@ -502,6 +502,7 @@ class CircularLoop(MagDipole):
         # )
 
         if getattr(self, '_loop', None) is None:
+            from geoana.em.static import CircularLoopWholeSpace
             self._loop = CircularLoopWholeSpace(
                 mu=self.mu, location=self.loc,
                 orientation=self.orientation, radius=self.radius,
@@ -7,5 +7,7 @@ from . import FDEM
 from . import NSEM
 from . import Static
 from . import Base
-from . import Analytics
 from . import Utils
+
+from SimPEG.Utils import lazySubmodules
+lazySubmodules(globals(), {'Analytics': 'Analytics'})
@@ -263,34 +263,54 @@ class RichardsProblem(Problem.BaseTimeProblem):
 
         return r, J
 
+    def jacobian_blocks(self, m=None, f=None):
+        """Per time step blocks of the Jacobian system for the fields f
+
+        The blocks are kept until the model changes, or until the
+        blocks for different fields are requested, so repeated calls to
+        :code:`Jvec` and :code:`Jtvec` reuse the blocks and their
+        factorizations.
+
+        :param numpy.ndarray m: model
+        :param list f: fields
+        :rtype: RichardsJacobian
+        """
+        if f is None:
+            f = self.fields(m)
+        elif m is not None:
+            self.model = m
+
+        blocks = getattr(self, '_jacobian_blocks', None)
+        if blocks is None or blocks.f is not f:
+            if blocks is not None:
+                blocks.clean()
+            blocks = RichardsJacobian(self, m, f)
+            self._jacobian_blocks = blocks
+        return blocks
+
+    @properties.observer('model')
+    def _on_model_change_jacobian(self, change):
+        blocks = getattr(self, '_jacobian_blocks', None)
+        if blocks is None or change['previous'] is change['value']:
+            return
+        if (
+            isinstance(change['previous'], np.ndarray) and
+            isinstance(change['value'], np.ndarray) and
+            np.allclose(change['previous'], change['value'])
+        ):
+            return
+        blocks.clean()
+        self._jacobian_blocks = None
+
     @Utils.timeIt
     def Jfull(self, m=None, f=None):
         if f is None:
             f = self.fields(m)
 
-        nn = len(f)-1
-        Asubs, Adiags, Bs = list(range(nn)), list(range(nn)), list(range(nn))
-        for ii in range(nn):
-            dt = self.timeSteps[ii]
-            bc = self.getBoundaryConditions(ii, f[ii])
-            Asubs[ii], Adiags[ii], Bs[ii] = self.diagsJacobian(
-                m, f[ii], f[ii+1], dt, bc
-            )
-        Ad = sp.block_diag(Adiags)
-        zRight = Utils.spzeros(
-            (len(Asubs)-1)*Asubs[0].shape[0], Adiags[0].shape[1]
-        )
-        zTop = Utils.spzeros(
-            Adiags[0].shape[0], len(Adiags)*Adiags[0].shape[1]
-        )
-        As = sp.vstack((zTop, sp.hstack((sp.block_diag(Asubs[1:]), zRight))))
-        A = As + Ad
-        B = np.array(sp.vstack(Bs).todense())
-
-        Ainv = self.Solver(A, **self.solverOpts)
-        AinvB = Ainv * B
-        z = np.zeros((self.mesh.nC, B.shape[1]))
-        du_dm = np.vstack((z, AinvB))
+        blocks = self.jacobian_blocks(m, f)
+        AinvB = blocks.forward(blocks.Bs)
+        z = np.zeros((self.mesh.nC, AinvB[0].shape[1]))
+        du_dm = np.vstack([z] + AinvB)
         J = self.survey.deriv(f, du_dm_v=du_dm)  # not multiplied by v
         return J
 
@@ -299,23 +319,8 @@ class RichardsProblem(Problem.BaseTimeProblem):
         if f is None:
             f = self.fields(m)
 
-        JvC = list(range(len(f)-1))  # Cell to hold each row of the long vector
-
-        # This is done via forward substitution.
-        bc = self.getBoundaryConditions(0, f[0])
-        temp, Adiag, B = self.diagsJacobian(
-            m, f[0], f[1], self.timeSteps[0], bc
-        )
-        Adiaginv = self.Solver(Adiag, **self.solverOpts)
-        JvC[0] = Adiaginv * (B*v)
-
-        for ii in range(1, len(f)-1):
-            bc = self.getBoundaryConditions(ii, f[ii])
-            Asub, Adiag, B = self.diagsJacobian(
-                m, f[ii], f[ii+1], self.timeSteps[ii], bc
-            )
-            Adiaginv = self.Solver(Adiag, **self.solverOpts)
-            JvC[ii] = Adiaginv * (B*v - Asub*JvC[ii-1])
+        blocks = self.jacobian_blocks(m, f)
+        JvC = blocks.forward([B*v for B in blocks.Bs])
 
         du_dm_v = np.concatenate([np.zeros(self.mesh.nC)] + JvC)
         Jv = self.survey.deriv(f, du_dm_v=du_dm_v, v=v)
@@ -324,23 +329,104 @@ class RichardsProblem(Problem.BaseTimeProblem):
     @Utils.timeIt
     def Jtvec(self, m, v, f=None):
         if f is None:
-            f = self.field(m)
+            f = self.fields(m)
 
+        blocks = self.jacobian_blocks(m, f)
         PTv, PTdv = self.survey.derivAdjoint(f, v=v)
 
-        # This is done via backward substitution.
-        minus = 0
+        # skip the initial conditions, they do not depend on the model
+        nC = self.mesh.nC
+        JTvC = blocks.backward([
+            PTv[(ii+1)*nC:(ii+2)*nC] for ii in range(blocks.nT)
+        ])
         BJtv = 0
-        for ii in range(len(f)-1, 0, -1):
-            bc = self.getBoundaryConditions(ii-1, f[ii-1])
-            Asub, Adiag, B = self.diagsJacobian(
-                m, f[ii-1], f[ii], self.timeSteps[ii-1], bc
-            )
-            # select the correct part of v
-            vpart = list(range((ii)*Adiag.shape[0], (ii+1)*Adiag.shape[0]))
-            AdiaginvT = self.Solver(Adiag.T, **self.solverOpts)
-            JTvC = AdiaginvT * (PTv[vpart] - minus)
-            minus = Asub.T*JTvC  # this is now the super diagonal.
-            BJtv = BJtv + B.T*JTvC
+        for B, JTv in zip(blocks.Bs, JTvC):
+            BJtv = BJtv + B.T*JTv
 
         return BJtv + PTdv
+
+
+class RichardsJacobian(object):
+    """Block bidiagonal Jacobian system of the Richards problem
+
+    The sub-diagonal (:code:`Asubs`), diagonal (:code:`Adiags`) and
+    model derivative (:code:`Bs`) blocks of every time step are computed
+    once from the fields (see :code:`RichardsProblem.diagsJacobian`).
+    Systems are solved by forward or backward block substitution, the
+    diagonal blocks are only factorized when first needed and the
+    factorizations are reused for every subsequent solve. The global
+    system is never assembled and the B blocks stay sparse.
+    """
+
+    def __init__(self, prob, m, f):
+        self.f = f
+        self.Solver = prob.Solver
+        self.solverOpts = prob.solverOpts
+
+        self.nT = len(f) - 1
+        self.Asubs = list(range(self.nT))
+        self.Adiags = list(range(self.nT))
+        self.Bs = list(range(self.nT))
+        for ii in range(self.nT):
+            bc = prob.getBoundaryConditions(ii, f[ii])
+            self.Asubs[ii], self.Adiags[ii], self.Bs[ii] = (
+                prob.diagsJacobian(m, f[ii], f[ii+1], prob.timeSteps[ii], bc)
+            )
+
+        self._Ainv = [None]*self.nT
+        self._AinvT = [None]*self.nT
+
+    def Ainv(self, ii):
+        """Solver for the diagonal block of time step ii"""
+        if self._Ainv[ii] is None:
+            self._Ainv[ii] = self.Solver(self.Adiags[ii], **self.solverOpts)
+        return self._Ainv[ii]
+
+    def AinvT(self, ii):
+        """Solver for the transposed diagonal block of time step ii"""
+        if self._AinvT[ii] is None:
+            self._AinvT[ii] = self.Solver(
+                self.Adiags[ii].T, **self.solverOpts
+            )
+        return self._AinvT[ii]
+
+    def forward(self, rhs):
+        """Solve the system by forward substitution
+
+        :param list rhs: right hand side of every time step, vectors or
+            (sparse) matrices
+        :rtype: list
+        :return: solution of every time step
+        """
+        x = list(range(self.nT))
+        for ii in range(self.nT):
+            b = rhs[ii]
+            if ii > 0:
+                b = b - self.Asubs[ii]*x[ii-1]
+            if sp.issparse(b):
+                b = b.toarray()
+            x[ii] = self.Ainv(ii) * np.asarray(b)
+        return x
+
+    def backward(self, rhs):
+        """Solve the transposed system by backward substitution
+
+        :param list rhs: right hand side of every time step
+        :rtype: list
+        :return: solution of every time step
+        """
+        x = list(range(self.nT))
+        for ii in range(self.nT-1, -1, -1):
+            b = rhs[ii]
+            if ii < self.nT-1:
+                b = b - self.Asubs[ii+1].T*x[ii+1]
+            x[ii] = self.AinvT(ii) * np.asarray(b)
+        return x
+
+    def clean(self):
+        """Clean the factorizations of the diagonal blocks"""
+        for solvers in [self._Ainv, self._AinvT]:
+            for ii, Ainv in enumerate(solvers):
+                if Ainv is not None:
+                    Ainv.clean()
+                solvers[ii] = None
@@ -4,6 +4,8 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 from six import string_types
+from collections import OrderedDict
+import tempfile
 import numpy as np
 
 from . import Utils
@@ -15,6 +17,17 @@ class Fields(object):
     u[:,'phi'] = phi
     print(u[src0,'phi'])
 
+    The fields of one source, or of a contiguous range of sources, are
+    returned as read-only views of the storage. The storage can be single
+    precision and kept in temporary files rather than in memory, e.g. for
+    all the fields of a problem::
+
+        prob.fieldsOpts = {'precision': 'single', 'storage': 'memmap'}
+
+    With ``cache_aliases``, aliased fields are computed once per source (and
+    time) and kept until the known fields or the model of the problem
+    change. The sources missing from the cache are computed together.
+
     """
 
     #: Known fields, a dict with locations, e.g. ``{"e": "E", "phi": "CC"}``
@@ -23,13 +36,35 @@ class Fields(object):
     aliasFields = None
     #: dtype is the type of the storage matrix. This can be a dictionary.
     dtype = float
-
+    #: 'double' or 'single', single stores float32/complex64
+    precision = 'double'
+    #: 'memory', or 'memmap' to store the fields in temporary files
+    storage = 'memory'
+    #: Directory of the memmap files, defaults to the temporary directory
+    memmap_dir = None
+    #: Cache the aliased fields per source
+    cache_aliases = False
+    #: Memory budget of the alias cache in MB
+    alias_cache_size = 256.
 
     def __init__(self, mesh, survey, **kwargs):
         self.survey = survey
         self.mesh = mesh
+        prob = getattr(survey, 'prob', None)
+        Utils.setKwargs(self, **getattr(prob, 'fieldsOpts', {}))
         Utils.setKwargs(self, **kwargs)
         self._fields = {}
+        self._memmapFiles = {}
+        self._aliasCacheVersion = None
+        self._aliasCacheStats = {'hits': 0, 'misses': 0}
+        self.clearAliasCache()
+
+        assert self.precision in ['double', 'single'], (
+            "precision must be 'double' or 'single'"
+        )
+        assert self.storage in ['memory', 'memmap'], (
+            "storage must be 'memory' or 'memmap'"
+        )
 
         if self.knownFields is None:
             raise Exception('knownFields cannot be set to None')
@@ -53,7 +88,8 @@ class Fields(object):
         sz = 0.0
         for f in self.knownFields:
             loc = self.knownFields[f]
-            sz += np.array(self._storageShape(loc)).prod()*8.0/(1024**2)
+            itemsize = np.dtype(self._storageDtype(f)).itemsize
+            sz += np.array(self._storageShape(loc)).prod()*itemsize/(1024**2)
         return "{0:e} MB".format(sz)
 
     def _storageShape(self, loc):
@@ -66,6 +102,17 @@ class Fields(object):
 
         return (nP, nSrc)
 
+    def _storageDtype(self, name):
+        if type(self.dtype) is dict:
+            dtype = self.dtype[name]
+        else:
+            dtype = self.dtype
+        if self.precision == 'single':
+            if np.issubdtype(dtype, np.complexfloating):
+                return np.complex64
+            return np.float32
+        return dtype
+
     def _initStore(self, name):
         if name in self._fields:
             return self._fields[name]
@@ -73,12 +120,20 @@ class Fields(object):
         assert name in self.knownFields, 'field name is not known.'
 
         loc = self.knownFields[name]
+        shape = self._storageShape(loc)
+        dtype = self._storageDtype(name)
 
-        if type(self.dtype) is dict:
-            dtype = self.dtype[name]
+        # Fortran order keeps the fields of a source (and time) contiguous
+        if self.storage == 'memmap':
+            tmp = tempfile.TemporaryFile(
+                dir=self.memmap_dir, prefix='simpeg_{0!s}_'.format(name)
+            )
+            field = np.memmap(
+                tmp, dtype=dtype, mode='w+', shape=shape, order='F'
+            )
+            self._memmapFiles[name] = tmp  # removed with the fields
         else:
-            dtype = self.dtype
-        field = np.zeros(self._storageShape(loc), dtype=dtype)
+            field = np.zeros(shape, dtype=dtype, order='F')
 
         self._fields[name] = field
 
@@ -86,11 +141,69 @@ class Fields(object):
 
     def _srcIndex(self, srcTestList):
         if type(srcTestList) is slice:
-            ind = srcTestList
-        else:
-            ind = self.survey.getSourceIndex(srcTestList)
+            return srcTestList
+        return self._contiguous(self.survey.getSourceIndex(srcTestList))
+
+    @staticmethod
+    def _contiguous(ind):
+        # contiguous sources are a slice, so the storage is indexed by a view
+        if len(ind) == 1 or np.all(np.diff(ind) == 1):
+            return slice(ind[0], ind[-1] + 1)
         return ind
 
+    def _srcList(self, ind):
+        srcList = self.survey.srcList
+        if type(ind) is slice:
+            return list(srcList[ind])
+        return [srcList[i] for i in ind]
+
+    def _view(self, name, ind):
+        """Storage of the field at ind, read-only if it is a view"""
+        out = np.asarray(self._fields[name][ind])
+        if not any(isinstance(i, (list, np.ndarray)) for i in ind):
+            out.flags.writeable = False
+        return out
+
+    @property
+    def alias_cache_stats(self):
+        """Hits and misses of the alias cache, counted per source"""
+        return dict(
+            self._aliasCacheStats, size=len(self._aliasCache),
+            MB=self._aliasCacheBytes/1024.**2
+        )
+
+    def clearAliasCache(self):
+        """Remove all cached aliased fields"""
+        self._aliasCache = OrderedDict()
+        self._aliasCacheBytes = 0
+
+    def _checkAliasCache(self):
+        prob = getattr(self.survey, 'prob', None)
+        version = getattr(prob, '_model_version', None)
+        if version != self._aliasCacheVersion:
+            self.clearAliasCache()
+            self._aliasCacheVersion = version
+        return self._aliasCache
+
+    def _aliasHit(self, key):
+        # least recently used entries are at the front
+        value = self._aliasCache.pop(key)
+        self._aliasCache[key] = value
+        self._aliasCacheStats['hits'] += 1
+        return value
+
+    def _cacheAlias(self, key, value):
+        self._aliasCacheStats['misses'] += 1
+        budget = self.alias_cache_size * 1024**2
+        if value.nbytes > budget:
+            return
+        while self._aliasCacheBytes + value.nbytes > budget:
+            old = self._aliasCache.popitem(last=False)[1]
+            self._aliasCacheBytes -= old.nbytes
+        value.flags.writeable = False
+        self._aliasCache[key] = value
+        self._aliasCacheBytes += value.nbytes
+
     def _nameIndex(self, name, accessType):
 
         if type(name) is slice:
@@ -141,6 +254,8 @@ class Fields(object):
         for name in newFields:
             field = self._initStore(name)
             self._setField(field, newFields[name], name, ind)
+        if self._aliasCache:
+            self.clearAliasCache()
 
     def __getitem__(self, key):
         ind, name = self._indexAndNameFromKey(key, 'get')
@@ -159,25 +274,45 @@ class Fields(object):
     def _getField(self, name, ind):
 
         if name in self._fields:
-            out = self._fields[name][:, ind]
+            out = self._view(name, (slice(None), ind))
+        elif self.cache_aliases:
+            out = self._getCachedAlias(name, ind)
         else:
-            # Aliased fields
-            alias, loc, func = self.aliasFields[name]
-
-            srcII = np.array(self.survey.srcList)[ind]
-            srcII = srcII.tolist()
-
-            if isinstance(func, string_types):
-                assert hasattr(self, func), (
-                    'The alias field function is a string, but it does not '
-                    'exist in the Fields class.'
-                )
-                func = getattr(self, func)
-            out = func(self._fields[alias][:, ind], srcII)
+            out = self._evalAlias(name, ind)
         if out.shape[0] == out.size or out.ndim == 1:
-            out = Utils.mkvc(out, 2)
+            out = out.reshape((out.size, 1), order='F')
         return out
 
+    def _evalAlias(self, name, ind):
+        alias, loc, func = self.aliasFields[name]
+
+        srcII = self._srcList(ind)
+
+        if isinstance(func, string_types):
+            assert hasattr(self, func), (
+                'The alias field function is a string, but it does not '
+                'exist in the Fields class.'
+            )
+            func = getattr(self, func)
+        return func(self._view(alias, (slice(None), ind)), srcII)
+
+    def _getCachedAlias(self, name, ind):
+        cache = self._checkAliasCache()
+        srcII = np.arange(self.survey.nSrc)[ind]
+        cols, missing = {}, []
+        for i in srcII:
+            if (name, i) in cache:
+                cols[i] = self._aliasHit((name, i))
+            else:
+                missing.append(i)
+        if missing:
+            out = self._evalAlias(name, self._contiguous(missing))
+            out = out.reshape((out.shape[0], len(missing)), order='F')
+            for k, i in enumerate(missing):
+                cols[i] = np.array(out[:, k])
+                self._cacheAlias((name, i), cols[i])
+        return np.column_stack([cols[i] for i in srcII])
+
     def __contains__(self, other):
         if other in self.aliasFields:
             other = self.aliasFields[other][0]
@@ -250,45 +385,73 @@ class TimeFields(Fields):
     def _getField(self, name, ind):
         srcInd, timeInd = ind
         if name in self._fields:
-            out = self._fields[name][:, srcInd, timeInd]
+            out = self._view(name, (slice(None), srcInd, timeInd))
+        elif self.cache_aliases:
+            out = self._getCachedAlias(name, ind)
         else:
-            # Aliased fields
-            alias, loc, func = self.aliasFields[name]
-            if isinstance(func, string_types):
-                assert hasattr(self, func), (
-                    'The alias field function is a string, but it does '
-                    'not exist in the Fields class.'
-                )
-                func = getattr(self, func)
-            pointerFields = self._fields[alias][:, srcInd, timeInd]
-            pointerShape = self._correctShape(alias, ind)
-            pointerFields = pointerFields.reshape(pointerShape, order='F')
-
-            timeII = np.arange(self.survey.prob.nT + 1)[timeInd]
-            srcII = np.array(self.survey.srcList)[srcInd]
-            srcII = srcII.tolist()
-
-            if timeII.size == 1:
-                pointerShapeDeflated = self._correctShape(
-                    alias, ind, deflate=True
-                )
-                pointerFields = pointerFields.reshape(
-                    pointerShapeDeflated, order='F'
-                )
-                out = func(pointerFields, srcII, timeII)
-            else:  # loop over the time steps
-                nT = pointerShape[2]
-                out = list(range(nT))
-                for i, TIND_i in enumerate(timeII):
-                    fieldI = pointerFields[:, :, i]
-                    if fieldI.shape[0] == fieldI.size:
-                        fieldI = Utils.mkvc(fieldI, 2)
-                    out[i] = func(fieldI, srcII, TIND_i)
-                    if out[i].ndim == 1:
-                        out[i] = out[i][:, np.newaxis, np.newaxis]
-                    elif out[i].ndim == 2:
-                        out[i] = out[i][:, :, np.newaxis]
-                out = np.concatenate(out, axis=2)
+            out = self._evalAlias(name, ind)
 
         shape = self._correctShape(name, ind, deflate=True)
         return out.reshape(shape, order='F')
+
+    def _evalAlias(self, name, ind):
+        srcInd, timeInd = ind
+        alias, loc, func = self.aliasFields[name]
+        if isinstance(func, string_types):
+            assert hasattr(self, func), (
+                'The alias field function is a string, but it does '
+                'not exist in the Fields class.'
+            )
+            func = getattr(self, func)
+        pointerFields = self._view(alias, (slice(None), srcInd, timeInd))
+        pointerShape = self._correctShape(alias, ind)
+        pointerFields = pointerFields.reshape(pointerShape, order='F')
+
+        timeII = np.arange(self.survey.prob.nT + 1)[timeInd]
+        srcII = self._srcList(srcInd)
+
+        if timeII.size == 1:
+            pointerShapeDeflated = self._correctShape(
+                alias, ind, deflate=True
+            )
+            pointerFields = pointerFields.reshape(
+                pointerShapeDeflated, order='F'
+            )
+            return func(pointerFields, srcII, timeII)
+
+        # loop over the time steps
+        nT = pointerShape[2]
+        out = list(range(nT))
+        for i, TIND_i in enumerate(timeII):
+            fieldI = pointerFields[:, :, i]
+            if fieldI.shape[0] == fieldI.size:
+                fieldI = Utils.mkvc(fieldI, 2)
+            out[i] = func(fieldI, srcII, TIND_i)
+            if out[i].ndim == 1:
+                out[i] = out[i][:, np.newaxis, np.newaxis]
+            elif out[i].ndim == 2:
+                out[i] = out[i][:, :, np.newaxis]
+        return np.concatenate(out, axis=2)
+
+    def _getCachedAlias(self, name, ind):
+        srcInd, timeInd = ind
+        cache = self._checkAliasCache()
+        srcII = np.arange(self.survey.nSrc)[srcInd]
+        timeII = np.atleast_1d(np.arange(self.survey.prob.nT + 1)[timeInd])
+        cols = {}
+        # the aliases are evaluated one time step at a time, as above
+        for t in timeII:
+            missing = []
+            for i in srcII:
+                if (name, i, t) in cache:
+                    cols[i, t] = self._aliasHit((name, i, t))
+                else:
+                    missing.append(i)
+            if not missing:
+                continue
+            out = self._evalAlias(name, (self._contiguous(missing), t))
+            out = out.reshape((out.shape[0], len(missing)), order='F')
+            for k, i in enumerate(missing):
+                cols[i, t] = np.array(out[:, k])
+                self._cacheAlias((name, i, t), cols[i, t])
+        return np.column_stack([cols[i, t] for t in timeII for i in srcII])
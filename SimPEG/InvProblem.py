@@ -9,6 +9,11 @@ import properties
 import numpy as np
 import scipy.sparse as sp
 import gc
+import hashlib
+
+
+def _model_key(m):
+    return hashlib.sha1(np.ascontiguousarray(m)).hexdigest()
 
 
 class BaseInvProblem(Props.BaseSimPEG):
@@ -35,6 +40,12 @@ class BaseInvProblem(Props.BaseSimPEG):
     #: List of strings, e.g. ['_MeSigma', '_MeSigmaI']
     deleteTheseOnModelUpdate = []
 
+    #: When to run the garbage collector before an evaluation: 'always',
+    #: 'iteration' (not on line-search steps), 'never', or a float, the
+    #: fraction of the system memory in use above which to collect (this
+    #: needs psutil, without it 'iteration' is used)
+    gc_policy = 'iteration'
+
     model = Props.Model("Inversion model.")
 
     @properties.observer('model')
@@ -114,6 +125,33 @@ class BaseInvProblem(Props.BaseSimPEG):
                     break
 
 
+    def checkpoint(self):
+        """checkpoint()
+
+            The state needed to resume the inversion: the model, beta and the
+            last values of the objective functions.
+
+            :rtype: dict
+        """
+        state = {}
+        for name in [
+            'model', 'beta', 'phi_d', 'phi_d_last', 'phi_m', 'phi_m_last',
+            'l2model'
+        ]:
+            if getattr(self, name, None) is not None:
+                state[name] = getattr(self, name)
+        return state
+
+    def resume(self, state):
+        """resume(state)
+
+            Restore a state saved by :meth:`checkpoint`, after the startup.
+
+            :param dict state: saved state
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+
     @property
     def warmstart(self):
         return getattr(self, '_warmstart', [])
@@ -130,8 +168,11 @@ class BaseInvProblem(Props.BaseSimPEG):
     def getFields(self, m, store=False, deleteWarmstart=True):
         f = None
 
+        key = _model_key(m) if self.warmstart else None
         for mtest, u_ofmtest in self.warmstart:
-            if m is mtest:
+            if m is mtest or (
+                mtest.shape == m.shape and _model_key(mtest) == key
+            ):
                 f = u_ofmtest
                 if self.debug:
                     print('InvProb is Warm Starting!')
@@ -141,31 +182,54 @@ class BaseInvProblem(Props.BaseSimPEG):
             if isinstance(self.dmisfit, DataMisfit.BaseDataMisfit):
                 f = self.dmisfit.prob.fields(m)
             elif isinstance(self.dmisfit, ObjectiveFunction.BaseObjectiveFunction):
-                f = []
-                for objfct in self.dmisfit.objfcts:
-                    if hasattr(objfct, 'prob'):
-                        f += [objfct.prob.fields(m)]
-                    else:
-                        f += []
+                # the fields of each problem, concurrently if dmisfit.n_cpu > 1
+                f = self.dmisfit.map(
+                    lambda objfct: objfct.prob.fields(m),
+                    [
+                        objfct for objfct in self.dmisfit.objfcts
+                        if hasattr(objfct, 'prob')
+                    ]
+                )
 
         if deleteWarmstart:
             self.warmstart = []
         if store:
-            self.warmstart += [(m, f)]
+            # a copy, the optimizer may change m in place
+            self.warmstart += [(m.copy(), f)]
 
         return f
 
     def get_dpred(self, m, f):
+        def dpred(objfct, f):
+            # the data misfits keep the data they have already predicted
+            if isinstance(objfct, DataMisfit.BaseDataMisfit):
+                return objfct.dpred(m, f=f)
+            return objfct.survey.dpred(m, f=f)
+
         if isinstance(self.dmisfit, DataMisfit.BaseDataMisfit):
-            return self.dmisfit.survey.dpred(m, f=f)
+            return dpred(self.dmisfit, f)
         elif isinstance(self.dmisfit, ObjectiveFunction.BaseObjectiveFunction):
-            dpred = []
-            for i, objfct in enumerate(self.dmisfit.objfcts):
-                if hasattr(objfct, 'survey'):
-                    dpred += [objfct.survey.dpred(m, f=f[i])]
-                else:
-                    dpred += []
-            return dpred
+            return self.dmisfit.map(
+                lambda term: dpred(term[1], f[term[0]]),
+                [
+                    (i, objfct) for i, objfct in enumerate(self.dmisfit.objfcts)
+                    if hasattr(objfct, 'survey')
+                ]
+            )
+
+    def _collect_garbage(self, line_search):
+        policy = self.gc_policy
+        if isinstance(policy, float):
+            try:
+                import psutil
+            except ImportError:
+                policy = 'iteration'
+            else:
+                if psutil.virtual_memory().percent >= 100 * policy:
+                    gc.collect()
+                return
+        if policy == 'always' or (policy == 'iteration' and not line_search):
+            gc.collect()
 
     @Utils.timeIt
     def evalFunction(self, m, return_g=True, return_H=True):
@@ -173,10 +237,11 @@ class BaseInvProblem(Props.BaseSimPEG):
         """
 
         self.model = m
-        gc.collect()
 
         # Store fields if doing a line-search
-        f = self.getFields(m, store=(return_g is False and return_H is False))
+        line_search = return_g is False and return_H is False
+        self._collect_garbage(line_search)
+        f = self.getFields(m, store=line_search)
 
         # if isinstance(self.dmisfit, DataMisfit.BaseDataMisfit):
         phi_d = self.dmisfit(m, f=f)
@@ -199,6 +264,7 @@ class BaseInvProblem(Props.BaseSimPEG):
 
         if return_H:
             def H_fun(v):
+                Utils.profiler.count('matvecs')
                 phi_d2Deriv = self.dmisfit.deriv2(m, v, f=f)
                 phi_m2Deriv = self.reg.deriv2(m, v=v)
 
@@ -1,6 +1,9 @@
 from __future__ import print_function
+import os
+import weakref
 import scipy.sparse as sp
 import numpy as np
+from six.moves import cPickle as pickle
 from . import Utils
 from .Optimization import Remember, IterationPrinters, StoppingCriteria
 from . import Directives
@@ -17,6 +20,19 @@ class BaseInversion(object):
     #: Set this to a SimPEG.Utils.Counter() if you want to count things
     counter = None
 
+    #: File the inversion is checkpointed to (see :meth:`saveCheckpoint`)
+    checkpointFile = None
+
+    #: Number of iterations between checkpoints
+    checkpointEvery = 1
+
+    #: Also save the stored operators of the problems (a fixed sensitivity
+    #: _Jmatrix, the forward operator _G of the potential fields) in .npy
+    #: files next to the checkpoint, written again only when they change
+    checkpointOperators = False
+
+    _operatorNames = ['_Jmatrix', '_G']
+
     @property
     def directiveList(self):
         if getattr(self, '_directiveList', None) is None:
@@ -55,19 +71,106 @@ class BaseInversion(object):
             self.opt.printers.insert(3, IterationPrinters.phi_m)
 
     @Utils.timeIt
-    def run(self, m0):
-        """run(m0)
+    def run(self, m0, resume=None):
+        """run(m0, resume=None)
 
             Runs the inversion!
 
+            To continue an inversion from a checkpoint, set up the same
+            inversion (problems, regularization, optimization and
+            directives) and run it with the same m0 and the checkpoint
+            file as resume.
+
         """
+        state = None
+        if resume is not None:
+            with open(resume, 'rb') as f:
+                state = pickle.load(f)
+
         self.invProb.startup(m0)
-        self.directiveList.call('initialize')
+        if state is None:
+            self.directiveList.call('initialize')
+        else:
+            self._resumeProblems(state['problems'])
+            self.invProb.resume(state['invProb'])
+            # the directives find the preconditioner, JtJdiag, etc.
+            self.opt.resume(state['opt'])
+            self.directiveList.resume(state['directives'])
         print('model has any nan: {:b}'.format(np.any(np.isnan(self.invProb.model))))
-        self.m = self.opt.minimize(self.invProb.evalFunction, self.invProb.model)
+        self.m = self.opt.minimize(
+            self.invProb.evalFunction, self.invProb.model,
+            resume=None if state is None else state['opt']
+        )
         self.directiveList.call('finish')
 
         return self.m
 
+    @property
+    def _problems(self):
+        dmisfit = self.invProb.dmisfit
+        objfcts = getattr(dmisfit, 'objfcts', [dmisfit])
+        return [objfct.prob for objfct in objfcts if hasattr(objfct, 'prob')]
+
+    def saveCheckpoint(self, fname=None):
+        """saveCheckpoint(fname=None)
+
+            Save the state needed to continue the inversion after the
+            current iteration: that of the optimization (iterates, BFGS
+            memory, preconditioner), of the inverse problem (model, beta)
+            and of the directives (e.g. IRLS). The file is replaced
+            atomically, so an interrupted write leaves the last checkpoint.
+
+            :param str fname: file name, default is checkpointFile
+        """
+        fname = self.checkpointFile if fname is None else fname
+        state = {
+            'invProb': self.invProb.checkpoint(),
+            'opt': self.opt.checkpoint(),
+            'directives': self.directiveList.checkpoint(),
+            'problems': [
+                self._problemCheckpoint(i, prob, fname)
+                for i, prob in enumerate(self._problems)
+            ]
+        }
+        with open(fname + '.tmp', 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        getattr(os, 'replace', os.rename)(fname + '.tmp', fname)
+
+    def _problemCheckpoint(self, i, prob, fname):
+        state = {}
+        if hasattr(prob, 'fix_Jmatrix'):
+            state['fix_Jmatrix'] = prob.fix_Jmatrix
+        if not self.checkpointOperators:
+            return state
+
+        saved = getattr(self, '_savedOperators', None)
+        if saved is None:
+            saved = self._savedOperators = {}
+        for name in self._operatorNames:
+            op = getattr(prob, name, None)
+            if not isinstance(op, np.ndarray) or (
+                # it is deleted when the model changes otherwise
+                name == '_Jmatrix' and not getattr(prob, 'fix_Jmatrix', False)
+            ):
+                continue
+            path = '{}.prob{:d}{}.npy'.format(fname, i, name)
+            if path not in saved or saved[path]() is not op:
+                np.save(path, op)
+                saved[path] = weakref.ref(op)
+            state[name] = path
+        return state
+
+    def _resumeProblems(self, states):
+        for prob, state in zip(self._problems, states):
+            for name, value in state.items():
+                if name in self._operatorNames:
+                    value = np.load(value)
+                setattr(prob, name, value)
+
     def _optCallback(self, xt):
         self.directiveList.call('endIter')
+        if (
+            self.checkpointFile is not None and
+            self.opt.iter % self.checkpointEvery == 0
+        ):
+            self.saveCheckpoint()
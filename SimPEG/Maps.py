@@ -6,6 +6,7 @@ from __future__ import unicode_literals
 from six import integer_types
 from six import string_types
 from collections import namedtuple
+import hashlib
 import warnings
 
 import numpy as np
@@ -22,6 +23,11 @@ from discretize.Tests import checkDerivative
 from . import Utils
 
 
+def _diagonal_kernel(d):
+    """Derivative kernels of a map with a diagonal derivative d"""
+    return (lambda v: d * v), (lambda v: np.conj(d) * v)
+
+
 class IdentityMap(properties.HasProperties):
     """
         SimPEG Map
@@ -48,6 +54,20 @@ class IdentityMap(properties.HasProperties):
         self.mesh = mesh
         self._nP = nP
 
+    def __setattr__(self, name, value):
+        # the parameters of the map changed, evaluations cached by a
+        # ComboMap are stale
+        if not name.startswith('_'):
+            self.__dict__['_map_version'] = (
+                self.__dict__.get('_map_version', 0) + 1
+            )
+        super(IdentityMap, self).__setattr__(name, value)
+
+    @property
+    def _map_state(self):
+        """Counter of the changes of the parameters of the map"""
+        return self.__dict__.get('_map_version', 0)
+
     @property
     def nP(self):
         """
@@ -120,6 +140,21 @@ class IdentityMap(properties.HasProperties):
             return sp.identity(self.nP)
         return Utils.Identity()
 
+    def _deriv_kernel(self, m):
+        """
+            Functions applying the derivative and its adjoint to a vector.
+            These are chained by the fused derivative of a
+            :class:`ComboMap`. Maps with a diagonal or a projection
+            derivative override this to work elementwise, the default
+            multiplies with the (sparse) derivative.
+
+            :param numpy.ndarray m: model
+            :rtype: tuple
+            :return: (derivative times v, adjoint derivative times v)
+        """
+        deriv = self.deriv(m)
+        return (lambda v: deriv * v), (lambda v: deriv.T * v)
+
     def test(self, m=None, num=4, **kwargs):
         """Test the derivative of the mapping.
 
@@ -280,13 +315,110 @@ class ComboMap(IdentityMap):
            last dimension of the mesh."""
         return self.maps[-1].nP
 
-    def _transform(self, m):
+    @property
+    def _map_state(self):
+        return (self.__dict__.get('_map_version', 0),) + tuple(
+            map_i._map_state for map_i in self.maps
+        )
+
+    def _evaluate(self, m):
+        """
+            Intermediate models of the chain and the derivative kernels of
+            every map, evaluated once per model and state of the maps. Only
+            the last evaluation is kept. Setting a parameter of a map
+            invalidates it, changing its arrays in place does not.
+        """
+        key = (
+            hashlib.sha1(np.ascontiguousarray(m)).hexdigest(),
+            np.shape(m), np.asarray(m).dtype.str, self._map_state
+        )
+        m = Utils.mkvc(m) if isinstance(m, np.ndarray) else m
+        cache = getattr(self, '_cache', None)
+        if cache is not None and cache['key'] == key:
+            return cache
+
+        mi = np.array(m, copy=True)
+        models = [mi]
         for map_i in reversed(self.maps):
-            m = map_i * m
-        return m
+            mi = map_i * mi
+            models.append(mi)
+        self._cache = {'key': key, 'models': models}
+        return self._cache
+
+    def _transform(self, m):
+        if not isinstance(m, np.ndarray):
+            for map_i in reversed(self.maps):
+                m = map_i * m
+            return m
+        return self._evaluate(m)['models'][-1].copy()
+
+    def _deriv_kernel(self, m):
+        cache = self._evaluate(m)
+        if 'kernels' not in cache:
+            cache['kernels'] = [
+                map_i._deriv_kernel(mi)
+                for map_i, mi in zip(reversed(self.maps), cache['models'])
+            ]
+        kernels = cache['kernels']
+
+        def fwd(v):
+            for matvec, _ in kernels:
+                v = matvec(v)
+            return v
+
+        def adj(v):
+            for _, rmatvec in reversed(kernels):
+                v = rmatvec(v)
+            return v
+
+        return fwd, adj
+
+    def deriv_operator(self, m):
+        """
+            The derivative of the chain as a matrix-free
+            :class:`scipy.sparse.linalg.LinearOperator` (with :code:`.T`).
+            The intermediate models and the derivatives of the individual
+            maps are evaluated once per model; diagonal maps are applied
+            elementwise and projections as index operations, no sparse
+            products are formed.
+
+            :param numpy.ndarray m: model
+            :rtype: scipy.sparse.linalg.LinearOperator
+            :return: derivative of transformed model
+        """
+        fwd, adj = self._deriv_kernel(m)
+        models = self._evaluate(m)['models']
+        shape = (models[-1].size, models[0].size)
+
+        def matvec(v):
+            return fwd(Utils.mkvc(v))
+
+        def rmatvec(v):
+            return adj(Utils.mkvc(v))
+
+        return LinearOperator(
+            shape, matvec=matvec, rmatvec=rmatvec, dtype=models[-1].dtype
+        )
 
     def deriv(self, m, v=None):
 
+        if isinstance(v, np.ndarray) and v.ndim == 1:
+            return self._deriv_kernel(m)[0](v)
+
+        if not isinstance(m, np.ndarray):
+            return self._deriv_chain(m, v)
+
+        cache = self._evaluate(m)
+        if 'deriv' not in cache:
+            cache['deriv'] = self._deriv_chain(m)
+        if v is not None:
+            return cache['deriv'] * v
+        return cache['deriv']
+
+    def _deriv_chain(self, m, v=None):
+        """
+            The derivative as a product of the derivatives of the maps.
+        """
         if v is not None:
             deriv = v
         else:
@@ -361,6 +493,16 @@ class Projection(IdentityMap):
             return self.P * v
         return self.P
 
+    def _deriv_kernel(self, m):
+        index = np.asarray(self.index, dtype=int)
+
+        def adj(v):
+            out = np.zeros(self.nP, dtype=v.dtype)
+            np.add.at(out, index, v)
+            return out
+
+        return (lambda v: v[index]), adj
+
 
 class SumMap(ComboMap):
     """
@@ -445,6 +587,17 @@ class SumMap(ComboMap):
 
         return sumDeriv
 
+    def _deriv_kernel(self, m):
+        kernels = [map_i._deriv_kernel(m) for map_i in self.maps]
+
+        def fwd(v):
+            return sum(matvec(v) for matvec, _ in kernels)
+
+        def adj(v):
+            return sum(rmatvec(v) for _, rmatvec in kernels)
+
+        return fwd, adj
+
 
 class SurjectUnits(IdentityMap):
     """
@@ -1018,6 +1171,9 @@ class ExpMap(IdentityMap):
             return deriv * v
         return deriv
 
+    def _deriv_kernel(self, m):
+        return _diagonal_kernel(np.exp(Utils.mkvc(m)))
+
 
 class ReciprocalMap(IdentityMap):
     """
@@ -1045,6 +1201,9 @@ class ReciprocalMap(IdentityMap):
             return deriv * v
         return deriv
 
+    def _deriv_kernel(self, m):
+        return _diagonal_kernel(- Utils.mkvc(m)**(-2))
+
 
 class LogMap(IdentityMap):
     """
@@ -1084,6 +1243,9 @@ class LogMap(IdentityMap):
             return Utils.sdiag(deriv)*v
         return Utils.sdiag(deriv)
 
+    def _deriv_kernel(self, m):
+        return _diagonal_kernel(self.deriv(m).diagonal())
+
     def inverse(self, m):
         return np.exp(Utils.mkvc(m))
 
@@ -1110,6 +1272,9 @@ class ChiMap(IdentityMap):
             return mu_0 * v
         return mu_0 * sp.eye(self.nP)
 
+    def _deriv_kernel(self, m):
+        return _diagonal_kernel(mu_0)
+
     def inverse(self, m):
         return m / mu_0 - 1
 
@@ -1134,6 +1299,9 @@ class MuRelative(IdentityMap):
             return mu_0 * v
         return mu_0 * sp.eye(self.nP)
 
+    def _deriv_kernel(self, m):
+        return _diagonal_kernel(mu_0)
+
     def inverse(self, m):
         return 1./mu_0 * m
 
@@ -1177,6 +1345,9 @@ class Weighting(IdentityMap):
             return self.weights * v
         return self.P
 
+    def _deriv_kernel(self, m):
+        return _diagonal_kernel(self.weights)
+
 
 class ComplexMap(IdentityMap):
     """ComplexMap
@@ -1303,6 +1474,14 @@ class SurjectVertical1D(IdentityMap):
             return deriv * v
         return deriv
 
+    def _deriv_kernel(self, m):
+        repNum = self.mesh.vnC[:self.mesh.dim-1].prod()
+
+        def adj(v):
+            return v.reshape((self.nP, repNum)).sum(axis=1)
+
+        return (lambda v: v.repeat(repNum)), adj
+
 
 class Surject2Dto3D(IdentityMap):
     """Map2Dto3D
@@ -1490,6 +1669,15 @@ class InjectActiveCells(IdentityMap):
             return self.P * v
         return self.P
 
+    def _deriv_kernel(self, m):
+
+        def fwd(v):
+            out = np.zeros(self.nC, dtype=v.dtype)
+            out[self.indActive] = v
+            return out
+
+        return fwd, (lambda v: v[self.indActive])
+
 ###############################################################################
 #                                                                             #
 #                             Parametric Maps                                 #
@@ -7,6 +7,8 @@ import numpy as np
 import scipy.sparse as sp
 from six import integer_types
 import warnings
+import hashlib
+from multiprocessing.pool import ThreadPool
 
 from discretize.Tests import checkDerivative
 
@@ -231,10 +233,16 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
                 [phi1, phi2], [2, 3]
             )
 
+    The terms are independent, so with :code:`n_cpu > 1` they are evaluated
+    on a pool of threads (e.g. the data misfits of a joint inversion, whose
+    solvers release the GIL). The results are summed in the order of the
+    list, so the value does not depend on the number of threads.
     """
     _multiplier_types = (float, None, Utils.Zero, np.float64) + integer_types # Directive
     _multipliers = None
 
+    n_cpu = 1  #: number of threads used to evaluate the terms
+
     def __init__(self, objfcts=[], multipliers=None, **kwargs):
 
         if multipliers is None:
@@ -317,20 +325,79 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
 
         self._multipliers = value
 
+    def map(self, fun, items):
+        """
+        Apply fun to each of the items, on n_cpu threads if requested. The
+        results are returned in the order of the items.
+        """
+        items = list(items)
+        if self.n_cpu is not None and self.n_cpu > 1 and len(items) > 1:
+            pool = ThreadPool(min(self.n_cpu, len(items)))
+            results = pool.map(fun, items)
+            pool.close()
+            pool.join()
+            return results
+        return [fun(item) for item in items]
+
+    def _map_terms(self, fun, f=None):
+        """
+        Evaluate fun(objfct, f_i) for each term with a non-zero multiplier,
+        where f_i is the fields of the term (None if it has none), and
+        return the (index, multiplier, result) of the terms in order.
+        """
+        terms = [
+            (i, multiplier, objfct)
+            for i, (multiplier, objfct) in enumerate(self)
+            if multiplier != 0.  # don't evaluate the fct
+        ]
+
+        def evaluate(term):
+            i, multiplier, objfct = term
+            if f is not None and objfct._hasFields:
+                return i, multiplier, fun(objfct, f[i])
+            return i, multiplier, fun(objfct, None)
+
+        return self.map(evaluate, terms)
+
     def __call__(self, m, f=None):
 
+        def evaluate(objfct, f_i):
+            if f_i is None:
+                return objfct(m)
+            return objfct(m, f=f_i)
+
+        terms = self._map_terms(evaluate, f=f)
+        # kept so that the terms can be reported without evaluating them again
+        self._last_values = (
+            hashlib.sha1(np.ascontiguousarray(m)).hexdigest(),
+            dict((i, value) for i, _, value in terms)
+        )
+
         fct = 0.
-        for i, phi in enumerate(self):
-            multiplier, objfct = phi
-            if multiplier == 0.: # don't evaluate the fct
-                continue
-            else:
-                if f is not None and objfct._hasFields:
-                    fct += multiplier * objfct(m, f=f[i])
-                else:
-                    fct += multiplier * objfct(m)
+        for _, multiplier, value in terms:
+            fct += multiplier * value
         return fct
 
+    def last_values(self, m):
+        """
+        Values of the objective functions (without their multipliers) from
+        the last evaluation, if it was at m, otherwise None. Objective
+        functions with a zero multiplier are evaluated.
+
+        :param numpy.ndarray m: model
+        :rtype: list
+        """
+        last = getattr(self, '_last_values', None)
+        if (
+            last is None or
+            last[0] != hashlib.sha1(np.ascontiguousarray(m)).hexdigest()
+        ):
+            return None
+        return [
+            last[1][i] if i in last[1] else objfct(m)
+            for i, objfct in enumerate(self.objfcts)
+        ]
+
     def deriv(self, m, f=None):
         """
         First derivative of the composite objective function is the sum of the
@@ -340,16 +407,15 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
         :param numpy.ndarray m: model
         :param SimPEG.Fields f: Fields object (if applicable)
         """
+
+        def evaluate(objfct, f_i):
+            if f_i is None:
+                return objfct.deriv(m)
+            return objfct.deriv(m, f=f_i)
+
         g = Utils.Zero()
-        for i, phi in enumerate(self):
-            multiplier, objfct = phi
-            if multiplier == 0.: # don't evaluate the fct
-                continue
-            else:
-                if f is not None and objfct._hasFields:
-                    g += multiplier * objfct.deriv(m, f=f[i])
-                else:
-                    g += multiplier * objfct.deriv(m)
+        for _, multiplier, value in self._map_terms(evaluate, f=f):
+            g += multiplier * value
         return g
 
     def deriv2(self, m, v=None, f=None):
@@ -362,17 +428,15 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
         :param numpy.ndarray v: vector we are multiplying by
         :param SimPEG.Fields f: Fields object (if applicable)
         """
+
+        def evaluate(objfct, f_i):
+            if f_i is None:
+                return objfct.deriv2(m, v)
+            return objfct.deriv2(m, v, f=f_i)
+
         H = Utils.Zero()
-        for i, phi in enumerate(self):
-            multiplier, objfct = phi
-            if multiplier == 0.: # don't evaluate the fct
-                continue
-            else:
-                if f is not None and objfct._hasFields:
-                    objfct_H = objfct.deriv2(m, v, f=f[i])
-                else:
-                    objfct_H = objfct.deriv2(m, v)
-                H = H + multiplier * objfct_H
+        for _, multiplier, value in self._map_terms(evaluate, f=f):
+            H = H + multiplier * value
         return H
 
     # This assumes all objective functions have a W.
@@ -3,6 +3,7 @@ from __future__ import print_function
 import numpy as np
 import scipy.sparse as sp
 from six import string_types
+from collections import deque
 
 from .Utils.SolverUtils import *
 from . import Utils
@@ -190,6 +191,12 @@ class Minimize(object):
     counter = None  #: Set this to a SimPEG.Utils.Counter() if you want to count things
     parent = None  #: This is the parent of the optimization routine.
 
+    #: Attributes saved by :meth:`checkpoint` to resume the optimization
+    _checkpoint_attrs = [
+        'iter', 'x0', 'xc', 'x_last', 'f0', 'g0', 'f_last', 'comment',
+        '_rememberList'
+    ]
+
     def __init__(self, **kwargs):
         self.stoppers = [
             StoppingCriteria.tolerance_f, StoppingCriteria.moving_x,
@@ -226,13 +233,15 @@ class Minimize(object):
 
 
     @Utils.timeIt
-    def minimize(self, evalFunction, x0):
-        """minimize(evalFunction, x0)
+    def minimize(self, evalFunction, x0, resume=None):
+        """minimize(evalFunction, x0, resume=None)
 
         Minimizes the function (evalFunction) starting at the location x0.
 
         :param callable evalFunction: function handle that evaluates: f, g, H = F(x)
         :param numpy.ndarray x0: starting location
+        :param dict resume: state saved by :meth:`checkpoint`, the
+            optimization continues from there after the startup
         :rtype: numpy.ndarray
         :return: x, the last iterate of the optimization algorithm
 
@@ -273,6 +282,8 @@ class Minimize(object):
         """
         self.evalFunction = evalFunction
         self.startup(x0)
+        if resume is not None:
+            self.resume(resume)
         self.printInit()
         print('x0 has any nan: {:b}'.format(np.any(np.isnan(x0))))
         while True:
@@ -326,6 +337,34 @@ class Minimize(object):
         self.f_last = np.nan
         self.x_last = x0
 
+    def checkpoint(self):
+        """checkpoint()
+
+            The state needed to continue the optimization after the current
+            iteration (iterates, counters, BFGS memory, preconditioner...),
+            as a dict of arrays and python values. Operators that can not
+            be saved (e.g. a LinearOperator) are left out and rebuilt.
+
+            :rtype: dict
+        """
+        state = {}
+        for name in self._checkpoint_attrs:
+            value = getattr(self, name, None)
+            if value is None or isinstance(value, sp.linalg.LinearOperator):
+                continue
+            state[name] = value
+        return state
+
+    def resume(self, state):
+        """resume(state)
+
+            Restore a state saved by :meth:`checkpoint`.
+
+            :param dict state: saved state
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+
     @Utils.count
     @Utils.callHooks('doStartIteration')
     def doStartIteration(self):
@@ -596,9 +635,12 @@ class Remember(object):
 
         The param name (str) can also be located in the parent (if no conflicts),
         and it will be looked up by default.
+
+        Set *rememberWindow* to only keep the values of the last iterations.
     """
 
     _rememberThese = []
+    rememberWindow = None  #: Number of iterations remembered, None for all
 
     def remember(self, *args):
         self._rememberThese = args
@@ -608,15 +650,17 @@ class Remember(object):
             "You didn't tell me to remember " + param +
             ", you gotta tell me what to remember!"
         )
-        return self._rememberList[param]
+        return list(self._rememberList[param])
 
     def _startupRemember(self, x0):
         self._rememberList = {}
         for param in self._rememberThese:
             if isinstance(param, string_types):
-                self._rememberList[param] = []
+                self._rememberList[param] = deque(maxlen=self.rememberWindow)
             elif isinstance(param, tuple):
-                self._rememberList[param[0]] = []
+                self._rememberList[param[0]] = deque(
+                    maxlen=self.rememberWindow
+                )
 
     def _doEndIterationRemember(self, *args):
         for param in self._rememberThese:
@@ -632,7 +676,104 @@ class Remember(object):
                 self._rememberList[param[0]].append( param[1](self) )
 
 
-class ProjectedGradient(Minimize, Remember):
+class BFGS(Minimize, Remember):
+    name = 'BFGS'
+    nbfgs = 10
+
+    _checkpoint_attrs = Minimize._checkpoint_attrs + [
+        'g_last', '_bfgscnt', '_bfgsY', '_bfgsS', '_bfgsRho'
+    ]
+
+    def __init__(self, **kwargs):
+        Minimize.__init__(self, **kwargs)
+
+    @property
+    def bfgsH0(self):
+        """
+            Approximate Hessian used in preconditioning the problem.
+
+            Must be a SimPEG.Solver
+        """
+        if getattr(self, '_bfgsH0', None) is None:
+            print("""
+                Default solver: SolverDiag is being used in bfgsH0
+                """
+            )
+            self._bfgsH0 = SolverDiag(sp.identity(self.xc.size))
+        return self._bfgsH0
+
+    @bfgsH0.setter
+    def bfgsH0(self, value):
+        self._bfgsH0 = value
+
+    def _startup_BFGS(self, x0):
+        # circular buffer of the last nbfgs pairs, _bfgscnt is the newest
+        self._bfgscnt = -1
+        self._bfgsY = np.zeros((x0.size, self.nbfgs), order='F')
+        self._bfgsS = np.zeros((x0.size, self.nbfgs), order='F')
+        self._bfgsRho = np.zeros(self.nbfgs)
+        if not np.any([p is IterationPrinters.comment for p in self.printers]):
+            self.printers.append(IterationPrinters.comment)
+
+    def bfgs(self, d):
+        """bfgs(d)
+
+            Applies the L-BFGS approximation of the inverse Hessian to d,
+            using the two-loop recursion over the last *nbfgs* pairs.
+
+        """
+        S, Y, rho = self._bfgsS, self._bfgsY, self._bfgsRho
+        nbfgs = S.shape[1]
+        n = min(self._bfgscnt + 1, nbfgs)
+        order = np.mod(self._bfgscnt - np.arange(n), nbfgs)  # newest first
+
+        shape = d.shape
+        d = np.array(d, dtype=np.result_type(d, float)).ravel()
+        alpha = np.empty(n)
+        for i, k in enumerate(order):
+            alpha[i] = rho[k] * np.vdot(S[:, k], d)
+            d -= alpha[i] * Y[:, k]
+
+        d = np.array(self.bfgsH0 * d).ravel()  # bfgsH0 is a SimPEG.Solver
+
+        for i in range(n-1, -1, -1):
+            k = order[i]
+            beta = rho[k] * np.vdot(Y[:, k], d)
+            d += (alpha[i] - beta) * S[:, k]
+        return d.reshape(shape)
+
+    def findSearchDirection(self):
+        return self.bfgs(-self.g)
+
+    def _doEndIteration_BFGS(self, xt):
+        if self.iter is 0:
+            self.g_last = self.g
+            return
+
+        # the gradient g_last was evaluated at x_last
+        yy = self.g - self.g_last
+        ss = self.xc - self.x_last
+        self.g_last = self.g
+
+        ys = yy.dot(ss)
+        if ys > 0:
+            self._bfgscnt += 1
+            ktop = np.mod(self._bfgscnt, self.nbfgs)
+            self._bfgsY[:, ktop] = yy
+            self._bfgsS[:, ktop] = ss
+            self._bfgsRho[ktop] = 1./ys
+            self.comment = ''
+        else:
+            self.comment = 'Skip BFGS'
+
+
+class ProjectedGradient(BFGS, Minimize, Remember):
+    """
+        Projected gradient with CG steps on the free variables, MoreToraldo91.
+
+        As in L-BFGS-B, the CG steps are preconditioned by the L-BFGS
+        approximation (see :class:`BFGS`) restricted to the free variables.
+    """
     name = 'Projected Gradient'
 
     maxIterCG = 5
@@ -641,6 +782,11 @@ class ProjectedGradient(Minimize, Remember):
     lower = -np.inf
     upper = np.inf
 
+    _checkpoint_attrs = BFGS._checkpoint_attrs + [
+        'explorePG', 'exploreCG', 'stopDoingPG', '_itType', 'aSet_prev',
+        'f_decrease_max'
+    ]
+
     def __init__(self,**kwargs):
         super(ProjectedGradient, self).__init__(**kwargs)
 
@@ -675,7 +821,7 @@ class ProjectedGradient(Minimize, Remember):
             Make sure we are feasible.
 
         """
-        return np.median(np.c_[self.lower, x, self.upper], axis=1)
+        return np.clip(x, self.lower, self.upper)
 
     @Utils.count
     def activeSet(self, x):
@@ -761,11 +907,17 @@ class ProjectedGradient(Minimize, Remember):
             def reduceHess(v):
                 # Z is tall and skinny
                 return Z.T*(self.H*(Z*v))
+            def reduceHinv(v):
+                return Z.T*self.bfgs(Z*v)
             operator = sp.linalg.LinearOperator(
                 (shape[1], shape[1]), reduceHess, dtype=self.xc.dtype
             )
+            M = sp.linalg.LinearOperator(
+                (shape[1], shape[1]), reduceHinv, dtype=self.xc.dtype
+            )
             p, info = sp.linalg.cg(
-                operator, -Z.T*self.g, tol=self.tolCG, maxiter=self.maxIterCG
+                operator, -Z.T*self.g, tol=self.tolCG, maxiter=self.maxIterCG,
+                M=M
             )
             p = Z*p  # bring up to full size
             # aSet_after = self.activeSet(self.xc+p)
@@ -811,80 +963,6 @@ class ProjectedGradient(Minimize, Remember):
             print('doEndIteration.ProjGrad, stopDoingSD: ', self.stopDoingPG)
 
 
-class BFGS(Minimize, Remember):
-    name = 'BFGS'
-    nbfgs = 10
-
-    def __init__(self, **kwargs):
-        Minimize.__init__(self, **kwargs)
-
-    @property
-    def bfgsH0(self):
-        """
-            Approximate Hessian used in preconditioning the problem.
-
-            Must be a SimPEG.Solver
-        """
-        if getattr(self, '_bfgsH0', None) is None:
-            print("""
-                Default solver: SolverDiag is being used in bfgsH0
-                """
-            )
-            self._bfgsH0 = SolverDiag(sp.identity(self.xc.size))
-        return self._bfgsH0
-
-    @bfgsH0.setter
-    def bfgsH0(self, value):
-        self._bfgsH0 = value
-
-    def _startup_BFGS(self, x0):
-        self._bfgscnt = -1
-        self._bfgsY = np.zeros((x0.size, self.nbfgs))
-        self._bfgsS = np.zeros((x0.size, self.nbfgs))
-        if not np.any([p is IterationPrinters.comment for p in self.printers]):
-            self.printers.append(IterationPrinters.comment)
-
-    def bfgs(self, d):
-        n = self._bfgscnt
-        nn = ktop = min(self._bfgsS.shape[1], n)
-        return self.bfgsrec(ktop, n, nn, self._bfgsS, self._bfgsY, d)
-
-    def bfgsrec(self, k, n, nn, S, Y, d):
-        """BFGS recursion"""
-        if k < 0:
-            d = self.bfgsH0 * d  # Assume that bfgsH0 is a SimPEG.Solver
-        else:
-            khat = 0 if nn is 0 else np.mod(n-nn+k,nn)
-            gamma = np.vdot(S[:, khat], d)/np.vdot(Y[:, khat], S[:, khat])
-            d = d - gamma*Y[:, khat]
-            d = self.bfgsrec(k-1, n, nn, S, Y, d)
-            d = d + (
-                gamma - np.vdot(Y[:, khat], d)/np.vdot(Y[:, khat], S[:, khat])
-            ) * S[:, khat]
-        return d
-
-    def findSearchDirection(self):
-        return self.bfgs(-self.g)
-
-    def _doEndIteration_BFGS(self, xt):
-        if self.iter is 0:
-            self.g_last = self.g
-            return
-
-        yy = self.g - self.g_last
-        ss = self.xc - xt
-        self.g_last = self.g
-
-        if yy.dot(ss) > 0:
-            self._bfgscnt += 1
-            ktop = np.mod(self._bfgscnt, self.nbfgs)
-            self._bfgsY[:, ktop] = yy
-            self._bfgsS[:, ktop] = ss
-            self.comment = ''
-        else:
-            self.comment = 'Skip BFGS'
-
-
 class GaussNewton(Minimize, Remember):
     name = 'Gauss Newton'
 
@@ -921,6 +999,8 @@ class InexactGaussNewton(BFGS, Minimize, Remember):
     maxIterCG = 5
     tolCG = 1e-1
 
+    _checkpoint_attrs = BFGS._checkpoint_attrs + ['JtJdiag', '_approxHinv']
+
     @property
     def approxHinv(self):
         """
@@ -1069,6 +1149,10 @@ class ProjectedGNCG(BFGS, Minimize, Remember):
     lower = -np.inf
     upper = np.inf
 
+    _checkpoint_attrs = BFGS._checkpoint_attrs + [
+        'cg_count', 'JtJdiag', '_approxHinv'
+    ]
+
     def _startup(self, x0):
         # ensure bound vectors are the same size as the model
         if type(self.lower) is not np.ndarray:
@@ -1083,7 +1167,7 @@ class ProjectedGNCG(BFGS, Minimize, Remember):
             Make sure we are feasible.
 
         """
-        return np.median(np.c_[self.lower, x, self.upper], axis=1)
+        return np.clip(x, self.lower, self.upper)
 
     @Utils.count
     def activeSet(self, x):
@@ -1115,6 +1199,18 @@ class ProjectedGNCG(BFGS, Minimize, Remember):
     def approxHinv(self, value):
         self._approxHinv = value
 
+    def _cgWorkspace(self):
+        """Residual and search vectors of CG, reused between iterations"""
+        work = getattr(self, '_cgWork', None)
+        if work is None or work[0].shape != self.g.shape:
+            dtype = np.result_type(self.g, float)
+            work = (
+                np.empty(self.g.shape, dtype=dtype),
+                np.empty(self.g.shape, dtype=dtype)
+            )
+            self._cgWork = work
+        return work
+
     @Utils.timeIt
     def findSearchDirection(self):
         """
@@ -1123,27 +1219,28 @@ class ProjectedGNCG(BFGS, Minimize, Remember):
         """
 
         Active = self.activeSet(self.xc)
-        temp = sum((np.ones_like(self.xc.size)-Active))
+        r, p = self._cgWorkspace()
 
         step = np.zeros(self.g.size)
-        resid = -(1-Active) * self.g
 
-        r = (resid - (1-Active)*(self.H * step))
+        # the step starts at zero, so the residual is the inactive gradient
+        np.negative(self.g, out=r)
+        r[Active] = 0.
 
-        p = self.approxHinv*r
+        # the preconditioner is restricted to the inactive cells as well
+        p[:] = self.approxHinv*r
+        p[Active] = 0.
 
         sold = np.dot(r, p)
 
         count = 0
 
-        while np.all([
-            np.linalg.norm(r) > self.tolCG,
-            count < self.maxIterCG
-        ]):
+        while np.linalg.norm(r) > self.tolCG and count < self.maxIterCG:
 
             count += 1
 
-            q = (1-Active)*(self.H * p)
+            q = self.H * p
+            q[Active] = 0.
 
             alpha = sold / (np.dot(p, q))
 
@@ -1152,26 +1249,28 @@ class ProjectedGNCG(BFGS, Minimize, Remember):
             r -= alpha * q
 
             h = self.approxHinv * r
+            h[Active] = 0.
 
             snew = np.dot(r, h)
 
-            p = h + (snew / sold * p)
+            p *= snew / sold
+            p += h
 
             sold = snew
             # End CG Iterations
         self.cg_count += count
 
         # Take a gradient step on the active cells if exist
-        if temp != self.xc.size:
+        if Active.any():
 
-            rhs_a = (Active) * -self.g
+            rhs_a = np.where(Active, -self.g, 0.)
 
-            dm_i = max(abs(step))
-            dm_a = max(abs(rhs_a))
+            dm_i = np.abs(step).max()
+            dm_a = np.abs(rhs_a).max()
 
             # perturb inactive set off of bounds so that they are included
             # in the step
-            step = step + self.stepOffBoundsFact * (rhs_a * dm_i / dm_a)
+            step += self.stepOffBoundsFact * (dm_i / dm_a) * rhs_a
 
         # Only keep gradients going in the right direction on the active
         # set
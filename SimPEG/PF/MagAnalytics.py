@@ -5,7 +5,6 @@ from SimPEG import Utils
 from SimPEG import Mesh
 import numpy as np
 from SimPEG.Utils import kron3, speye, sdiag
-import matplotlib.pyplot as plt
 
 
 def spheremodel(mesh, x0, y0, z0, r):
@@ -1,5 +1,9 @@
 from __future__ import print_function
 
+from multiprocessing.pool import ThreadPool
+from six import string_types, with_metaclass
+import scipy.sparse as sp
+
 from discretize.base import BaseMesh
 from discretize import TensorMesh
 
@@ -16,7 +20,22 @@ import properties
 Solver = Utils.SolverUtils.Solver
 
 
-class BaseProblem(Props.HasModel):
+class _ProblemMetaclass(type(Props.HasModel)):
+    """
+        Profiles the fields, Jvec and Jtvec of every problem, see
+        :class:`SimPEG.Utils.Profiler`.
+    """
+
+    def __new__(mcs, name, bases, classdict):
+        for method in ['fields', 'Jvec', 'Jtvec']:
+            if method in classdict:
+                classdict[method] = Utils.profiled(classdict[method])
+        return super(_ProblemMetaclass, mcs).__new__(
+            mcs, name, bases, classdict
+        )
+
+
+class BaseProblem(with_metaclass(_ProblemMetaclass, Props.HasModel)):
     """Problem is the base class for all geophysical forward problems
     in SimPEG.
     """
@@ -36,6 +55,12 @@ class BaseProblem(Props.HasModel):
     #: Solver options as a kwarg dict
     solverOpts = {}
 
+    #: Fields options as a kwarg dict, e.g. {'precision': 'single'}
+    fieldsOpts = {}
+
+    #: Options of getJtJdiag as a kwarg dict, e.g. {'approach': 'Ones', 'k': 50}
+    JtJdiagOpts = {}
+
     #: A discretize instance.
     mesh = None
 
@@ -49,6 +74,10 @@ class BaseProblem(Props.HasModel):
                 )
             )
 
+        # solvers can be chosen by name, see Utils.SolverUtils.getSolver
+        if isinstance(kwargs.get('Solver'), string_types):
+            kwargs['Solver'] = Utils.SolverUtils.getSolver(kwargs['Solver'])
+
         super(BaseProblem, self).__init__(**kwargs)
         assert isinstance(mesh, BaseMesh), (
             "mesh must be a discretize object."
@@ -211,6 +240,132 @@ class BaseProblem(Props.HasModel):
         """
         return self.Jtvec(m, v, f)
 
+    def Jvec_block(self, m, V, f=None, n_cpu=1):
+        """Jvec_block(m, V, f=None, n_cpu=1)
+
+        Effect of J(m) on the columns of V. By default Jvec is applied to
+        each column, on n_cpu threads; problems that can multiply several
+        vectors at once should overwrite this.
+
+        :param numpy.ndarray m: model
+        :param numpy.ndarray V: vectors to multiply, (nP, nV)
+        :param Fields f: fields
+        :param int n_cpu: number of threads
+        :rtype: numpy.ndarray
+        :return: JV, (nD, nV)
+        """
+        return self._apply_columns(self.Jvec, m, V, f, n_cpu)
+
+    def Jtvec_block(self, m, V, f=None, n_cpu=1):
+        """Jtvec_block(m, V, f=None, n_cpu=1)
+
+        Effect of the transpose of J(m) on the columns of V, see
+        :meth:`Jvec_block`.
+
+        :param numpy.ndarray m: model
+        :param numpy.ndarray V: vectors to multiply, (nD, nV)
+        :param Fields f: fields
+        :param int n_cpu: number of threads
+        :rtype: numpy.ndarray
+        :return: JtV, (nP, nV)
+        """
+        return self._apply_columns(self.Jtvec, m, V, f, n_cpu)
+
+    def _apply_columns(self, fun, m, V, f, n_cpu):
+        V = np.asarray(V)
+        if V.ndim == 1:
+            return fun(m, V, f=f)
+        if f is None and V.shape[1] > 1:
+            f = self.fields(m)  # shared by all the columns
+
+        def apply(i):
+            return fun(m, V[:, i], f=f)
+
+        if n_cpu is not None and n_cpu > 1 and V.shape[1] > 1:
+            pool = ThreadPool(n_cpu)
+            columns = pool.map(apply, range(V.shape[1]))
+            pool.close()
+            pool.join()
+        else:
+            columns = [apply(i) for i in range(V.shape[1])]
+        return np.column_stack(columns)
+
+    def getJtJdiag(self, m, W=None, f=None):
+        """getJtJdiag(m, W=None, f=None)
+
+        Diagonal of J(m)^T W^T W J(m), the sum of the squared weighted
+        sensitivities of each model parameter. It is computed from J if the
+        problem can form it (getJ), otherwise from products with J^T, or
+        J^T J, as set in :attr:`JtJdiagOpts`:
+
+        - approach: 'Exact' (J^T on every datum), 'Ones' (random +/- 1 data
+          vectors, default), 'Random' (random data vectors) or 'Probing'
+          (probing vectors of J^T J in the model space),
+          see :func:`SimPEG.Utils.diagEstAtA` and :func:`SimPEG.Utils.diagEst`
+        - k: number of vectors of the estimates
+        - blockSize: number of vectors per Jvec_block or Jtvec_block (10)
+        - n_cpu: number of threads of Jvec_block and Jtvec_block (1)
+        - refresh: the diagonal is only computed again for every refresh-th
+          new model, the previous one is used in between (1)
+
+        :param numpy.ndarray m: model
+        :param scipy.sparse.csr_matrix W: data weights (identity if None)
+        :param Fields f: fields
+        :rtype: numpy.ndarray
+        :return: diag(J^T W^T W J)
+        """
+        refresh = self.JtJdiagOpts.get('refresh', 1)
+        cache = getattr(self, '_JtJdiagCache', None)
+        if cache is not None and cache['W'] is W:
+            if np.array_equal(cache['m'], m):
+                return cache['JtJdiag']
+            if cache['age'] + 1 < refresh:
+                cache['m'] = np.array(m, copy=True)
+                cache['age'] += 1
+                return cache['JtJdiag']
+
+        JtJdiag = self._getJtJdiag(m, W, f)
+        self._JtJdiagCache = {
+            'W': W, 'm': np.array(m, copy=True), 'JtJdiag': JtJdiag, 'age': 0
+        }
+        return JtJdiag
+
+    def _getJtJdiag(self, m, W, f):
+        if getattr(self, 'getJ', None) is not None:
+            J = self.getJ(m, f=f)
+            if W is not None:
+                J = W * J
+            if sp.issparse(J):
+                return Utils.mkvc(np.asarray(J.multiply(J).sum(axis=0)))
+            return Utils.mkvc(np.sum(np.power(J, 2), axis=0))
+
+        approach = self.JtJdiagOpts.get('approach', 'Ones')
+        k = self.JtJdiagOpts.get('k', None)
+        blockSize = self.JtJdiagOpts.get('blockSize', 10)
+        n_cpu = self.JtJdiagOpts.get('n_cpu', 1)
+        if f is None:
+            f = self.fields(m)
+
+        if approach.upper() == 'PROBING':
+            def JtJ(V):
+                JV = self.Jvec_block(m, V, f=f, n_cpu=n_cpu)
+                if W is not None:
+                    JV = W.T * (W * JV)
+                return self.Jtvec_block(m, JV, f=f, n_cpu=n_cpu)
+            return Utils.diagEst(
+                JtJ, len(m), k=k, approach='Probing', blockSize=blockSize
+            )
+
+        def JtWt(V):
+            if W is not None:
+                V = W.T * V
+            return self.Jtvec_block(m, V, f=f, n_cpu=n_cpu)
+
+        nD = W.shape[0] if W is not None else self.survey.nD
+        return Utils.diagEstAtA(
+            JtWt, nD, k=k, approach=approach, blockSize=blockSize
+        )
+
     def fields(self, m):
         """The field given the model.
 
@@ -324,3 +479,9 @@ class LinearProblem(BaseProblem):
 
     def Jtvec(self, m, v, f=None):
         return self.modelMap.deriv(m).T*self.G.T.dot(v)
+
+    def Jvec_block(self, m, V, f=None, n_cpu=1):
+        return self.Jvec(m, V, f=f)
+
+    def Jtvec_block(self, m, V, f=None, n_cpu=1):
+        return self.Jtvec(m, V, f=f)
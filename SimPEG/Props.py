@@ -11,6 +11,49 @@ from . import Maps
 from . import Utils
 
 
+def _cached(instance, name, compute):
+    """
+    Evaluate a physical property (or its derivative) once per model.
+
+    The values are stored on the instance until the `model` or a mapping
+    is set again (see :class:`HasModel`). Cached arrays are returned
+    read-only so they can not be changed in place by accident.
+    """
+    cache = getattr(instance, '_property_cache', None)
+    if cache is None:
+        return compute()
+
+    stats = instance._property_cache_stats.setdefault(
+        name, {'hits': 0, 'misses': 0}
+    )
+    counter = getattr(instance, 'counter', None)
+    if name in cache:
+        stats['hits'] += 1
+        if isinstance(counter, Utils.Counter):
+            counter.count('{}.{}.hit'.format(
+                instance.__class__.__name__, name
+            ))
+        return cache[name]
+
+    stats['misses'] += 1
+    if isinstance(counter, Utils.Counter):
+        counter.count('{}.{}.miss'.format(instance.__class__.__name__, name))
+    value = compute()
+    if isinstance(value, np.ndarray):
+        # a view, so arrays owned elsewhere (e.g. the model) stay writeable
+        value = value.view()
+        value.flags.writeable = False
+    cache[name] = value
+    return value
+
+
+def _clear_cache(instance):
+    # lets objects derived from the model (e.g. fields) notice the change
+    instance._model_version = getattr(instance, '_model_version', 0) + 1
+    if getattr(instance, '_property_cache', None) is not None:
+        instance._property_cache = {}
+
+
 class SphinxProp(object):
     """
     Update the auto-documenter from properties
@@ -120,6 +163,7 @@ class Mapping(SphinxProp, properties.Property):
             if value is not properties.utils.undefined:
                 value = scope.validate(self, value)
             self._set(scope.name, value)
+            _clear_cache(self)
             if value is not properties.utils.undefined:
                 scope.clear_props(self)
 
@@ -195,7 +239,10 @@ class PhysicalProperty(SphinxProp, properties.Property):
                             )
                         )
                 # Set by mapped reciprocal
-                return 1.0 / getattr(self, scope.reciprocal.name)
+                return _cached(
+                    self, scope.name,
+                    lambda: 1.0 / getattr(self, scope.reciprocal.name)
+                )
 
             mapping = getattr(self, scope.mapping.name)
             if mapping is None:
@@ -211,7 +258,7 @@ class PhysicalProperty(SphinxProp, properties.Property):
                         scope.name
                     )
                 )
-            return mapping * self.model
+            return _cached(self, scope.name, lambda: mapping * self.model)
 
         def fset(self, value):
             if value is not properties.utils.undefined:
@@ -219,6 +266,7 @@ class PhysicalProperty(SphinxProp, properties.Property):
                 if scope.reciprocal:
                     delattr(self, scope.reciprocal.name)
             self._set(scope.name, value)
+            _clear_cache(self)
             if value is not properties.utils.undefined:
                 scope.clear_mappings(self)
 
@@ -317,7 +365,9 @@ class Derivative(SphinxProp, properties.GettableProperty):
             if self.model is None:
                 return Utils.Zero()
 
-            return mapping.deriv(self.model)
+            return _cached(
+                self, scope.name, lambda: mapping.deriv(self.model)
+            )
 
         return property(fget=fget, doc=scope.doc)
 
@@ -356,6 +406,26 @@ class HasModel(BaseSimPEG):
 
     model = Model("Inversion model.")
 
+    #: Cache physical properties and their derivatives for the current model
+    cache_properties = True
+
+    def __init__(self, **kwargs):
+        self._property_cache = {} if self.cache_properties else None
+        self._property_cache_stats = {}
+        super(HasModel, self).__init__(**kwargs)
+
+    @properties.observer('model')
+    def _clear_property_cache(self, change):
+        _clear_cache(self)
+
+    @property
+    def property_cache_stats(self):
+        """Hits and misses of the physical property cache, by property"""
+        return {
+            name: dict(stats)
+            for name, stats in self._property_cache_stats.items()
+        }
+
     @property
     def _all_map_names(self):
         """Returns all Mapping properties"""
@@ -0,0 +1,319 @@
+from __future__ import division
+
+import itertools
+
+import numpy as np
+import scipy.sparse as sp
+
+from SimPEG import Problem
+from SimPEG import Props
+
+from ..StraightRay.RayTracing import ray_integral_matrix
+from ..StraightRay.StraightRaySurvey import StraightRaySurvey
+
+
+def _godunov_update(a, h, s):
+    """
+        First order upwind (Godunov) solution of the eikonal equation in a
+        cell from its upwind neighbours.
+
+        :param numpy.ndarray a: (dim x n) smallest neighbour time per axis
+        :param numpy.ndarray h: (dim x n) distance to that neighbour
+        :param numpy.ndarray s: (n,) slowness
+        :rtype: numpy.ndarray
+        :return: (n,) travel time
+    """
+    order = np.argsort(a, axis=0)
+    cols = np.arange(a.shape[1])
+    a, h = a[order, cols], h[order, cols]
+
+    T = a[0] + s*h[0]
+    A, B, C = 0., 0., 0.
+    with np.errstate(invalid='ignore', over='ignore'):
+        for m in range(a.shape[0]):
+            w = 1./h[m]**2
+            A, B, C = A + w, B + a[m]*w, C + a[m]**2*w
+            if m == 0:
+                continue
+            # sum_m ((T - a_m)/h_m)^2 = s^2, only if T is downwind of a_m
+            disc = np.maximum(B**2 - A*(C - s**2), 0.)
+            T = np.where(T > a[m], (B + np.sqrt(disc))/A, T)
+    return T
+
+
+def _neighbours(P, axis, dc):
+    """
+        Smallest neighbour value along axis of P and its distance.
+    """
+    n = P.shape[axis]
+    pad = np.full_like(np.take(P, [0], axis=axis), np.inf)
+    lower = np.concatenate([pad, np.take(P, range(n-1), axis=axis)], axis)
+    upper = np.concatenate([np.take(P, range(1, n), axis=axis), pad], axis)
+
+    shape = [1]*P.ndim
+    shape[axis] = n
+    hlower = np.r_[1., dc].reshape(shape)
+    hupper = np.r_[dc, 1.].reshape(shape)
+
+    a = np.minimum(lower, upper)
+    h = np.where(lower <= upper, hlower, hupper)
+    return a, h
+
+
+def _sweep(T, S, fixed, dcs, axis, reverse):
+    """
+        Gauss-Seidel sweep of the planes normal to axis. T is (nSrc x vnC),
+        all sources are updated together.
+    """
+    Tm = np.moveaxis(T, axis+1, 1)
+    Sm = np.moveaxis(S, axis, 0)
+    Fm = np.moveaxis(fixed, axis+1, 1)
+    others = [dc for e, dc in enumerate(dcs) if e != axis]
+    dc = dcs[axis]
+    n = Tm.shape[1]
+
+    for i in (range(n-1, -1, -1) if reverse else range(n)):
+        P = Tm[:, i]
+        lower = Tm[:, i-1] if i > 0 else np.inf
+        upper = Tm[:, i+1] if i < n-1 else np.inf
+        hlower = dc[i-1] if i > 0 else 1.
+        hupper = dc[i] if i < n-1 else 1.
+
+        a = [np.minimum(lower, upper)]
+        h = [np.where(lower <= upper, hlower, hupper)*np.ones_like(P)]
+        for k, dce in enumerate(others):
+            ak, hk = _neighbours(P, k+1, dce)
+            a.append(ak)
+            h.append(hk*np.ones_like(P))
+
+        shape = P.shape
+        T_new = _godunov_update(
+            np.array([ai.ravel() for ai in a]),
+            np.array([hi.ravel() for hi in h]),
+            (Sm[i]*np.ones_like(P)).ravel()
+        ).reshape(shape)
+        Tm[:, i] = np.where(Fm[:, i], P, np.minimum(P, T_new))
+
+
+def fast_sweeping(mesh, slowness, src_locs, tolerance=1e-6, maxIter=20):
+    """
+        First arrival travel times from point sources on a TensorMesh
+        (Zhao, 2005). The sweeps over the grid are vectorized over the
+        sources.
+
+        :param discretize.TensorMesh mesh: 2D or 3D tensor mesh
+        :param numpy.ndarray slowness: cell slowness (nC,)
+        :param numpy.ndarray src_locs: source locations (nSrc x dim)
+        :param float tolerance: relative change of the travel times to stop
+        :param int maxIter: maximum number of sweeping iterations
+        :rtype: numpy.ndarray
+        :return: travel times at cell centers (nSrc x nC)
+    """
+    if mesh._meshType != 'TENSOR':
+        raise NotImplementedError(
+            'fast_sweeping is only implemented for TensorMesh'
+        )
+    src_locs = np.atleast_2d(src_locs)
+    nSrc, dim = src_locs.shape[0], mesh.dim
+    vnC = tuple(mesh.vnC)
+
+    ccs = [mesh.vectorCCx, mesh.vectorCCy, mesh.vectorCCz][:dim]
+    nodes = [mesh.vectorNx, mesh.vectorNy, mesh.vectorNz][:dim]
+    dcs = [np.diff(cc) for cc in ccs]
+    S = slowness.reshape(vnC, order='F')
+
+    # Straight ray times from each source to the cells around it
+    T = np.full((nSrc,) + vnC, np.inf)
+    fixed = np.zeros(T.shape, dtype=bool)
+    for isrc, loc in enumerate(src_locs):
+        ind = [
+            np.clip(np.searchsorted(x, p) - 1, 0, x.size - 2)
+            for x, p in zip(nodes, loc)
+        ]
+        box = tuple(
+            slice(max(i-1, 0), min(i+2, n)) for i, n in zip(ind, vnC)
+        )
+        grid = np.meshgrid(*[cc[b] for cc, b in zip(ccs, box)], indexing='ij')
+        r = np.sqrt(sum((g - p)**2 for g, p in zip(grid, loc)))
+        T[(isrc,) + box] = S[box]*r
+        fixed[(isrc,) + box] = True
+
+    for it in range(maxIter):
+        T_old = T.copy()
+        for axis in range(dim):
+            for reverse in [False, True]:
+                _sweep(T, S, fixed, dcs, axis, reverse)
+        if np.all(np.isfinite(T)):
+            change = np.abs(T - T_old).max()
+            if change <= tolerance*T.max():
+                break
+
+    return np.moveaxis(T, 0, -1).reshape((-1, nSrc), order='F').T
+
+
+def _interp_cc(grids, ccs, src_ind, pts):
+    """
+        Multilinear interpolation of cell centered grids (nSrc x vnC) at
+        points, each point using the grids of its own source.
+    """
+    inds, weights = [], []
+    for cc, p in zip(ccs, pts.T):
+        p = np.clip(p, cc[0], cc[-1])
+        i = np.clip(np.searchsorted(cc, p) - 1, 0, cc.size - 2)
+        inds.append(i)
+        weights.append((p - cc[i])/(cc[i+1] - cc[i]))
+
+    out = np.zeros((pts.shape[0], len(grids)))
+    for corner in itertools.product([0, 1], repeat=len(ccs)):
+        w = np.ones(pts.shape[0])
+        for c, wd in zip(corner, weights):
+            w *= wd if c else 1. - wd
+        ind = (src_ind,) + tuple(i + c for i, c in zip(inds, corner))
+        for k, g in enumerate(grids):
+            out[:, k] += w*g[ind]
+    return out
+
+
+def trace_rays(mesh, traveltimes, src_locs, src_ind, rx_locs, step=0.5):
+    """
+        Back-trace rays from the receivers to their source along the
+        steepest descent of the travel times. All rays are traced together.
+
+        :param discretize.TensorMesh mesh: 2D or 3D tensor mesh
+        :param numpy.ndarray traveltimes: (nSrc x nC) travel times
+        :param numpy.ndarray src_locs: (nSrc x dim) source locations
+        :param numpy.ndarray src_ind: (nRay,) source of each ray
+        :param numpy.ndarray rx_locs: (nRay x dim) receiver locations
+        :param float step: step length as a fraction of the smallest cell
+        :rtype: scipy.sparse.csr_matrix
+        :return: (nRay x nC) length of every ray in every cell
+    """
+    dim, vnC = mesh.dim, tuple(mesh.vnC)
+    nSrc = src_locs.shape[0]
+    ccs = [mesh.vectorCCx, mesh.vectorCCy, mesh.vectorCCz][:dim]
+
+    T = np.moveaxis(
+        traveltimes.T.reshape(vnC + (nSrc,), order='F'), -1, 0
+    )
+    grads = np.gradient(T, *ccs, axis=tuple(range(1, dim+1)))
+    if dim == 1:
+        grads = [grads]
+
+    h = step*min(hi.min() for hi in mesh.h)
+    maxSteps = int(np.ceil(
+        4.*np.sqrt(sum(hi.sum()**2 for hi in mesh.h))/h
+    ))
+
+    nRay = rx_locs.shape[0]
+    rays, starts, ends = [], [], []
+    P = np.array(rx_locs, dtype=float)
+    active = np.arange(nRay)
+    for it in range(maxSteps):
+        target = src_locs[src_ind[active]]
+        toSrc = target - P[active]
+        dist = np.sqrt(np.sum(toSrc**2, axis=1))
+
+        # close enough, or out of steps, finish with a straight segment
+        done = dist <= 2.*h
+        if it == maxSteps - 1:
+            done[:] = True
+        rays.append(active[done])
+        starts.append(P[active[done]])
+        ends.append(target[done])
+        active = active[~done]
+        if active.size == 0:
+            break
+
+        g = _interp_cc(grads, ccs, src_ind[active], P[active])
+        norm = np.sqrt(np.sum(g**2, axis=1))
+        direction = toSrc[~done]/dist[~done, None]
+        descend = norm > 0.
+        direction[descend] = -g[descend]/norm[descend, None]
+
+        P_new = P[active] + h*direction
+        rays.append(active)
+        starts.append(P[active])
+        ends.append(P_new)
+        P[active] = P_new
+
+    rays = np.hstack(rays)
+    A = ray_integral_matrix(mesh, np.vstack(starts), np.vstack(ends))
+    sumRays = sp.csr_matrix(
+        (np.ones(rays.size), (rays, np.arange(rays.size))),
+        shape=(nRay, rays.size)
+    )
+    return sumRays * A
+
+
+class EikonalProblem(Problem.BaseProblem):
+    """
+        First arrival travel time tomography on curved rays.
+
+        The travel times from every source are computed with a fast sweeping
+        eikonal solver and the rays are back-traced from the receivers
+        along the travel time gradient. The sensitivity is the length of
+        the curved rays in every cell (Fermat's principle), so the problem
+        uses the same survey as the StraightRay problem.
+    """
+
+    slowness, slownessMap, slownessDeriv = Props.Invertible(
+        "Slowness model (1/v)"
+    )
+
+    surveyPair = StraightRaySurvey
+
+    tolerance = 1e-6  #: relative change of the travel times to stop sweeping
+    maxIter = 20  #: maximum number of sweeping iterations
+    step = 0.5  #: ray tracing step, as a fraction of the smallest cell
+
+    deleteTheseOnModelUpdate = ['_A', '_traveltimes']
+
+    def __init__(self, mesh, **kwargs):
+        assert mesh._meshType == 'TENSOR', (
+            'EikonalProblem requires a TensorMesh'
+        )
+        super(EikonalProblem, self).__init__(mesh, **kwargs)
+
+    @property
+    def src_locs(self):
+        return np.vstack([tx.loc for tx in self.survey.txList])
+
+    @property
+    def traveltimes(self):
+        """Travel times at cell centers for every source (nSrc x nC)"""
+        if getattr(self, '_traveltimes', None) is None:
+            self._traveltimes = fast_sweeping(
+                self.mesh, self.slowness, self.src_locs,
+                tolerance=self.tolerance, maxIter=self.maxIter
+            )
+        return self._traveltimes
+
+    @property
+    def A(self):
+        """Length of the curved rays in every cell (nD x nC)"""
+        if getattr(self, '_A', None) is not None:
+            return self._A
+
+        src_ind, rx_locs = [], []
+        for isrc, tx in enumerate(self.survey.txList):
+            for rx in tx.rxList:
+                rx_locs.append(rx.locs)
+                src_ind.append(np.full(rx.locs.shape[0], isrc, dtype=int))
+
+        self._A = trace_rays(
+            self.mesh, self.traveltimes, self.src_locs,
+            np.hstack(src_ind), np.vstack(rx_locs), step=self.step
+        )
+        return self._A
+
+    def fields(self, m):
+        self.model = m
+        return self.A * self.slowness
+
+    def Jvec(self, m, v, f=None):
+        self.model = m
+        return self.A * (self.slownessDeriv * v)
+
+    def Jtvec(self, m, v, f=None):
+        self.model = m
+        return self.slownessDeriv.T * (self.A.T * v)
@@ -0,0 +1,5 @@
+from .EikonalProblem import EikonalProblem as Problem
+from .EikonalProblem import fast_sweeping, trace_rays
+from ..StraightRay.StraightRaySurvey import StraightRaySurvey as Survey
+from ...Survey import BaseSrc as Src
+from ...Survey import BaseRx as Rx
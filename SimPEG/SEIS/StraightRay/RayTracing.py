@@ -0,0 +1,127 @@
+from __future__ import division
+
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def _ray_segments(nodes, src, rx):
+    """
+        Intersect straight rays with the planes of a tensor grid.
+
+        All grid plane crossings of a block of rays are computed at once, so
+        the traversal of a ray through the grid (Amanatides & Woo, 1987)
+        becomes a sort of its crossing distances followed by a lookup of the
+        cell containing the midpoint of every segment.
+
+        :param list nodes: node locations along each dimension
+        :param numpy.ndarray src: (nRay x dim) ray start locations
+        :param numpy.ndarray rx: (nRay x dim) ray end locations
+        :rtype: tuple
+        :return: (ray index, cell subscripts (nSeg x dim), segment length,
+            segment midpoints)
+    """
+    D = rx - src
+    L = np.sqrt(np.sum(D**2, axis=1))
+
+    # Fraction of the ray where it crosses each grid plane
+    alp = [np.zeros((src.shape[0], 1)), np.ones((src.shape[0], 1))]
+    for d, x in enumerate(nodes):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            a = (x[None, :] - src[:, d:d+1]) / D[:, d:d+1]
+        # rays parallel to the planes never cross them
+        a[~np.isfinite(a)] = 0.
+        alp.append(np.clip(a, 0., 1.))
+    alp = np.sort(np.hstack(alp), axis=1)
+
+    dalp = np.diff(alp, axis=1)
+    ray, seg = np.nonzero(dalp > 0.)
+    midAlp = 0.5*(alp[ray, seg] + alp[ray, seg+1])
+    length = dalp[ray, seg] * L[ray]
+    midPoint = src[ray] + midAlp[:, None]*D[ray]
+
+    # Cell containing each segment, drop the segments outside of the mesh
+    inside = np.ones(ray.size, dtype=bool)
+    subs = np.empty((ray.size, len(nodes)), dtype=int)
+    for d, x in enumerate(nodes):
+        inside &= (midPoint[:, d] >= x[0]) & (midPoint[:, d] <= x[-1])
+        subs[:, d] = np.clip(
+            np.searchsorted(x, midPoint[:, d], side='right') - 1,
+            0, x.size - 2
+        )
+
+    return ray[inside], subs[inside], length[inside], midPoint[inside]
+
+
+def ray_integral_matrix(
+    mesh, src_locs, rx_locs, parallelized=False, n_cpu=None,
+    chunk_size=1000
+):
+    """
+        Sparse matrix of the length of every straight ray in every cell.
+
+        Rays are traversed in blocks of chunk_size with vectorized grid
+        plane intersections. For a TreeMesh the rays are traversed on the
+        finest underlying grid and the segments are gathered into the
+        containing cells.
+
+        :param discretize.base.BaseMesh mesh: TensorMesh or TreeMesh (2D/3D)
+        :param numpy.ndarray src_locs: (nRay x dim) ray start locations
+        :param numpy.ndarray rx_locs: (nRay x dim) ray end locations
+        :param bool parallelized: traverse the blocks of rays in threads
+        :param int n_cpu: number of threads, defaults to the number of CPUs
+        :param int chunk_size: number of rays traversed at once
+        :rtype: scipy.sparse.csr_matrix
+        :return: (nRay x nC) ray lengths
+    """
+    if mesh._meshType not in ['TENSOR', 'TREE']:
+        raise NotImplementedError(
+            'Ray tracing is not implemented for {0!s} mesh'.format(
+                mesh._meshType
+            )
+        )
+
+    src_locs = np.atleast_2d(src_locs).astype(float)
+    rx_locs = np.atleast_2d(rx_locs).astype(float)
+    assert src_locs.shape == rx_locs.shape, (
+        'src_locs and rx_locs need to be the same size'
+    )
+    assert src_locs.shape[1] == mesh.dim, (
+        'locations must be {0:d}D'.format(mesh.dim)
+    )
+
+    nRay = src_locs.shape[0]
+    nodes = [
+        mesh.vectorNx, mesh.vectorNy, mesh.vectorNz
+    ][:mesh.dim]
+
+    def trace(start):
+        end = min(start + chunk_size, nRay)
+        ray, subs, length, midPoint = _ray_segments(
+            nodes, src_locs[start:end], rx_locs[start:end]
+        )
+        if mesh._meshType == 'TREE':
+            cells = mesh.point2index(midPoint)
+        else:
+            cells = np.ravel_multi_index(subs.T, mesh.vnC, order='F')
+        return ray + start, cells, length
+
+    starts = range(0, nRay, chunk_size)
+    if parallelized and len(starts) > 1:
+        if n_cpu is None:
+            n_cpu = multiprocessing.cpu_count()
+        pool = ThreadPool(n_cpu)
+        result = pool.map(trace, starts)
+        pool.close()
+        pool.join()
+    else:
+        result = [trace(start) for start in starts]
+
+    if len(result) == 0:
+        return sp.csr_matrix((nRay, mesh.nC))
+
+    I, J, V = [np.hstack(r) for r in zip(*result)]
+    # duplicate (ray, cell) pairs of a TreeMesh are summed
+    return sp.csr_matrix((V, (I, J)), shape=(nRay, mesh.nC))
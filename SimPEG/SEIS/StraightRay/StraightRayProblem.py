@@ -1,12 +1,13 @@
 import numpy as np
 import scipy.sparse as sp
-import matplotlib.pyplot as plt
 
 from SimPEG import Problem
 from SimPEG import Utils
 from SimPEG import Mesh
 from SimPEG import Props
 
+from .RayTracing import ray_integral_matrix
+
 
 def lengthInCell(O, D, x, y, plotIt=False):
 
@@ -17,6 +18,7 @@ def lengthInCell(O, D, x, y, plotIt=False):
         return O + a*D
 
     if plotIt:
+        import matplotlib.pyplot as plt
         plt.plot(x[[0, 0, 1, 1, 0]], y[[0, 1, 1, 0, 0]], 'b')
         plt.plot(O[0], O[1], 'rs')
         d = np.r_[0, maxD]
@@ -77,20 +79,26 @@ class StraightRayProblem(Problem.LinearProblem):
         "Slowness model (1/v)"
     )
 
+    parallelized = False  #: trace blocks of rays in threads
+    n_cpu = None  #: number of threads, defaults to the number of CPUs
+
     @property
     def A(self):
         if getattr(self, '_A', None) is not None:
             return self._A
 
-        self._A = sp.lil_matrix((self.survey.nD, self.mesh.nC))
-        row = 0
+        src_locs, rx_locs = [], []
         for tx in self.survey.txList:
             for rx in tx.rxList:
-                for loc_i in range(rx.locs.shape[0]):
-                    inds, V = lineintegral(self.mesh, tx.loc, rx.locs[loc_i, :])
-                    self._A[inds*0+row, inds] = V
-                    row += 1
-
+                rx_locs.append(rx.locs)
+                src_locs.append(
+                    np.repeat(np.atleast_2d(tx.loc), rx.locs.shape[0], axis=0)
+                )
+
+        self._A = ray_integral_matrix(
+            self.mesh, np.vstack(src_locs), np.vstack(rx_locs),
+            parallelized=self.parallelized, n_cpu=self.n_cpu
+        )
         return self._A
 
     def fields(self, m):
@@ -1,5 +1,6 @@
 from .StraightRayProblem import StraightRayProblem as Problem
 from .StraightRayProblem import lengthInCell
+from .RayTracing import ray_integral_matrix
 from .StraightRaySurvey import StraightRaySurvey as Survey
 from ...Survey import BaseSrc as Src
 from ...Survey import BaseRx as Rx
@@ -1 +1,2 @@
 from . import StraightRay
+from . import Eikonal
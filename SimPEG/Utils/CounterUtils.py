@@ -1,9 +1,24 @@
 from __future__ import print_function
 from six import string_types
+from collections import OrderedDict
+import json
+import sys
 import time
+import threading
 import numpy as np
 from functools import wraps
 
+try:
+    import resource
+except ImportError:
+    # not available on windows, spans do not record the memory there
+    resource = None
+
+try:
+    _process_time = time.process_time
+except AttributeError:
+    _process_time = time.clock  # python 2
+
 
 class Counter(object):
     """
@@ -79,12 +94,251 @@ class Counter(object):
             print("  {0:<40}: {1:4.2e}, {2:4.2e}, {3:4d}x".format(prop, a.mean(), a.sum(), l))
 
 
+def _peak_rss():
+    """Peak resident set size of the process in bytes (None if unknown)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on mac
+    return rss if sys.platform == 'darwin' else rss*1024
+
+
+class Span(object):
+    """
+        A timed section of the code, see :class:`Profiler`. Spans are
+        nested: the spans opened inside of a span are its children.
+    """
+
+    def __init__(self, profiler, name, parent=None, **attrs):
+        self.profiler = profiler
+        self.name = name
+        self.parent = parent
+        self.attrs = attrs
+        self.children = []
+        self.counters = OrderedDict()
+        self.start = None
+        self.wall = None
+        self.cpu = None
+        self.peak_rss_delta = None
+        self.thread = threading.current_thread().ident
+
+    def __enter__(self):
+        self.profiler._stack.append(self)
+        self._rss = _peak_rss()
+        self._cpu = _process_time()
+        self.start = time.time()
+        return self
+
+    def __exit__(self, *args):
+        self.wall = time.time() - self.start
+        self.cpu = _process_time() - self._cpu
+        if self._rss is not None:
+            self.peak_rss_delta = _peak_rss() - self._rss
+        stack = self.profiler._stack
+        if self in stack:
+            stack.remove(self)
+
+    def count(self, name, n=1):
+        with self.profiler._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self):
+        return OrderedDict([
+            ('name', self.name),
+            ('attrs', self.attrs),
+            ('start', self.start),
+            ('wall', self.wall),
+            ('cpu', self.cpu),
+            ('peak_rss_delta', self.peak_rss_delta),
+            ('counters', self.counters),
+            ('children', [child.to_dict() for child in self.children]),
+        ])
+
+
+class _NullSpan(object):
+    """Returned by a disabled profiler, does nothing"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler(object):
+    """
+        Profiler records a tree of timed spans with their wall and cpu time,
+        the change in peak memory and counters (factorizations, solves,
+        right hand side columns, matvecs, ...).
+
+        The fields, Jvec and Jtvec of every problem, the solvers, and the
+        methods decorated with *timeIt* open spans automatically when the
+        profiler is enabled. When disabled, :meth:`span` returns a shared
+        no-op object, so the instrumentation costs next to nothing.
+
+        ::
+
+            from SimPEG.Utils import profiler
+
+            with profiler:
+                inv.run(m0)
+
+            profiler.summary()
+            profiler.to_chrome_trace('trace.json')  # chrome://tracing
+
+        Own sections of code are profiled with::
+
+            with profiler.span('forward', freq=freq):
+                ...
+
+        Every thread has its own stack of open spans: the spans opened in a
+        thread pool are not nested under the spans of other threads.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """
+            Removes all recorded spans and counters.
+        """
+        self.spans = []
+        self.counters = OrderedDict()
+        self._local = threading.local()
+
+    @property
+    def _stack(self):
+        """Open spans of the current thread"""
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def __enter__(self):
+        self.reset()
+        self.enable()
+        return self
+
+    def __exit__(self, *args):
+        self.disable()
+
+    def span(self, name, **attrs):
+        """
+            Context manager timing the code it contains, it is a child of
+            the innermost open span.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        parent = self._stack[-1] if self._stack else None
+        span = Span(self, name, parent=parent, **attrs)
+        with self._lock:
+            (self.spans if parent is None else parent.children).append(span)
+        return span
+
+    def count(self, name, n=1):
+        """
+            Increases a counter of the innermost open span and the total.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+        if self._stack:
+            self._stack[-1].count(name, n)
+
+    def to_dict(self):
+        return OrderedDict([
+            ('spans', [span.to_dict() for span in self.spans]),
+            ('counters', self.counters),
+        ])
+
+    def to_json(self, fname=None):
+        """
+            Span tree and counters as JSON, written to fname if given.
+        """
+        out = json.dumps(self.to_dict(), indent=1)
+        if fname is not None:
+            with open(fname, 'w') as f:
+                f.write(out)
+        return out
+
+    def to_chrome_trace(self, fname=None):
+        """
+            Spans in the Chrome trace event format (chrome://tracing or
+            https://ui.perfetto.dev), written to fname if given.
+        """
+        events = []
+        t0 = min([span.start for span in self.spans] or [0.])
+
+        def add(span):
+            if span.wall is None:
+                return  # still open
+            args = dict(span.attrs)
+            args.update(span.counters)
+            args['cpu'] = span.cpu
+            if span.peak_rss_delta is not None:
+                args['peak_rss_delta'] = span.peak_rss_delta
+            events.append({
+                'name': span.name, 'ph': 'X', 'pid': 0, 'tid': span.thread,
+                'ts': (span.start - t0)*1e6, 'dur': span.wall*1e6,
+                'args': args,
+            })
+            for child in span.children:
+                add(child)
+
+        for span in self.spans:
+            add(span)
+
+        out = json.dumps({'traceEvents': events})
+        if fname is not None:
+            with open(fname, 'w') as f:
+                f.write(out)
+        return out
+
+    def summary(self):
+        """
+            Provides a text summary of the span tree and the counters.
+        """
+        def show(span, depth):
+            print("  {0:<50}: {1:4.2e}s wall, {2:4.2e}s cpu".format(
+                '  '*depth + span.name, span.wall or 0., span.cpu or 0.
+            ))
+            for child in span.children:
+                show(child, depth+1)
+
+        print('Spans:')
+        for span in self.spans:
+            show(span, 0)
+        print('\nCounters:')
+        for prop in self.counters:
+            print("  {0:<40}: {1:8d}".format(prop, self.counters[prop]))
+
+
+#: The profiler used by the SimPEG instrumentation, disabled by default
+profiler = Profiler()
+
+
 def count(f):
     @wraps(f)
     def wrapper(self, *args, **kwargs):
+        name = self.__class__.__name__+'.'+f.__name__
         counter = getattr(self, 'counter', None)
         if type(counter) is Counter:
-            counter.count(self.__class__.__name__+'.'+f.__name__)
+            counter.count(name)
+        profiler.count(name)
         out = f(self, *args, **kwargs)
         return out
     return wrapper
@@ -93,11 +347,32 @@ def count(f):
 def timeIt(f):
     @wraps(f)
     def wrapper(self, *args, **kwargs):
+        name = self.__class__.__name__+'.'+f.__name__
         counter = getattr(self, 'counter', None)
         if type(counter) is Counter:
-            counter.countTic(self.__class__.__name__+'.'+f.__name__)
-        out = f(self, *args, **kwargs)
+            counter.countTic(name)
+        with profiler.span(name):
+            out = f(self, *args, **kwargs)
         if type(counter) is Counter:
-            counter.countToc(self.__class__.__name__+'.'+f.__name__)
+            counter.countToc(name)
         return out
+    wrapper._profiled = True
+    return wrapper
+
+
+def profiled(f):
+    """
+        Opens a profiler span named Class.method around a method, the
+        lightweight version of *timeIt* used on hot methods.
+    """
+    if getattr(f, '_profiled', False):
+        return f
+
+    @wraps(f)
+    def wrapper(self, *args, **kwargs):
+        if not profiler.enabled:
+            return f(self, *args, **kwargs)
+        with profiler.span(self.__class__.__name__+'.'+f.__name__):
+            return f(self, *args, **kwargs)
+    wrapper._profiled = True
     return wrapper
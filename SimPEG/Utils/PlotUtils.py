@@ -1,6 +1,5 @@
 import numpy as np
 from scipy.interpolate import LinearNDInterpolator, NearestNDInterpolator
-import matplotlib.pyplot as plt
 
 
 def plot2Ddata(
@@ -69,6 +68,8 @@ def plot2Ddata(
                 contourOpts.pop(key)
     vmin, vmax = vlimits[0], vlimits[1]
 
+    import matplotlib.pyplot as plt
+
     # create a figure if it doesn't exist
     if ax is None:
         fig = plt.figure()
@@ -225,6 +226,8 @@ def plot2Ddata(
 def plotLayer(sig, LocSigZ, xscale='log', ax=None,
               showlayers=False, xlim=None, **kwargs):
     """Plot a layered earth model"""
+    import matplotlib.pyplot as plt
+
     sigma = np.repeat(sig, 2, axis=0)
     z = np.repeat(LocSigZ[1:], 2, axis=0)
     z = np.r_[LocSigZ[0], z, LocSigZ[-1]]
@@ -2,9 +2,25 @@ from __future__ import print_function
 import numpy as np
 from scipy.sparse import linalg
 from .matutils import mkvc
+from .CounterUtils import Counter, profiler
+from collections import OrderedDict
+import importlib
 import warnings
 
-def _checkAccuracy(A, b, X, accuracyTol):
+def _checkAccuracy(
+    A, b, X, accuracyTol, accuracySample=None, randomState=None
+):
+    if (
+        accuracySample is not None and X.ndim == 2 and
+        X.shape[1] > accuracySample
+    ):
+        # only check a random subset of the right hand sides, drawn from
+        # the solver's own generator so the global numpy random state does
+        # not depend on the accuracy check
+        if randomState is None:
+            randomState = np.random.RandomState(0)
+        cols = randomState.choice(X.shape[1], accuracySample, replace=False)
+        b, X = b[:, cols], X[:, cols]
     nrm = np.linalg.norm(mkvc(A*X - b), np.inf)
     nrm_b = np.linalg.norm(mkvc(b), np.inf)
     if nrm_b > 0:
@@ -15,7 +31,18 @@ def _checkAccuracy(A, b, X, accuracyTol):
         warnings.warn(msg, RuntimeWarning)
 
 
-def SolverWrapD(fun, factorize=True, checkAccuracy=True, accuracyTol=1e-6, name=None):
+def _profiledSolve(self, b):
+    """__mul__ of the wrapped solvers, counts the solves for the profiler"""
+    if type(b) is not np.ndarray:
+        raise TypeError('Can only multiply by a numpy array.')
+    nrhs = 1 if b.ndim == 1 else b.shape[1]
+    profiler.count('solves')
+    profiler.count('rhs_columns', nrhs)
+    with profiler.span(self.__class__.__name__+'.solve', rhs_columns=nrhs):
+        return self._solve(b)
+
+
+def SolverWrapD(fun, factorize=True, checkAccuracy=True, accuracyTol=1e-6, name=None, blockSolve=True, accuracySample=None):
     """
     Wraps a direct Solver.
 
@@ -25,6 +52,11 @@ def SolverWrapD(fun, factorize=True, checkAccuracy=True, accuracyTol=1e-6, name=
         Solver   = SolverUtils.SolverWrapD(sp.linalg.spsolve, factorize=False)
         SolverLU = SolverUtils.SolverWrapD(sp.linalg.splu, factorize=True)
 
+    If blockSolve is True, multiple right hand sides are passed to the
+    solver as one 2D array, otherwise they are solved one column at a time.
+    The accuracy check is optional (checkAccuracy) and can be limited to a
+    random sample of the right hand sides (accuracySample), these can also
+    be set as keyword arguments of the solver.
     """
 
     def __init__(self, A, **kwargs):
@@ -34,16 +66,18 @@ def SolverWrapD(fun, factorize=True, checkAccuracy=True, accuracyTol=1e-6, name=
         if "checkAccuracy" in kwargs: del kwargs["checkAccuracy"]
         self.accuracyTol = kwargs.get("accuracyTol", accuracyTol)
         if "accuracyTol" in kwargs: del kwargs["accuracyTol"]
+        self.accuracySample = kwargs.get("accuracySample", accuracySample)
+        if "accuracySample" in kwargs: del kwargs["accuracySample"]
+        self._randomState = np.random.RandomState(0)
 
         self.kwargs = kwargs
 
         if factorize:
-            self.solver = fun(self.A, **kwargs)
-
-    def __mul__(self, b):
-        if type(b) is not np.ndarray:
-            raise TypeError('Can only multiply by a numpy array.')
+            profiler.count('factorizations')
+            with profiler.span(self.__class__.__name__+'.factorize'):
+                self.solver = fun(self.A, **kwargs)
 
+    def _solve(self, b):
         if len(b.shape) == 1 or b.shape[1] == 1:
             b = b.flatten()
             # Just one RHS
@@ -59,27 +93,36 @@ def SolverWrapD(fun, factorize=True, checkAccuracy=True, accuracyTol=1e-6, name=
             if b.dtype is np.dtype('O'):
                 b = b.astype(type(b[0,0]))
 
-            X = np.empty_like(b)
-
-            for i in range(b.shape[1]):
+            if blockSolve:
                 if factorize:
-                    X[:,i] = self.solver.solve(b[:,i])
+                    X = self.solver.solve(b)
                 else:
-                    X[:,i] = fun(self.A, b[:,i], **self.kwargs)
+                    X = fun(self.A, b, **self.kwargs)
+                X = np.asarray(X).reshape(b.shape)
+            else:
+                X = np.empty_like(b)
+                for i in range(b.shape[1]):
+                    if factorize:
+                        X[:,i] = self.solver.solve(b[:,i])
+                    else:
+                        X[:,i] = fun(self.A, b[:,i], **self.kwargs)
 
         if self.checkAccuracy:
-            _checkAccuracy(self.A, b, X, self.accuracyTol)
+            _checkAccuracy(
+                self.A, b, X, self.accuracyTol, self.accuracySample,
+                self._randomState
+            )
         return X
 
     def clean(self):
         if factorize and hasattr(self.solver, 'clean'):
             return self.solver.clean()
 
-    return type(name if name is not None else fun.__name__, (object,), {"__init__": __init__, "clean": clean, "__mul__": __mul__})
+    return type(name if name is not None else fun.__name__, (object,), {"__init__": __init__, "clean": clean, "__mul__": _profiledSolve, "_solve": _solve})
 
 
 
-def SolverWrapI(fun, checkAccuracy=True, accuracyTol=1e-5, name=None):
+def SolverWrapI(fun, checkAccuracy=True, accuracyTol=1e-5, name=None, blockSolve=False, accuracySample=None):
     """
     Wraps an iterative Solver.
 
@@ -88,6 +131,8 @@ def SolverWrapI(fun, checkAccuracy=True, accuracyTol=1e-5, name=None):
         import scipy.sparse as sp
         SolverCG = SolverUtils.SolverWrapI(sp.linalg.cg)
 
+    Set blockSolve if fun solves all right hand sides (a 2D array) at once,
+    see :func:`blockCG`.
     """
 
     def __init__(self, A, **kwargs):
@@ -97,13 +142,13 @@ def SolverWrapI(fun, checkAccuracy=True, accuracyTol=1e-5, name=None):
         if "checkAccuracy" in kwargs: del kwargs["checkAccuracy"]
         self.accuracyTol = kwargs.get("accuracyTol", accuracyTol)
         if "accuracyTol" in kwargs: del kwargs["accuracyTol"]
+        self.accuracySample = kwargs.get("accuracySample", accuracySample)
+        if "accuracySample" in kwargs: del kwargs["accuracySample"]
+        self._randomState = np.random.RandomState(0)
 
         self.kwargs = kwargs
 
-    def __mul__(self, b):
-        if type(b) is not np.ndarray:
-            raise TypeError('Can only multiply by a numpy array.')
-
+    def _solve(self, b):
         if len(b.shape) == 1 or b.shape[1] == 1:
             b = b.flatten()
             # Just one RHS
@@ -114,6 +159,8 @@ def SolverWrapI(fun, checkAccuracy=True, accuracyTol=1e-5, name=None):
                 self.info = out[1]
             else:
                 X = out
+        elif blockSolve:
+            X, self.info = fun(self.A, b, **self.kwargs)
         else: # Multiple RHSs
             X = np.empty_like(b)
             for i in range(b.shape[1]):
@@ -126,19 +173,110 @@ def SolverWrapI(fun, checkAccuracy=True, accuracyTol=1e-5, name=None):
                     X[:,i] = out
 
         if self.checkAccuracy:
-            _checkAccuracy(self.A, b, X, self.accuracyTol)
+            _checkAccuracy(
+                self.A, b, X, self.accuracyTol, self.accuracySample,
+                self._randomState
+            )
         return X
 
     def clean(self):
         pass
 
-    return type(name if name is not None else fun.__name__, (object,), {"__init__": __init__, "clean": clean, "__mul__": __mul__})
+    return type(name if name is not None else fun.__name__, (object,), {"__init__": __init__, "clean": clean, "__mul__": _profiledSolve, "_solve": _solve})
+
+
+def blockCG(A, B, x0=None, tol=1e-5, maxiter=None, M=None):
+    """
+    Block conjugate gradient for a symmetric positive definite A
+    (O'Leary, 1980).
+
+    All right hand sides share one Krylov space, so every iteration is a
+    sparse matrix - dense block product. Converged columns are removed
+    from the block and the iteration restarts on the remaining columns.
+
+    :param A: (n x n) sparse matrix or LinearOperator
+    :param numpy.ndarray B: (n x nRHS) right hand sides
+    :param numpy.ndarray x0: initial guess
+    :param float tol: relative residual tolerance of every column
+    :param int maxiter: maximum number of iterations, default 10*n
+    :param M: preconditioner, approximates the inverse of A
+    :rtype: tuple
+    :return: (X, info), info is 0 on convergence, the number of
+        iterations otherwise (as in scipy.sparse.linalg)
+    """
+    B = np.asarray(B)
+    if B.ndim == 1:
+        X, info = blockCG(A, B[:, None], x0, tol, maxiter, M)
+        return X[:, 0], info
+
+    n = B.shape[0]
+    if maxiter is None:
+        maxiter = 10*n
+    if M is None:
+        M = lambda R: R
+    elif not callable(M):
+        M = (lambda Minv: lambda R: Minv * R)(M)
+
+    X = np.zeros(B.shape, dtype=np.result_type(A.dtype, B.dtype))
+    if x0 is not None:
+        X += np.asarray(x0).reshape(B.shape)
+    bnrm = np.linalg.norm(B, axis=0)
+    bnrm[bnrm == 0] = 1.
+
+    R = B - A*X
+    active = np.flatnonzero(np.linalg.norm(R, axis=0) > tol*bnrm)
+    restart = True
+    for it in range(maxiter):
+        if active.size == 0:
+            return X, 0
+        if restart:
+            Ra = R[:, active]
+            Z = M(Ra)
+            P = Z
+            rz = Z.conj().T.dot(Ra)
+            restart = False
+
+        Q = A*P
+        alpha = np.linalg.lstsq(P.conj().T.dot(Q), rz, rcond=None)[0]
+        X[:, active] += P.dot(alpha)
+        Ra = Ra - Q.dot(alpha)
+        R[:, active] = Ra
+
+        converged = np.linalg.norm(Ra, axis=0) <= tol*bnrm[active]
+        if np.any(converged):
+            active = active[~converged]
+            restart = True
+            continue
+
+        Z = M(Ra)
+        rz_new = Z.conj().T.dot(Ra)
+        beta = np.linalg.lstsq(rz, rz_new, rcond=None)[0]
+        P = Z + P.dot(beta)
+        rz = rz_new
+
+    return X, maxiter
 
 
 Solver   = SolverWrapD(linalg.spsolve, factorize=False, name="Solver")
 SolverLU = SolverWrapD(linalg.splu, factorize=True, name="SolverLU")
 SolverCG = SolverWrapI(linalg.cg, name="SolverCG")
 SolverBiCG = SolverWrapI(linalg.bicgstab, name="SolverBiCG")
+SolverGMRES = SolverWrapI(linalg.gmres, name="SolverGMRES")
+SolverBlockCG = SolverWrapI(blockCG, blockSolve=True, name="SolverBlockCG")
+
+
+class _CholmodFactor(object):
+    """Cholesky factorization of scikit-sparse (CHOLMOD)"""
+
+    def __init__(self, A, **kwargs):
+        from sksparse.cholmod import cholesky
+        self.factor = cholesky(A, **kwargs)
+
+    def solve(self, b):
+        return self.factor(b)
+
+
+SolverCHOLMOD = SolverWrapD(_CholmodFactor, factorize=True, name="SolverCHOLMOD")
 
 class SolverDiag(object):
     """docstring for SolverDiag"""
@@ -171,3 +309,326 @@ class SolverDiag(object):
 
     def clean(self):
         pass
+
+
+def _jacobi(A):
+    d = A.diagonal().copy()
+    d[d == 0] = 1.
+    return linalg.LinearOperator(
+        A.shape, matvec=lambda x: np.ravel(x)/d, dtype=A.dtype
+    )
+
+
+def _ilu(A, drop_tol=1e-4, fill_factor=10, **kwargs):
+    # keep the diagonal pivots of the (nearly) symmetric EM systems
+    kwargs.setdefault('diag_pivot_thresh', 0.)
+    kwargs.setdefault('permc_spec', 'MMD_AT_PLUS_A')
+    ilu = linalg.spilu(
+        A.tocsc(), drop_tol=drop_tol, fill_factor=fill_factor, **kwargs
+    )
+    return linalg.LinearOperator(
+        A.shape, matvec=lambda x: ilu.solve(np.ravel(x)), dtype=A.dtype
+    )
+
+
+def _amg(A):
+    import pyamg
+    return pyamg.smoothed_aggregation_solver(A.tocsr()).aspreconditioner()
+
+
+def _auxiliary_space(A, G):
+    """
+    Auxiliary space preconditioner for curl-curl systems (Hiptmair & Xu,
+    2007): a Jacobi smoother on the edges plus a correction in the space of
+    nodal gradients, where the curl-curl operator vanishes.
+    """
+    smoother = _jacobi(A)
+    G = G.tocsr()
+    Anodal = (G.T*A*G).tocsc()
+    try:
+        nodal = _amg(Anodal)
+    except ImportError:
+        lu = linalg.splu(Anodal)
+        nodal = linalg.LinearOperator(
+            Anodal.shape, matvec=lambda x: lu.solve(np.ravel(x)),
+            dtype=Anodal.dtype
+        )
+
+    def matvec(x):
+        x = np.ravel(x)
+        return smoother*x + G*(nodal*(G.T*x))
+
+    return linalg.LinearOperator(A.shape, matvec=matvec, dtype=A.dtype)
+
+
+PRECONDITIONERS = {
+    'jacobi': _jacobi,
+    'ilu': _ilu,
+    'amg': _amg,
+    'ams': _auxiliary_space,
+}
+
+
+class PreconditionerCache(object):
+    """
+    Share a preconditioner and the last solution between iterative solves.
+
+    Pass the same cache to every :class:`SolverIterative` of a problem
+    (e.g. through solverOpts). The preconditioner of the previous matrix
+    is reused as long as the relative (Frobenius) change of the matrix is
+    below reuse_tol, as between nearby frequencies or equal time steps, and
+    the previous solution is the initial guess of the next solve.
+    """
+
+    def __init__(self, reuse_tol=0.1, warm_start=True):
+        self.reuse_tol = reuse_tol
+        self.warm_start = warm_start
+        self.A = None
+        self.M = None
+        self.X = None
+
+    def preconditioner(self, A, build):
+        """
+        Preconditioner for A, built with build() if the cached one can not
+        be reused.
+
+        :rtype: tuple
+        :return: (preconditioner, reused)
+        """
+        if self.M is not None and self.A.shape == A.shape:
+            change = (
+                linalg.norm(A - self.A) / max(linalg.norm(self.A), 1e-300)
+            )
+            if change <= self.reuse_tol:
+                return self.M, True
+        self.A, self.M = A, build()
+        return self.M, False
+
+    def initial_guess(self, b):
+        if self.warm_start and self.X is not None and self.X.shape == b.shape:
+            return self.X
+        return None
+
+    def clean(self):
+        self.A = self.M = self.X = None
+
+
+class SolverIterative(object):
+    """
+    Preconditioned Krylov solver.
+
+    ::
+
+        cache = SolverUtils.PreconditionerCache(reuse_tol=0.1)
+        prob.Solver = SolverUtils.SolverIterative
+        prob.solverOpts = {
+            'method': 'bicgstab', 'preconditioner': 'ams',
+            'G': mesh.nodalGrad, 'cache': cache, 'counter': prob.counter
+        }
+
+    :param scipy.sparse.spmatrix A: system matrix
+    :param str method: 'bicgstab', 'cg', 'gmres' or 'minres'
+    :param preconditioner: 'jacobi', 'ilu', 'amg' (needs pyamg), 'ams'
+        (auxiliary space for curl-curl systems, needs the nodal gradient G),
+        None, or an operator approximating the inverse of A. Use 'ilu' or
+        'amg' for DC (Poisson) systems and 'ams' for FDEM/TDEM e-h systems
+    :param float tol: relative residual tolerance
+    :param int maxiter: maximum number of iterations per right hand side
+    :param scipy.sparse.spmatrix G: nodal gradient for 'ams'
+    :param PreconditionerCache cache: share the preconditioner and warm
+        start between solvers
+    :param Counter counter: records the solves, iterations and the built
+        and reused preconditioners
+    """
+
+    def __init__(
+        self, A, method='bicgstab', preconditioner='jacobi', tol=1e-6,
+        maxiter=1000, G=None, cache=None, counter=None, checkAccuracy=False,
+        accuracyTol=1e-5, **preconditionerOpts
+    ):
+        self.A = A.tocsr()
+        self.method = method
+        self.tol = tol
+        self.maxiter = maxiter
+        self.cache = cache
+        self.counter = counter
+        self.checkAccuracy = checkAccuracy
+        self.accuracyTol = accuracyTol
+        self.info = 0
+
+        def build():
+            self._count('SolverIterative.preconditioner_build')
+            profiler.count('factorizations')
+            if preconditioner is None:
+                return None
+            if not isinstance(preconditioner, str):
+                return preconditioner
+            if preconditioner == 'ams':
+                assert G is not None, (
+                    "The 'ams' preconditioner requires the nodal gradient G"
+                )
+                return _auxiliary_space(self.A, G)
+            return PRECONDITIONERS[preconditioner](
+                self.A, **preconditionerOpts
+            )
+
+        if cache is None:
+            self.M = build()
+        else:
+            self.M, reused = cache.preconditioner(self.A, build)
+            if reused:
+                self._count('SolverIterative.preconditioner_reuse')
+
+    def _count(self, prop):
+        if isinstance(self.counter, Counter):
+            self.counter.count(prop)
+
+    def _solveColumn(self, b, x0):
+        fun = {
+            'bicgstab': linalg.bicgstab,
+            'cg': linalg.cg,
+            'gmres': linalg.gmres,
+            'minres': linalg.minres,
+        }[self.method]
+
+        def callback(xk):
+            self._count('SolverIterative.iterations')
+
+        kwargs = dict(
+            x0=x0, tol=self.tol, maxiter=self.maxiter, M=self.M,
+            callback=callback
+        )
+        if self.method == 'gmres':
+            kwargs['callback_type'] = 'pr_norm'
+        A = self.A
+        if profiler.enabled:
+            def matvec(x):
+                profiler.count('matvecs')
+                return self.A.dot(x)
+            A = linalg.LinearOperator(self.A.shape, matvec, dtype=self.A.dtype)
+        x, info = fun(A, b, **kwargs)
+        self._count('SolverIterative.solves')
+        if info != 0:
+            self._count('SolverIterative.not_converged')
+        self.info = info
+        return x
+
+    __mul__ = _profiledSolve
+
+    def _solve(self, b):
+        if isinstance(self.counter, Counter):
+            self.counter.countTic('SolverIterative.solve')
+
+        x0 = None if self.cache is None else self.cache.initial_guess(b)
+        if len(b.shape) == 1 or b.shape[1] == 1:
+            X = self._solveColumn(
+                b.flatten(), None if x0 is None else x0.flatten()
+            ).reshape(b.shape)
+        else:
+            X = np.empty(b.shape, dtype=np.result_type(self.A.dtype, b.dtype))
+            for i in range(b.shape[1]):
+                X[:, i] = self._solveColumn(
+                    b[:, i], None if x0 is None else x0[:, i]
+                )
+
+        if self.cache is not None:
+            self.cache.X = X
+        if isinstance(self.counter, Counter):
+            self.counter.countToc('SolverIterative.solve')
+        if self.checkAccuracy:
+            _checkAccuracy(self.A, b, X, self.accuracyTol)
+        return X
+
+    def clean(self):
+        pass
+
+
+#: Registered solvers, by name: (solver, required module). Solvers of
+#: optional packages can be given as (module, attribute), they are imported
+#: when first requested.
+SOLVERS = OrderedDict()
+
+#: Direct solvers to choose from when no solver is named, fastest first
+DEFAULT_SOLVERS = ['Pardiso', 'Mumps', 'SolverLU']
+
+
+def registerSolver(name, solver, requires=None):
+    """
+    Register a solver so it can be requested by name from
+    :func:`getSolver`.
+
+    ::
+
+        registerSolver('MySolver', SolverWrapD(my_factorization))
+        registerSolver('Pardiso', ('pymatsolver', 'Pardiso'))
+
+    :param str name: name of the solver
+    :param solver: solver class, or (module, attribute) of an optional
+        solver that is imported when it is first requested
+    :param str requires: module that must be importable to use the solver
+    """
+    SOLVERS[name] = (solver, requires)
+
+
+def getSolver(name=None):
+    """
+    Get a registered solver by name. Without a name, the first available
+    solver of DEFAULT_SOLVERS is returned.
+
+    :param str name: name of the solver
+    :rtype: class
+    :return: solver class
+    """
+    if name is None:
+        for name in DEFAULT_SOLVERS:
+            try:
+                return getSolver(name)
+            except ImportError:
+                continue
+        return Solver
+
+    if name not in SOLVERS:
+        raise KeyError(
+            'Solver {} is not registered, choose from: {}'.format(
+                name, ', '.join(SOLVERS.keys())
+            )
+        )
+    solver, requires = SOLVERS[name]
+    if requires is not None:
+        importlib.import_module(requires)
+    if isinstance(solver, tuple):
+        module, attr = solver
+        solver = getattr(importlib.import_module(module), attr, None)
+        if solver is None:
+            raise ImportError('{} does not provide {}'.format(module, attr))
+        SOLVERS[name] = (solver, None)
+    return solver
+
+
+def availableSolvers():
+    """
+    Names of the registered solvers that can be imported.
+
+    :rtype: list
+    """
+    names = []
+    for name in SOLVERS:
+        try:
+            getSolver(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+registerSolver('Solver', Solver)
+registerSolver('SolverLU', SolverLU)
+registerSolver('SolverCG', SolverCG)
+registerSolver('SolverBiCG', SolverBiCG)
+registerSolver('SolverGMRES', SolverGMRES)
+registerSolver('SolverBlockCG', SolverBlockCG)
+registerSolver('SolverDiag', SolverDiag)
+registerSolver('SolverIterative', SolverIterative)
+registerSolver('CHOLMOD', SolverCHOLMOD, requires='sksparse.cholmod')
+registerSolver('Pardiso', ('pymatsolver', 'Pardiso'))
+registerSolver('Mumps', ('pymatsolver', 'Mumps'))
@@ -6,25 +6,25 @@ from .matutils import (
     mkvc, sdiag, sdInv, speye, kron3, spzeros, ddx, av,
     av_extrap, ndgrid, ind2sub, sub2ind, getSubArray,
     inv3X3BlockDiagonal, inv2X2BlockDiagonal, TensorType,
-    makePropertyTensor, invPropertyTensor, diagEst, Zero,
-    Identity, uniqueRows
+    makePropertyTensor, invPropertyTensor, diagEst, diagEstAtA, eigEstMax,
+    Zero, Identity, uniqueRows
 )
 from .codeutils import (
     memProfileWrapper, hook, setKwargs,
     printTitles, printLine, checkStoppers, printStoppers,
     callHooks, dependentProperty,
-    asArray_N_x_Dim, requires
+    asArray_N_x_Dim, requires, lazySubmodules
 )
 from .meshutils import (
     exampleLrmGrid, meshTensor, closestPoints, ExtractCoreMesh
 )
 from .curvutils import volTetra, faceInfo, indexCube
-from .CounterUtils import Counter, count, timeIt
+from .CounterUtils import Counter, count, timeIt, profiled, Profiler, profiler
 from . import ModelBuilder
 from . import SolverUtils
 from .coordutils import rotatePointsFromNormals, rotationMatrixFromNormals
-from .modelutils import surface2ind_topo
+from .modelutils import surface2ind_topo, get_surface_index, SurfaceIndex
 from .PlotUtils import plot2Ddata, plotLayer
-from .io_utils import download
+from .io_utils import download, BackgroundWriter, read_records
 
 from .printinfo import Versions
@@ -1,5 +1,7 @@
 from __future__ import print_function, division
+import sys
 import types
+import importlib
 import numpy as np
 from functools import wraps
 
@@ -220,3 +222,43 @@ def requires(var):
 
         return requiresVarWrapper
     return requiresVar
+
+
+def lazySubmodules(namespace, submodules):
+    """
+        Import submodules of a package on first access instead of when the
+        package is imported, so that ``import SimPEG`` stays fast::
+
+            lazySubmodules(globals(), {'Directives': 'Directives'})
+
+        :param dict namespace: globals() of the package
+        :param dict submodules: attribute name: module name, relative to the
+                                package
+
+        Module level ``__getattr__`` (PEP 562) needs python 3.7, on older
+        versions the submodules are imported right away.
+    """
+    package = namespace['__name__']
+
+    def load(name):
+        module = importlib.import_module('.' + submodules[name], package)
+        namespace[name] = module
+        return module
+
+    if sys.version_info < (3, 7):
+        for name in submodules:
+            load(name)
+        return
+
+    def __getattr__(name):
+        if name in submodules:
+            return load(name)
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(package, name)
+        )
+
+    def __dir__():
+        return sorted(set(namespace) | set(submodules))
+
+    namespace['__getattr__'] = __getattr__
+    namespace['__dir__'] = __dir__
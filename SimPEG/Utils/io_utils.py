@@ -3,6 +3,11 @@ import numpy as np
 import time as tm
 import re
 import warnings
+import atexit
+import os
+import threading
+import weakref
+from six.moves import queue
 
 def read_GOCAD_ts(tsfile):
     """
@@ -145,6 +150,164 @@ def surface2inds(vrtx, trgl, mesh, boundaries=True, internal=True):
     return insideGrid
 
 
+#: writers with a running thread, closed at exit. Weak references, so a
+#: writer that is no longer used is not kept alive until exit
+_RUNNING_WRITERS = weakref.WeakSet()
+
+
+@atexit.register
+def _close_writers():
+    for writer in list(_RUNNING_WRITERS):
+        writer.close()
+
+
+class BackgroundWriter(object):
+    """
+    Write output files from a background thread.
+
+    Writes are queued and done in order by a single thread, so the caller
+    only pays for copying the arrays. Files stay open between writes and
+    are flushed after each one. Call :code:`flush()` before reading a file
+    back, and :code:`close()` when done (done at exit otherwise).
+
+    Records (dicts of arrays and scalars) are appended to a binary file as
+    a sequence of :code:`.npy` blocks, the sorted field names followed by
+    the values. The file grows by one record per call and is read back
+    with :func:`read_records`.
+
+    .. code:: python
+
+        writer = BackgroundWriter()
+        writer.write_record('inversion.rec', {'iter': 1, 'm': m})
+        writer.close()
+        records = read_records('inversion.rec')
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._files = {}
+        self._error = None
+        self._thread = None
+
+    def _submit(self, fun, *args):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+            _RUNNING_WRITERS.add(self)
+        self._queue.put((fun, args))
+
+    def _run(self):
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                fun, args = task
+                if self._error is None:  # skip the writes after a failure
+                    fun(*args)
+            except Exception as error:
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _file(self, fname, mode):
+        fh = self._files.get(fname)
+        if fh is not None and 'a' in mode:
+            return fh
+        if fh is not None:
+            fh.close()
+        fh = self._files[fname] = open(fname, mode)
+        return fh
+
+    def _write_text(self, fname, text, mode):
+        fh = self._file(fname, mode)
+        fh.write(text)
+        fh.flush()
+
+    def _write_record(self, fname, record, mode):
+        fh = self._file(fname, mode)
+        names = sorted(record)
+        np.save(fh, np.array(names))
+        for name in names:
+            np.save(fh, record[name], allow_pickle=False)
+        fh.flush()
+
+    def write_text(self, fname, text, mode='a'):
+        """
+        Write text to a file, appended unless mode is 'w'.
+        """
+        self._submit(self._write_text, fname, text, mode)
+
+    def write_record(self, fname, record, mode='ab'):
+        """
+        Append a record, a dict of arrays and scalars, to a binary file
+        (truncated first if mode is 'wb'). None values are not written.
+        """
+        record = dict(
+            (name, np.array(value, copy=True))
+            for name, value in record.items() if value is not None
+        )
+        self._submit(self._write_record, fname, record, mode)
+
+    def save(self, fname, arr):
+        """
+        Save an array as :code:`numpy.save` does.
+        """
+        self._submit(np.save, fname, np.array(arr, copy=True))
+
+    def flush(self):
+        """
+        Wait until all the queued writes are done.
+        """
+        if self._thread is not None:
+            self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self):
+        """
+        Finish the queued writes, close the files and stop the thread.
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        _RUNNING_WRITERS.discard(self)
+        for fh in self._files.values():
+            fh.close()
+        self._files = {}
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+
+def read_records(fname):
+    """
+    Read the records appended to a file by
+    :meth:`BackgroundWriter.write_record`.
+
+    :param str fname: file name
+    :rtype: list
+    :return: a dict per record, 0-d arrays are returned as scalars
+    """
+    records = []
+    with open(fname, 'rb') as fh:
+        size = os.fstat(fh.fileno()).st_size
+        while fh.tell() < size:
+            names = np.load(fh)
+            record = {}
+            for name in names:
+                value = np.load(fh)
+                record[str(name)] = value[()] if value.ndim == 0 else value
+            records.append(record)
+    return records
+
+
 def download(
     url, folder='.', overwrite=False, verbose=True
 ):
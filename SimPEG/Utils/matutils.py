@@ -12,7 +12,7 @@ def avExtrap(**kwargs):
     raise Exception("avExtrap has been depreciated. Use av_extrap instead.")
 
 
-def diagEst(matFun, n, k=None, approach='Probing'):
+def diagEst(matFun, n, k=None, approach='Probing', blockSize=None):
     """
         Estimate the diagonal of a matrix, A. Note that the matrix may be a
         function which returns A times a vector.
@@ -27,6 +27,7 @@ def diagEst(matFun, n, k=None, approach='Probing'):
         :param int n: size of the vector that should be used to compute matFun(v)
         :param int k: number of vectors to be used to estimate the diagonal
         :param str approach: approach to be used for getting vectors
+        :param int blockSize: number of vectors passed to matFun at once, as the columns of an (n, blockSize) array (one vector at a time if None)
         :rtype: numpy.ndarray
         :return: est_diag(A)
 
@@ -42,37 +43,192 @@ def diagEst(matFun, n, k=None, approach='Probing'):
 
     if k is None:
         k = np.floor(n/10.)
+    k = int(k)
 
     if approach.upper() == 'ONES':
-        def getv(n, i=None):
-            v = np.random.randn(n)
-            v[v < 0] = -1.
-            v[v >= 0] = 1.
-            return v
+        def getV(n, cols):
+            V = np.random.randn(n, len(cols))
+            V[V < 0] = -1.
+            V[V >= 0] = 1.
+            return V
 
     elif approach.upper() == 'RANDOM':
-        def getv(n, i=None):
-            return np.random.randn(n)
+        def getV(n, cols):
+            return np.random.randn(n, len(cols))
 
     else:  # if approach == 'Probing':
-        def getv(n, i):
-            v = np.zeros(n)
-            v[i:n:k] = 1.
-            return v
+        def getV(n, cols):
+            return (
+                (np.arange(n) % k)[:, None] == np.asarray(cols)[None, :]
+            ).astype(float)
 
     Mv = np.zeros(n)
     vv = np.zeros(n)
 
-    for i in range(0, k):
-        vk = getv(n, i)
-        Mv += matFun(vk)*vk
-        vv += vk*vk
+    for cols in _blocks(k, blockSize):
+        V = getV(n, cols)
+        if blockSize is None:
+            MV = matFun(V[:, 0]).reshape(n, 1)
+        else:
+            MV = matFun(V)
+        Mv += (MV*V).sum(1)
+        vv += (V*V).sum(1)
 
     d = Mv/vv
 
     return d
 
 
+def diagEstAtA(AtFun, m, k=None, approach='Ones', blockSize=None):
+    """
+        Estimate the diagonal of A^T A from products with A^T only, e.g.
+        the sum of the squared sensitivities with J^T.
+
+        1. Exact: A^T times the unit vectors, k = m products
+        2. Ones: random +/- 1 entries (Hutchinson), k products
+        3. Random: random vectors, k products
+
+        The random estimates are unbiased as E[(A^T v)^2] = diag(A^T A) for
+        vectors v with uncorrelated entries of unit variance.
+
+        :param callable AtFun: takes a (numpy.ndarray) and multiplies it by A^T
+        :param int m: number of rows of A, the size of the vectors passed to AtFun
+        :param int k: number of vectors for the random estimates (m/10 if None)
+        :param str approach: 'Exact', 'Ones' or 'Random'
+        :param int blockSize: number of vectors passed to AtFun at once, as the columns of an (m, blockSize) array (one vector at a time if None)
+        :rtype: numpy.ndarray
+        :return: est_diag(A^T A)
+    """
+
+    if type(AtFun).__name__ == 'ndarray':
+        At = AtFun
+
+        def AtFun(v):
+            return At.dot(v)
+
+    if approach.upper() == 'EXACT':
+        k = m
+
+        def getV(m, cols):
+            V = np.zeros((m, len(cols)))
+            V[cols, np.arange(len(cols))] = 1.
+            return V
+
+    elif approach.upper() == 'RANDOM':
+        def getV(m, cols):
+            return np.random.randn(m, len(cols))
+
+    else:  # if approach == 'Ones':
+        def getV(m, cols):
+            V = np.random.randn(m, len(cols))
+            V[V < 0] = -1.
+            V[V >= 0] = 1.
+            return V
+
+    if k is None:
+        k = max(np.floor(m/10.), 1)
+    k = int(k)
+
+    d = 0.
+    for cols in _blocks(k, blockSize):
+        V = getV(m, cols)
+        if blockSize is None:
+            d += AtFun(V[:, 0])**2.
+        else:
+            d += (AtFun(V)**2.).sum(1)
+
+    if approach.upper() == 'EXACT':
+        return d
+    return d / k
+
+
+def eigEstMax(matFun, n, k=1, nIter=4, approach='Lanczos', X0=None):
+    """
+        Estimate the largest eigenvalue of a symmetric positive
+        semi-definite matrix, A, from products of A with blocks of vectors.
+
+        Three different approaches have been implemented:
+
+        1. Rayleigh: largest Rayleigh quotient of k random vectors
+        2. Power: block power iteration with k vectors, nIter + 1 products
+        3. Lanczos: block Krylov subspace of nIter blocks of k vectors
+           (default), nIter products
+
+        The estimate is a Ritz value of A, so it is not larger than the
+        largest eigenvalue. The error is the norm of the residual of the
+        Ritz vector: an eigenvalue of A lies within it of the estimate.
+
+        :param callable matFun: takes an (n, k) numpy.ndarray and multiplies it by A
+        :param int n: size of the vectors
+        :param int k: number of vectors in a block
+        :param int nIter: number of iterations (power, Lanczos)
+        :param str approach: 'Rayleigh', 'Power' or 'Lanczos'
+        :param numpy.ndarray X0: starting vectors, (n, k), random if None
+        :rtype: tuple
+        :return: (estimate, error)
+    """
+
+    if type(matFun).__name__ == 'ndarray':
+        A = matFun
+
+        def matFun(V):
+            return A.dot(V)
+
+    if X0 is None:
+        X0 = np.random.rand(n, k)
+    X = np.asarray(X0, dtype=float).reshape(n, -1)
+
+    if approach.upper() == 'RAYLEIGH':
+        AX = matFun(X)
+        theta = (X*AX).sum(0) / (X*X).sum(0)
+        j = np.argmax(theta)
+        err = (
+            np.linalg.norm(AX[:, j] - theta[j]*X[:, j]) /
+            np.linalg.norm(X[:, j])
+        )
+        return theta[j], err
+
+    Q = np.linalg.qr(X)[0]
+    if approach.upper() == 'POWER':
+        for i in range(nIter):
+            Q = np.linalg.qr(matFun(Q))[0]
+        basis, Abasis = Q, matFun(Q)
+
+    else:  # if approach == 'Lanczos':
+        blocks, Ablocks = [Q], []
+        for i in range(max(nIter, 1)):
+            AQ = matFun(blocks[-1])
+            Ablocks += [AQ]
+            if i == nIter - 1:
+                break
+            # block Lanczos step with full reorthogonalization
+            Qall = np.hstack(blocks)
+            Z = AQ - Qall.dot(Qall.T.dot(AQ))
+            Z -= Qall.dot(Qall.T.dot(Z))
+            Q, R = np.linalg.qr(Z)
+            keep = np.abs(np.diag(R)) > 1e-10 * np.linalg.norm(AQ)
+            if not keep.any():  # the Krylov subspace is invariant
+                break
+            blocks += [Q[:, keep]]
+        basis = np.hstack(blocks[:len(Ablocks)])
+        Abasis = np.hstack(Ablocks)
+
+    # Rayleigh-Ritz
+    T = basis.T.dot(Abasis)
+    theta, U = np.linalg.eigh(0.5*(T + T.T))
+    y, Ay = basis.dot(U[:, -1]), Abasis.dot(U[:, -1])
+    return theta[-1], np.linalg.norm(Ay - theta[-1]*y)
+
+
+def _blocks(k, blockSize=None):
+    """Column indices 0, ..., k-1 in blocks of blockSize (1 if None)"""
+    blockSize = 1 if blockSize is None else int(blockSize)
+    return [
+        np.arange(start, min(start + blockSize, k))
+        for start in range(0, k, blockSize)
+    ]
+
+
 def uniqueRows(M):
     b = np.ascontiguousarray(M).view(np.dtype(
         (np.void, M.dtype.itemsize * M.shape[1]))
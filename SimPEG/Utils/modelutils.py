@@ -1,7 +1,11 @@
 from .matutils import mkvc, ndgrid, uniqueRows
+import hashlib
+import weakref
+from collections import OrderedDict
+
 import numpy as np
 from scipy.interpolate import griddata, interp1d
-from scipy.interpolate import NearestNDInterpolator, LinearNDInterpolator
+from scipy.interpolate import LinearNDInterpolator
 from scipy.spatial import cKDTree
 import scipy.sparse as sp
 
@@ -27,8 +31,160 @@ def surface2ind_topo(mesh, topo, gridLoc='CC', method='nearest', fill_value=np.n
 
     :param numpy.ndarray actind: index vector for the active cells on the mesh
                                below the topography
+
+    .. note::
+
+        The result is cached on the SurfaceIndex of the (mesh, topo) pair,
+        see :func:`get_surface_index`.
+    """
+    return get_surface_index(mesh, topo).active_cells(
+        gridLoc=gridLoc, method=method, fill_value=fill_value
+    )
+
+
+_SURFACE_INDEX_CACHE = weakref.WeakKeyDictionary()
+_SURFACE_INDEX_CACHE_SIZE = 4  #: number of topographies cached per mesh
+
+
+def get_surface_index(mesh, topo=None):
+    """
+    Get the :class:`SurfaceIndex` of a (mesh, topo) pair. Indices are cached
+    per mesh and keyed by the content of topo, so repeated calls with the
+    same topography reuse the spatial index and its results.
+
+    :param discretize.base.BaseMesh mesh: TensorMesh or TreeMesh
+    :param numpy.ndarray topo: [X,Y,Z] topographic data (optional)
+    :rtype: SurfaceIndex
+    :return: spatial index of the mesh and topography
+    """
+    if topo is None:
+        key = None
+    else:
+        topo = np.ascontiguousarray(topo, dtype=float)
+        key = (topo.shape, hashlib.sha1(topo).hexdigest())
+
+    indices = _SURFACE_INDEX_CACHE.setdefault(mesh, OrderedDict())
+    if key in indices:
+        indices[key] = indices.pop(key)
+    else:
+        indices[key] = SurfaceIndex(mesh, topo)
+        if len(indices) > _SURFACE_INDEX_CACHE_SIZE:
+            indices.popitem(last=False)
+    return indices[key]
+
+
+class SurfaceIndex(object):
     """
-    if mesh._meshType == "TENSOR":
+    Spatial index of a mesh and, optionally, a topography surface
+
+    Cells are grouped into vertical columns of identical cell-center x (2D)
+    or x-y (3D) locations. KD-trees on the topography and on the column
+    locations replace brute force nearest neighbour searches and per-column
+    loops when computing active cells or draping locations on the surface.
+    Results are cached on the instance.
+
+    :param discretize.base.BaseMesh mesh: TensorMesh or TreeMesh
+    :param numpy.ndarray topo: [X,Y,Z] topographic data (optional)
+    """
+
+    def __init__(self, mesh, topo=None):
+        # a weak reference, the cache of get_surface_index is keyed by the
+        # mesh and must not keep it alive
+        self._mesh = weakref.ref(mesh)
+        self.topo = topo
+        self._columns = {}
+        self._trees = {}
+        self._active = {}
+        self._surface = {}
+
+    @property
+    def mesh(self):
+        """The mesh, the index only holds a weak reference to it"""
+        mesh = self._mesh()
+        if mesh is None:
+            raise ReferenceError("The mesh of the SurfaceIndex was deleted")
+        return mesh
+
+    @property
+    def topo_tree(self):
+        """KD-tree of the horizontal topography locations"""
+        if self.topo is None:
+            raise Exception("SurfaceIndex was created without topography")
+        if 'topo' not in self._trees:
+            self._trees['topo'] = cKDTree(self.topo[:, :-1])
+        return self._trees['topo']
+
+    def columns(self, core=False):
+        """
+        Vertical columns of the mesh
+
+        :param bool core: only use the cells of finest size (TreeMesh)
+        :rtype: tuple
+        :return: (column locations, column index of each cell, cell indices)
+        """
+        if core in self._columns:
+            return self._columns[core]
+
+        mesh = self.mesh
+        if mesh._meshType == "TREE":
+            if core:
+                inds = np.flatnonzero(np.isin(
+                    mesh.h_gridded, np.r_[[h.min() for h in mesh.h]]
+                ).all(axis=1))
+            else:
+                inds = np.arange(mesh.nC)
+            locs, _, colInd = uniqueRows(mesh.gridCC[inds, :-1])
+        else:
+            # tensor cells are ordered x (then y) first
+            nCol = int(np.prod(mesh.vnC[:-1]))
+            inds = np.arange(mesh.nC)
+            locs = mesh.gridCC[:nCol, :-1]
+            colInd = inds % nCol
+
+        self._columns[core] = (locs, colInd, inds)
+        return self._columns[core]
+
+    def column_tree(self, core=False):
+        """KD-tree of the column locations"""
+        if core not in self._trees:
+            self._trees[core] = cKDTree(self.columns(core=core)[0])
+        return self._trees[core]
+
+    def topo_elevation(self, locs):
+        """
+        Elevation of the nearest topography point
+
+        :param numpy.ndarray locs: horizontal locations
+        :rtype: numpy.ndarray
+        :return: elevations
+        """
+        locs = np.asarray(locs, dtype=float).reshape(
+            (-1, self.topo.shape[1]-1)
+        )
+        _, inds = self.topo_tree.query(locs)
+        return self.topo[inds, -1]
+
+    def active_cells(self, gridLoc='CC', method='nearest', fill_value=np.nan):
+        """
+        Active cells below the topography, see :func:`surface2ind_topo`
+        """
+        key = (gridLoc, method, str(fill_value))
+        if key not in self._active:
+            if self.mesh._meshType == "TENSOR":
+                actind = self._active_cells_tensor(gridLoc, method, fill_value)
+            elif self.mesh._meshType == "TREE":
+                actind = self._active_cells_tree(gridLoc, method)
+            else:
+                raise NotImplementedError(
+                    'surface2ind_topo not implemented for {0!s} mesh'.format(
+                        self.mesh._meshType
+                    )
+                )
+            self._active[key] = mkvc(actind)
+        return self._active[key].copy()
+
+    def _active_cells_tensor(self, gridLoc, method, fill_value):
+        mesh, topo = self.mesh, self.topo
 
         if mesh.dim == 3:
             # Check if Topo points are inside of the mesh
@@ -38,23 +194,21 @@ def surface2ind_topo(mesh, topo, gridLoc='CC', method='nearest', fill_value=np.n
             yminTopo, ymaxTopo = topo[:, 1].min(), topo[:, 1].max()
             if (xminTopo > xmin) or (xmaxTopo < xmax) or (yminTopo > ymin) or (ymaxTopo < ymax):
                 # If not, use nearest neihbor to extrapolate them
-                Ftopo = NearestNDInterpolator(topo[:, :2], topo[:, 2])
-                xinds =  np.logical_or(
+                xinds = np.logical_or(
                     xminTopo < mesh.vectorNx, xmaxTopo > mesh.vectorNx
                     )
-                yinds =  np.logical_or(
+                yinds = np.logical_or(
                     yminTopo < mesh.vectorNy, ymaxTopo > mesh.vectorNy
                     )
                 XYOut = ndgrid(mesh.vectorNx[xinds], mesh.vectorNy[yinds])
-                topoOut = Ftopo(XYOut)
+                topoOut = self.topo_elevation(XYOut)
                 topo = np.vstack((topo, np.c_[XYOut, topoOut]))
 
             if gridLoc == 'CC':
                 XY = ndgrid(mesh.vectorCCx, mesh.vectorCCy)
                 Zcc = mesh.gridCC[:, 2].reshape((np.prod(mesh.vnC[:2]), mesh.nCz), order='F')
                 gridTopo = griddata(topo[:, :2], topo[:, 2], XY, method=method, fill_value=fill_value)
-                actind = [gridTopo >= Zcc[:, ixy] for ixy in range(np.prod(mesh.vnC[2]))]
-                actind = np.hstack(actind)
+                actind = gridTopo[:, None] >= Zcc
 
             elif gridLoc == 'N':
 
@@ -62,16 +216,16 @@ def surface2ind_topo(mesh, topo, gridLoc='CC', method='nearest', fill_value=np.n
                 gridTopo = griddata(topo[:, :2], topo[:, 2], XY, method=method, fill_value=fill_value)
                 gridTopo = gridTopo.reshape(mesh.vnN[:2], order='F')
 
-                if mesh._meshType not in ['TENSOR', 'CYL', 'BASETENSOR']:
-                    raise NotImplementedError('Nodal surface2ind_topo not implemented for {0!s} mesh'.format(mesh._meshType))
-
-                # TODO: this will only work for tensor meshes
+                # Lowest of the four corner nodes of each column
+                gridTopo = np.minimum.reduce([
+                    gridTopo[:-1, :-1], gridTopo[1:, :-1],
+                    gridTopo[:-1, 1:], gridTopo[1:, 1:]
+                ])
                 Nz = mesh.vectorNz[1:]
-                actind = np.array([False]*mesh.nC).reshape(mesh.vnC, order='F')
+                actind = gridTopo[:, :, None] >= Nz[None, None, :]
 
-                for ii in range(mesh.nCx):
-                    for jj in range(mesh.nCy):
-                         actind[ii, jj, :] = [np.all(gridTopo[ii:ii+2, jj:jj+2] >= Nz[kk]) for kk in range(len(Nz))]
+            else:
+                raise Exception("gridLoc must be either CC or N")
 
         elif mesh.dim == 2:
             # Check if Topo points are inside of the mesh
@@ -89,64 +243,112 @@ def surface2ind_topo(mesh, topo, gridLoc='CC', method='nearest', fill_value=np.n
             elif gridLoc == 'N':
 
                 gridTopo = Ftopo(mesh.vectorNx)
-                if mesh._meshType not in ['TENSOR', 'CYL', 'BASETENSOR']:
-                    raise NotImplementedError('Nodal surface2ind_topo not implemented for {0!s} mesh'.format(mesh._meshType))
-
-                # TODO: this will only work for tensor meshes
+                gridTopo = np.minimum(gridTopo[:-1], gridTopo[1:])
                 Ny = mesh.vectorNy[1:]
-                actind = np.array([False]*mesh.nC).reshape(mesh.vnC, order='F')
+                actind = gridTopo[:, None] > Ny[None, :]
 
-                for ii in range(mesh.nCx):
-                    actind[ii, :] = [np.all(gridTopo[ii: ii+2] > Ny[kk]) for kk in range(len(Ny))]
+            else:
+                raise Exception("gridLoc must be either CC or N")
 
         else:
             raise NotImplementedError('surface2ind_topo not implemented for 1D mesh')
 
-    elif mesh._meshType == "TREE":
-        if mesh.dim == 3:
-            if gridLoc == "CC":
-                # Compute unique XY location
-                uniqXY = uniqueRows(mesh.gridCC[:, :2])
-
-                if method == "nearest":
-                    Ftopo = NearestNDInterpolator(topo[:, :2], topo[:, 2])
-                elif method == "linear":
-                    # Check if Topo points are inside of the mesh
-                    xmin, xmax = mesh.x0[0], mesh.hx.sum()+mesh.x0[0]
-                    xminTopo, xmaxTopo = topo[:, 0].min(), topo[:, 1].min()
-                    ymin, ymax = mesh.x0[1], mesh.hy.sum()+mesh.x0[1]
-                    yminTopo, ymaxTopo = topo[:, 1].min(), topo[:, 1].max()
-                    if (xminTopo > xmin) or (xmaxTopo < xmax) or (yminTopo > ymin) or (ymaxTopo < ymax):
-                        # If not, use nearest neihbor to extrapolate them
-                        Ftopo = NearestNDInterpolator(topo[:, :2], topo[:, 2])
-                        xinds =  np.logical_or(
-                            xminTopo < uniqXY[0][:, 0], xmaxTopo > uniqXY[0][:, 0]
-                            )
-                        yinds =  np.logical_or(
-                            yminTopo < uniqXY[0][:, 1], ymaxTopo > uniqXY[0][:, 1]
-                            )
-                        inds = np.logical_or(xinds, yinds)
-                        XYOut = uniqXY[0][inds, :]
-                        topoOut = Ftopo(XYOut)
-                        topo = np.vstack((topo, np.c_[XYOut, topoOut]))
-                    Ftopo = LinearNDInterpolator(topo[:, :2], topo[:, 2])
-                else:
-                    raise NotImplementedError('Only nearest and linear method are available for TREE mesh')
-                actind = np.zeros(mesh.nC, dtype='bool')
-                npts = uniqXY[0].shape[0]
-                for i in range(npts):
-                    z = Ftopo(uniqXY[0][i, :])
-                    inds = uniqXY[2] == i
-                    actind[inds] = mesh.gridCC[inds, 2] < z[0]
-            # Need to implement
-            elif gridLoc == "N":
-                raise NotImplementedError('gridLoc=N is not implemented for TREE mesh')
-            else:
-                raise Exception("gridLoc must be either CC or N")
-        else:
+        return mkvc(actind)
+
+    def _active_cells_tree(self, gridLoc, method):
+        mesh, topo = self.mesh, self.topo
+
+        if mesh.dim != 3:
             raise NotImplementedError('surface2ind_topo not implemented for Quadtree or 1D mesh')
+        if gridLoc == "N":
+            raise NotImplementedError('gridLoc=N is not implemented for TREE mesh')
+        elif gridLoc != "CC":
+            raise Exception("gridLoc must be either CC or N")
 
-    return mkvc(actind)
+        # Compute unique XY location
+        uniqXY, colInd, _ = self.columns()
+
+        if method == "nearest":
+            z = self.topo_elevation(uniqXY)
+        elif method == "linear":
+            # Check if Topo points are inside of the mesh
+            xmin, xmax = mesh.x0[0], mesh.hx.sum()+mesh.x0[0]
+            xminTopo, xmaxTopo = topo[:, 0].min(), topo[:, 0].max()
+            ymin, ymax = mesh.x0[1], mesh.hy.sum()+mesh.x0[1]
+            yminTopo, ymaxTopo = topo[:, 1].min(), topo[:, 1].max()
+            if (xminTopo > xmin) or (xmaxTopo < xmax) or (yminTopo > ymin) or (ymaxTopo < ymax):
+                # If not, use nearest neihbor to extrapolate them
+                xinds = np.logical_or(
+                    xminTopo < uniqXY[:, 0], xmaxTopo > uniqXY[:, 0]
+                    )
+                yinds = np.logical_or(
+                    yminTopo < uniqXY[:, 1], ymaxTopo > uniqXY[:, 1]
+                    )
+                XYOut = uniqXY[np.logical_or(xinds, yinds), :]
+                topoOut = self.topo_elevation(XYOut)
+                topo = np.vstack((topo, np.c_[XYOut, topoOut]))
+            z = LinearNDInterpolator(topo[:, :2], topo[:, 2])(uniqXY)
+        else:
+            raise NotImplementedError('Only nearest and linear method are available for TREE mesh')
+
+        return mesh.gridCC[:, 2] < z[colInd]
+
+    def surface(self, actind, option="top"):
+        """
+        Elevation of the top active cell of every column. Columns without
+        active cells use their top cell.
+
+        :param numpy.ndarray actind: active cells
+        :param str option: 'top' (top face) or 'center' (cell center)
+        :rtype: tuple
+        :return: (column locations, elevations)
+        """
+        if option not in ["top", "center"]:
+            raise Exception("option must be either top or center")
+
+        actind = np.ascontiguousarray(actind)
+        if actind.dtype != bool:
+            actind = np.in1d(np.arange(self.mesh.nC), actind)
+
+        core = self.mesh._meshType == "TREE"
+        key = (
+            core, option, hashlib.sha1(actind).hexdigest()
+        )
+        if key in self._surface:
+            return self._surface[key]
+
+        locs, colInd, inds = self.columns(core=core)
+        z = self.mesh.gridCC[inds, -1]
+
+        # sort by column, active cells last, then by elevation, the last
+        # cell of every column is its top (active) cell
+        order = np.lexsort((z, actind[inds], colInd))
+        last = np.flatnonzero(np.diff(np.r_[colInd[order], -1]))
+        top = order[last]
+
+        elevation = z[top]
+        if option == "top":
+            elevation = elevation + self.mesh.h_gridded[inds[top], -1] * 0.5
+
+        self._surface[key] = (locs, elevation)
+        return self._surface[key]
+
+    def drape(self, pts, actind, option="top"):
+        """
+        Find the closest column of every location and return the elevation
+        of its top active cell
+
+        :param numpy.ndarray pts: horizontal locations
+        :param numpy.ndarray actind: active cells
+        :param str option: 'top' (top face) or 'center' (cell center)
+        :rtype: tuple
+        :return: (column indices, elevations)
+        """
+        _, elevation = self.surface(actind, option=option)
+        core = self.mesh._meshType == "TREE"
+        pts = np.asarray(pts, dtype=float).reshape((-1, self.mesh.dim-1))
+        _, inds = self.column_tree(core=core).query(pts)
+        return inds, elevation[inds]
 
 
 def surface_layer_index(mesh, topo, index=0):
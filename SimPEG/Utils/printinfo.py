@@ -3,50 +3,32 @@ from __future__ import print_function
 # Mandatory modules
 import sys
 import time
-import numpy
-import scipy
 import textwrap
 import platform
 import multiprocessing
+import importlib
 
-# Required packages
-import SimPEG
-import cython
-import properties
-import vectormath
-import discretize
-import pymatsolver
-
-# Optional modules
-try:
-    import IPython
-    from IPython.display import HTML, Pretty
-except ImportError:
-    IPython = False
-try:
-    import matplotlib
-except ImportError:
-    matplotlib = False
-try:
-    import ipywidgets
-except ImportError:
-    ipywidgets = False
-try:
-    import numexpr
-except ImportError:
-    numexpr = False
-try:
-    import mkl
-except ImportError:
-    mkl = False
-
-# Get mkl info from numexpr or mkl, if available
-if mkl:
-    mklinfo = mkl.get_version_string()
-elif numexpr:
-    mklinfo = numexpr.get_vml_version()
-else:
-    mklinfo = False
+# The required and optional packages are only imported when the version
+# information is shown, importing IPython or ipywidgets is slow
+
+
+def _optional_import(name):
+    """Import module `name`, False if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return False
+
+
+def _get_mklinfo():
+    """MKL information from numexpr or mkl, if available."""
+    mkl = _optional_import('mkl')
+    if mkl:
+        return mkl.get_version_string()
+    numexpr = _optional_import('numexpr')
+    if numexpr:
+        return numexpr.get_vml_version()
+    return False
 
 
 class Versions:
@@ -125,6 +107,7 @@ class Versions:
             text += '  '+txt+'\n'
 
         # mkl version
+        mklinfo = _get_mklinfo()
         if mklinfo:
             text += '\n'
             for txt in textwrap.wrap(mklinfo, n-4):
@@ -197,6 +180,7 @@ class Versions:
         html = colspan(html, sys.version, self.ncol, 1)
 
         # mkl version
+        mklinfo = _get_mklinfo()
         if mklinfo:
             html = colspan(html, mklinfo, self.ncol, 2)
 
@@ -210,11 +194,16 @@ class Versions:
         """Create list of packages."""
 
         # Mandatory packages
-        pckgs = [numpy, scipy, SimPEG, cython, properties, vectormath,
-                 discretize, pymatsolver]
+        pckgs = [
+            importlib.import_module(name) for name in [
+                'numpy', 'scipy', 'SimPEG', 'cython', 'properties',
+                'vectormath', 'discretize', 'pymatsolver'
+            ]
+        ]
 
         # Optional packages
-        for module in [IPython, ipywidgets, matplotlib]:
+        for name in ['IPython', 'ipywidgets', 'matplotlib']:
+            module = _optional_import(name)
             if module:
                 pckgs += [module]
 
@@ -11,9 +11,6 @@ from . import Survey
 from . import regularization as Regularization
 from . import DataMisfit
 from . import InvProblem
-from . import Optimization
-from . import Directives
-from . import Inversion
 from . import Tests
 
 from . import Utils
@@ -22,7 +19,16 @@ from .Utils import Versions
 from .Utils.SolverUtils import (
     _checkAccuracy, SolverWrapD, SolverWrapI,
     Solver, SolverCG, SolverDiag, SolverLU, SolverBiCG,
+    SolverGMRES, SolverBlockCG, getSolver, registerSolver,
 )
+
+# only needed to run an inversion, imported on first access
+Utils.lazySubmodules(globals(), {
+    'Optimization': 'Optimization',
+    'Directives': 'Directives',
+    'Inversion': 'Inversion',
+})
+
 __version__   = '0.13.1'
 __author__    = 'SimPEG Team'
 __license__   = 'MIT'
@@ -25,9 +25,15 @@ class BaseRegularization(ObjectiveFunction.BaseObjectiveFunction):
 
     :param discretize.base.BaseMesh mesh: SimPEG mesh
 
+    Regularizations with a weighting :math:`\mathbf{W} = diag(w) \mathbf{S}`
+    define :attr:`_W_factors`, so W is applied without forming the product.
+    The factors, W and W.T*W are built once and reused until a property they
+    depend on is set (see :meth:`_clear_W`).
+
     """
 
     def __init__(self, mesh=None, **kwargs):
+        self._W_cache = {}
         super(BaseRegularization, self).__init__()
         self.regmesh = RegularizationMesh(mesh)
         if "indActive" in kwargs.keys():
@@ -37,6 +43,9 @@ class BaseRegularization(ObjectiveFunction.BaseObjectiveFunction):
 
     counter = None
 
+    #: Reuse W and W.T*W until a property they are built from changes
+    cache_W = True
+
     # Properties
     mref = Props.Array(
         "reference model"
@@ -76,6 +85,82 @@ class BaseRegularization(ObjectiveFunction.BaseObjectiveFunction):
         if getattr(self, 'regmesh', None) is not None:
             self.regmesh.indActive = change['value']
 
+    @properties.observer(
+        ['mref', 'indActive', 'cell_weights', 'regmesh', 'mapping']
+    )
+    def _clear_W_on_change(self, change):
+        self._clear_W()
+
+    def _clear_W(self):
+        """Forget the weighting operators, they are rebuilt when needed"""
+        self._W_cache = {}
+
+    def _cached(self, name, compute):
+        if not self.cache_W:
+            return compute()
+        cache = getattr(self, '_W_cache', None)
+        if cache is not None and name in cache:
+            return cache[name]
+        value = compute()
+        # compute can set properties (e.g. scale) that clear the cache, the
+        # value is that of the current state
+        if getattr(self, '_W_cache', None) is None:
+            self._W_cache = {}
+        self._W_cache[name] = value
+        return value
+
+    @property
+    def _W_factors(self):
+        """
+        (w, S) with W = diag(w) * S, S is None if W is diagonal. None if W
+        is not of that form.
+        """
+        return None
+
+    def _factors(self):
+        return self._cached('factors', lambda: self._W_factors)
+
+    def _compile_W(self):
+        factors = self._factors()
+        if factors is None:
+            raise NotImplementedError('W is not implemented')
+        w, S = factors
+        if S is None:
+            return Utils.sdiag(w)
+        return Utils.sdiag(w) * S
+
+    @property
+    def W(self):
+        """
+        Weighting matrix
+        """
+        return self._cached('W', self._compile_W)
+
+    @property
+    def WtW(self):
+        """
+        W.T * W
+        """
+        return self._cached('WtW', lambda: self.W.T * self.W)
+
+    def _W_times(self, x):
+        factors = self._factors()
+        if factors is None:
+            return self.W * x
+        w, S = factors
+        if S is None:
+            return w * x
+        return w * (S * x)
+
+    def _Wt_times(self, r):
+        factors = self._factors()
+        if factors is None:
+            return self.W.T * r
+        w, S = factors
+        if S is None:
+            return w * r
+        return S.T * (w * r)
+
     @properties.validator('cell_weights')
     def _validate_cell_weights(self, change):
         if change['value'] is not None:
@@ -130,7 +215,7 @@ class BaseRegularization(ObjectiveFunction.BaseObjectiveFunction):
 
             r(m) = \\frac{1}{2}
         """
-        r = self.W * (self.mapping * (self._delta_m(m)))
+        r = self._W_times(self.mapping * (self._delta_m(m)))
         return 0.5 * r.dot(r)
 
     @Utils.timeIt
@@ -153,8 +238,8 @@ class BaseRegularization(ObjectiveFunction.BaseObjectiveFunction):
         """
 
         mD = self.mapping.deriv(self._delta_m(m))
-        r = self.W * (self.mapping * (self._delta_m(m)))
-        return mD.T * (self.W.T * r)
+        r = self._W_times(self.mapping * (self._delta_m(m)))
+        return mD.T * self._Wt_times(r)
 
     @Utils.timeIt
     def deriv2(self, m, v=None):
@@ -183,9 +268,9 @@ class BaseRegularization(ObjectiveFunction.BaseObjectiveFunction):
 
         mD = self.mapping.deriv(self._delta_m(m))
         if v is None:
-            return mD.T * self.W.T * self.W * mD
+            return mD.T * self.WtW * mD
 
-        return mD.T * (self.W.T * (self.W * (mD * v)))
+        return mD.T * self._Wt_times(self._W_times(mD * v))
 
 
 ###############################################################################
@@ -1,3 +1,5 @@
+import hashlib
+import weakref
 import numpy as np
 import scipy.sparse as sp
 import warnings
@@ -6,6 +8,36 @@ import properties
 from .. import Props
 from .. import Utils
 
+# Operators of every regularization mesh, shared by the regularizations on
+# the same mesh and active cells: {mesh: {key: {name: operator}}}
+_operator_store = weakref.WeakKeyDictionary()
+
+
+def _projection(active, n):
+    """Projection from the active entries (all if None) to n entries"""
+    if active is None:
+        return Utils.speye(n)
+    ind = np.where(active)[0]
+    return sp.csr_matrix(
+        (np.ones(ind.size), (ind, np.arange(ind.size))), shape=(n, ind.size)
+    )
+
+
+def _reduce(A, rows=None, cols=None):
+    """A restricted to the active rows and columns (all if None)"""
+    A = sp.csr_matrix(A)
+    for active, n in [(rows, A.shape[0]), (cols, A.shape[1])]:
+        if active is not None and active.size != n:
+            raise ValueError(
+                'The active entries ({}) do not match the operator '
+                '({})'.format(active.size, n)
+            )
+    if rows is not None:
+        A = A[np.where(rows)[0]]
+    if cols is not None:
+        A = A.tocsc()[:, np.where(cols)[0]].tocsr()
+    return A
+
 ###############################################################################
 #                                                                             #
 #                             Regularization Mesh                             #
@@ -20,13 +52,16 @@ class RegularizationMesh(Props.BaseSimPEG):
     are not necessarily true differential operators, but are constructed from
     a SimPEG Mesh.
 
+    The operators are built once for a mesh, its active cells and the
+    regularization type, and shared by all the regularization meshes of the
+    same setup. They can be saved with :meth:`save_operators` and loaded
+    with :meth:`load_operators`.
+
     :param discretize.base.BaseMesh mesh: problem mesh
     :param numpy.ndarray indActive: bool array, size nC, that is True where we have active cells. Used to reduce the operators so we regularize only on active cells
 
     """
 
-    regularization_type = None  # or 'Simple', 'Sparse' or 'Tikhonov'
-
     def __init__(self, mesh, **kwargs):
         self.mesh = mesh
         Utils.setKwargs(self, **kwargs)
@@ -43,6 +78,196 @@ class RegularizationMesh(Props.BaseSimPEG):
                 value[tmp] = True
                 change['value'] = value
 
+    @properties.observer('indActive')
+    def _reset_operators(self, change):
+        self._operators = None
+
+    @property
+    def regularization_type(self):
+        """None, or 'Simple', 'Sparse' or 'Tikhonov'"""
+        return getattr(self, '_regularization_type', None)
+
+    @regularization_type.setter
+    def regularization_type(self, value):
+        self._regularization_type = value
+        self._operators = None
+
+    @property
+    def _store_key(self):
+        """Key of the operators in the store"""
+        active = 'all'
+        if self.indActive is not None:
+            active = hashlib.sha1(
+                np.packbits(self.indActive).tobytes()
+            ).hexdigest()
+        # only the operators of a tree mesh depend on the regularization
+        rtype = None
+        if self.mesh._meshType == "TREE":
+            rtype = self.regularization_type == "Tikhonov"
+        return (self.mesh.nC, active, rtype)
+
+    @property
+    def _stored_operators(self):
+        """Operators of this mesh, active cells and regularization type"""
+        if getattr(self, '_operators', None) is None:
+            store = _operator_store.setdefault(self.mesh, {})
+            self._operators = store.setdefault(self._store_key, {})
+        return self._operators
+
+    def _operator(self, name, compute):
+        # operators set on the instance, e.g. regmesh._cellDiffx, come first
+        operator = getattr(self, '_' + name, None)
+        if operator is not None:
+            return operator
+        operators = self._stored_operators
+        if name not in operators:
+            operators[name] = compute()
+        return operators[name]
+
+    #: Operators built by :meth:`build_operators`
+    _operator_names = [
+        'vol', 'Pac', 'Paf{}', 'aveF{}2CC', 'aveCC2F{}', 'cellDiff{}',
+        'faceDiff{}', 'cellDiff{}Stencil'
+    ]
+
+    def build_operators(self):
+        """Build all the operators, e.g. before saving them"""
+        for name in self._operator_names:
+            for comp in 'xyz'[:self.dim]:
+                getattr(self, name.format(comp))
+
+    def save_operators(self, fname):
+        """
+        Save the operators built so far to a numpy .npz file
+
+        :param str fname: file name
+        """
+        if not self._stored_operators:
+            self.build_operators()
+        arrays = {'_key': np.array(repr(self._store_key))}
+        for name, op in self._stored_operators.items():
+            if op is None:  # all faces are active
+                continue
+            elif sp.issparse(op):
+                op = sp.csr_matrix(op)
+                for attr in ['data', 'indices', 'indptr', 'shape']:
+                    arrays['{}.{}'.format(name, attr)] = np.asarray(
+                        getattr(op, attr)
+                    )
+            else:
+                arrays[name] = np.asarray(op)
+        np.savez(fname, **arrays)
+
+    def load_operators(self, fname):
+        """
+        Load operators saved with :meth:`save_operators` for the same mesh,
+        active cells and regularization type. They replace the operators
+        already built for this setup.
+
+        :param str fname: file name
+        """
+        with np.load(fname) as arrays:
+            if str(arrays['_key']) != repr(self._store_key):
+                raise ValueError(
+                    'The operators in {} were saved for another mesh, active '
+                    'cells or regularization type'.format(fname)
+                )
+            operators = self._stored_operators
+            for key in arrays.files:
+                name, _, attr = key.partition('.')
+                if name == '_key' or attr not in ['', 'data']:
+                    continue
+                if attr == '':
+                    value = arrays[name]
+                else:
+                    value = sp.csr_matrix(
+                        (
+                            arrays[name + '.data'],
+                            arrays[name + '.indices'],
+                            arrays[name + '.indptr']
+                        ),
+                        shape=tuple(arrays[name + '.shape'])
+                    )
+                operators[name] = value
+
+    def _active_faces(self, comp):
+        """bool array of the active faces in a direction, None if all are"""
+        def compute():
+            if self.indActive is None:
+                return None
+            mesh = self.mesh
+            if (
+                mesh._meshType == "TREE" and
+                self.regularization_type != "Tikhonov"
+            ):
+                stencil = getattr(mesh, '_aveCC2F{}Stencil'.format(comp))()
+                return (stencil * self.indActive) >= 1
+            ave = getattr(mesh, 'aveF{}2CC'.format(comp))
+            return (ave.T * self.indActive) >= 1
+        return self._operator('indActive_F{}'.format(comp), compute)
+
+    def _Paf(self, comp):
+        def compute():
+            if self.indActive is None:
+                return Utils.speye(getattr(self.mesh, 'nF{}'.format(comp)))
+            active = self._active_faces(comp)
+            return _projection(active, active.size)
+        return self._operator('Paf{}'.format(comp), compute)
+
+    def _aveF2CC(self, comp):
+        def compute():
+            if (
+                self.mesh._meshType == "TREE" and
+                self.regularization_type != "Tikhonov"
+            ):
+                aveCC2F = self._aveCC2F(comp)
+                nCinRow = Utils.mkvc((aveCC2F.T).sum(1))
+                nCinRow[nCinRow > 0] = 1./nCinRow[nCinRow > 0]
+                return Utils.sdiag(nCinRow) * aveCC2F.T
+            return _reduce(
+                getattr(self.mesh, 'aveF{}2CC'.format(comp)),
+                self.indActive, self._active_faces(comp)
+            )
+        return self._operator('aveF{}2CC'.format(comp), compute)
+
+    def _aveCC2F(self, comp):
+        def compute():
+            if (
+                self.mesh._meshType == "TREE" and
+                self.regularization_type != "Tikhonov"
+            ):
+                return _reduce(
+                    getattr(self.mesh, '_aveCC2F{}Stencil'.format(comp))(),
+                    self._active_faces(comp), self.indActive
+                )
+            aveF2CC = self._aveF2CC(comp)
+            return Utils.sdiag(1./(aveF2CC.T).sum(1)) * aveF2CC.T
+        return self._operator('aveCC2F{}'.format(comp), compute)
+
+    def _cellDiff(self, comp):
+        def compute():
+            return _reduce(
+                getattr(self.mesh, 'cellGrad{}'.format(comp)),
+                self._active_faces(comp), self.indActive
+            )
+        return self._operator('cellDiff{}'.format(comp), compute)
+
+    def _faceDiff(self, comp):
+        def compute():
+            return _reduce(
+                getattr(self.mesh, 'faceDiv{}'.format(comp)),
+                self.indActive, self._active_faces(comp)
+            )
+        return self._operator('faceDiff{}'.format(comp), compute)
+
+    def _cellDiffStencil(self, comp):
+        def compute():
+            return _reduce(
+                getattr(self.mesh, '_cellGrad{}Stencil'.format(comp)),
+                self._active_faces(comp), self.indActive
+            )
+        return self._operator('cellDiff{}Stencil'.format(comp), compute)
+
     @property
     def vol(self):
         """
@@ -51,9 +276,11 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: numpy.ndarray
         :return: reduced cell volume
         """
-        if getattr(self, '_vol', None) is None:
-            self._vol = self.Pac.T * self.mesh.vol
-        return self._vol
+        def compute():
+            if self.indActive is None:
+                return self.mesh.vol
+            return self.mesh.vol[self.indActive]
+        return self._operator('vol', compute)
 
     @property
     def nC(self):
@@ -75,9 +302,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: int
         :return: dimension
         """
-        if getattr(self, '_dim', None) is None:
-            self._dim = self.mesh.dim
-        return self._dim
+        return self.mesh.dim
 
     @property
     def Pac(self):
@@ -88,12 +313,9 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: active cell projection matrix
         """
-        if getattr(self, '_Pac', None) is None:
-            if self.indActive is None:
-                self._Pac = Utils.speye(self.mesh.nC)
-            else:
-                self._Pac = Utils.speye(self.mesh.nC)[:, self.indActive]
-        return self._Pac
+        return self._operator(
+            'Pac', lambda: _projection(self.indActive, self.mesh.nC)
+        )
 
     @property
     def Pafx(self):
@@ -104,34 +326,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: active face-x projection matrix
         """
-        if getattr(self, '_Pafx', None) is None:
-            if self.indActive is None:
-                self._Pafx = Utils.speye(self.mesh.nFx)
-            else:
-                # if getattr(self.mesh, 'aveCC2Fx', None) is not None:
-                if self.mesh._meshType == "TREE":
-                    if self.regularization_type == "Tikhonov":
-                        indActive_Fx = (
-                            (self.mesh.aveFx2CC.T * self.indActive) >= 1
-                        )
-                        self._Pafx = (
-                            Utils.speye(self.mesh.nFx)[:, indActive_Fx]
-                        )
-                    else:
-                        indActive_Fx = (
-                            (
-                                self.mesh._aveCC2FxStencil() *
-                                self.indActive
-                            ) >= 1
-                        )
-                        self._Pafx = (
-                            Utils.speye(self.mesh.ntFx)[:, indActive_Fx]
-                        )
-                else:
-                    indActive_Fx = self.mesh.aveFx2CC.T * self.indActive >= 1
-
-                    self._Pafx = Utils.speye(self.mesh.nFx)[:, indActive_Fx]
-        return self._Pafx
+        return self._Paf('x')
 
     @property
     def Pafy(self):
@@ -142,33 +337,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: active face-y projection matrix
         """
-        if getattr(self, '_Pafy', None) is None:
-            if self.indActive is None:
-                self._Pafy = Utils.speye(self.mesh.nFy)
-            else:
-                # if getattr(self.mesh, 'aveCC2Fy', None) is not None:
-                if self.mesh._meshType == "TREE":
-                    if self.regularization_type == "Tikhonov":
-                        indActive_Fy = (
-                            (self.mesh.aveFy2CC.T * self.indActive) >= 1
-                        )
-                        self._Pafy = (
-                            Utils.speye(self.mesh.nFy)[:, indActive_Fy]
-                        )
-                    else:
-                        indActive_Fy = (
-                            (
-                                self.mesh._aveCC2FyStencil() *
-                                self.indActive
-                            ) >= 1
-                        )
-                        self._Pafy = (
-                            Utils.speye(self.mesh.ntFy)[:, indActive_Fy]
-                        )
-                else:
-                    indActive_Fy = (self.mesh.aveFy2CC.T * self.indActive) >= 1
-                    self._Pafy = Utils.speye(self.mesh.nFy)[:, indActive_Fy]
-        return self._Pafy
+        return self._Paf('y')
 
     @property
     def Pafz(self):
@@ -179,33 +348,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: active face-z projection matrix
         """
-        if getattr(self, '_Pafz', None) is None:
-            if self.indActive is None:
-                self._Pafz = Utils.speye(self.mesh.nFz)
-            else:
-                # if getattr(self.mesh, 'aveCC2Fz', None) is not None:
-                if self.mesh._meshType == "TREE":
-                    if self.regularization_type == "Tikhonov":
-                        indActive_Fz = (
-                            (self.mesh.aveFz2CC.T * self.indActive) >= 1
-                        )
-                        self._Pafz = (
-                            Utils.speye(self.mesh.nFz)[:, indActive_Fz]
-                        )
-                    else:
-                        indActive_Fz = (
-                            (
-                                self.mesh._aveCC2FzStencil() *
-                                self.indActive
-                            ) >= 1
-                        )
-                        self._Pafz = (
-                            Utils.speye(self.mesh.ntFz)[:, indActive_Fz]
-                        )
-                else:
-                    indActive_Fz = (self.mesh.aveFz2CC.T * self.indActive) >= 1
-                    self._Pafz = Utils.speye(self.mesh.nFz)[:, indActive_Fz]
-        return self._Pafz
+        return self._Paf('z')
 
     @property
     def aveFx2CC(self):
@@ -215,25 +358,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: averaging from active cell centers to active x-faces
         """
-        if getattr(self, '_aveFx2CC', None) is None:
-            if self.mesh._meshType == "TREE":
-                if self.regularization_type == "Tikhonov":
-                    self._aveFx2CC = (
-                        self.Pac.T * self.mesh.aveFx2CC * self.Pafx
-                    )
-
-                else:
-                    nCinRow = Utils.mkvc((self.aveCC2Fx.T).sum(1))
-                    nCinRow[nCinRow > 0] = 1./nCinRow[nCinRow > 0]
-                    self._aveFx2CC = (
-                        Utils.sdiag(nCinRow) *
-                        self.aveCC2Fx.T
-                    )
-
-            else:
-                self._aveFx2CC = self.Pac.T * self.mesh.aveFx2CC * self.Pafx
-
-        return self._aveFx2CC
+        return self._aveF2CC('x')
 
     @property
     def aveCC2Fx(self):
@@ -243,24 +368,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: averaging matrix from active x-faces to active cell centers
         """
-        if getattr(self, '_aveCC2Fx', None) is None:
-
-            # if getattr(self.mesh, 'aveCC2Fx', None) is not None:
-            if self.mesh._meshType == "TREE":
-                if self.regularization_type == "Tikhonov":
-                    self._aveCC2Fx = (
-                        Utils.sdiag(1./(self.aveFx2CC.T).sum(1)) *
-                        self.aveFx2CC.T
-                    )
-                else:
-                    self._aveCC2Fx = (
-                        self.Pafx.T * self.mesh._aveCC2FxStencil() * self.Pac
-                    )
-            else:
-                self._aveCC2Fx = (
-                    Utils.sdiag(1./(self.aveFx2CC.T).sum(1)) * self.aveFx2CC.T
-                )
-        return self._aveCC2Fx
+        return self._aveCC2F('x')
 
     @property
     def aveFy2CC(self):
@@ -270,25 +378,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: averaging from active cell centers to active y-faces
         """
-        if getattr(self, '_aveFy2CC', None) is None:
-            if self.mesh._meshType == "TREE":
-                if self.regularization_type == "Tikhonov":
-                    self._aveFy2CC = (
-                        self.Pac.T * self.mesh.aveFy2CC * self.Pafy
-                    )
-
-                else:
-                    nCinRow = Utils.mkvc((self.aveCC2Fy.T).sum(1))
-                    nCinRow[nCinRow > 0] = 1./nCinRow[nCinRow > 0]
-                    self._aveFy2CC = (
-                        Utils.sdiag(nCinRow) *
-                        self.aveCC2Fy.T
-                    )
-
-            else:
-                self._aveFy2CC = self.Pac.T * self.mesh.aveFy2CC * self.Pafy
-
-        return self._aveFy2CC
+        return self._aveF2CC('y')
 
     @property
     def aveCC2Fy(self):
@@ -298,23 +388,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: averaging matrix from active y-faces to active cell centers
         """
-        if getattr(self, '_aveCC2Fy', None) is None:
-            # if getattr(self.mesh, 'aveCC2Fy', None) is not None:
-            if self.mesh._meshType == "TREE":
-                if self.regularization_type == "Tikhonov":
-                    self._aveCC2Fy = (
-                        Utils.sdiag(1./(self.aveFy2CC.T).sum(1)) *
-                        self.aveFy2CC.T
-                    )
-                else:
-                    self._aveCC2Fy = (
-                        self.Pafy.T * self.mesh._aveCC2FyStencil() * self.Pac
-                    )
-            else:
-                self._aveCC2Fy = (
-                    Utils.sdiag(1./(self.aveFy2CC.T).sum(1)) * self.aveFy2CC.T
-                )
-        return self._aveCC2Fy
+        return self._aveCC2F('y')
 
     @property
     def aveFz2CC(self):
@@ -324,25 +398,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: averaging from active cell centers to active z-faces
         """
-        if getattr(self, '_aveFz2CC', None) is None:
-            if self.mesh._meshType == "TREE":
-                if self.regularization_type == "Tikhonov":
-                    self._aveFz2CC = (
-                        self.Pac.T * self.mesh.aveFz2CC * self.Pafz
-                    )
-
-                else:
-                    nCinRow = Utils.mkvc((self.aveCC2Fz.T).sum(1))
-                    nCinRow[nCinRow > 0] = 1./nCinRow[nCinRow > 0]
-                    self._aveFz2CC = (
-                        Utils.sdiag(nCinRow) *
-                        self.aveCC2Fz.T
-                    )
-
-            else:
-                self._aveFz2CC = self.Pac.T * self.mesh.aveFz2CC * self.Pafz
-
-        return self._aveFz2CC
+        return self._aveF2CC('z')
 
     @property
     def aveCC2Fz(self):
@@ -352,23 +408,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: averaging matrix from active z-faces to active cell centers
         """
-        if getattr(self, '_aveCC2Fz', None) is None:
-            # if getattr(self.mesh, 'aveCC2Fz', None) is not None:
-            if self.mesh._meshType == "TREE":
-                if self.regularization_type == "Tikhonov":
-                    self._aveCC2Fz = (
-                        Utils.sdiag(1./(self.aveFz2CC.T).sum(1)) *
-                        self.aveFz2CC.T
-                    )
-                else:
-                    self._aveCC2Fz = (
-                        self.Pafz.T * self.mesh._aveCC2FzStencil() * self.Pac
-                    )
-            else:
-                self._aveCC2Fz = (
-                    Utils.sdiag(1./(self.aveFz2CC.T).sum(1)) * self.aveFz2CC.T
-                )
-        return self._aveCC2Fz
+        return self._aveCC2F('z')
 
     @property
     def cellDiffx(self):
@@ -378,9 +418,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: differencing matrix for active cells in the x-direction
         """
-        if getattr(self, '_cellDiffx', None) is None:
-            self._cellDiffx = self.Pafx.T * self.mesh.cellGradx * self.Pac
-        return self._cellDiffx
+        return self._cellDiff('x')
 
     @property
     def cellDiffy(self):
@@ -390,9 +428,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: differencing matrix for active cells in the y-direction
         """
-        if getattr(self, '_cellDiffy', None) is None:
-            self._cellDiffy = self.Pafy.T * self.mesh.cellGrady * self.Pac
-        return self._cellDiffy
+        return self._cellDiff('y')
 
     @property
     def cellDiffz(self):
@@ -402,9 +438,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: differencing matrix for active cells in the z-direction
         """
-        if getattr(self, '_cellDiffz', None) is None:
-            self._cellDiffz = self.Pafz.T * self.mesh.cellGradz * self.Pac
-        return self._cellDiffz
+        return self._cellDiff('z')
 
     @property
     def faceDiffx(self):
@@ -414,9 +448,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: differencing matrix for active faces in the x-direction
         """
-        if getattr(self, '_faceDiffx', None) is None:
-            self._faceDiffx = self.Pac.T * self.mesh.faceDivx * self.Pafx
-        return self._faceDiffx
+        return self._faceDiff('x')
 
     @property
     def faceDiffy(self):
@@ -426,9 +458,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: differencing matrix for active faces in the y-direction
         """
-        if getattr(self, '_faceDiffy', None) is None:
-            self._faceDiffy = self.Pac.T * self.mesh.faceDivy * self.Pafy
-        return self._faceDiffy
+        return self._faceDiff('y')
 
     @property
     def faceDiffz(self):
@@ -438,9 +468,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: differencing matrix for active faces in the z-direction
         """
-        if getattr(self, '_faceDiffz', None) is None:
-            self._faceDiffz = self.Pac.T * self.mesh.faceDivz * self.Pafz
-        return self._faceDiffz
+        return self._faceDiff('z')
 
     @property
     def cellDiffxStencil(self):
@@ -451,12 +479,7 @@ class RegularizationMesh(Props.BaseSimPEG):
         :rtype: scipy.sparse.csr_matrix
         :return: differencing matrix for active cells in the x-direction
         """
-        if getattr(self, '_cellDiffxStencil', None) is None:
-
-            self._cellDiffxStencil = (
-                self.Pafx.T * self.mesh._cellGradxStencil * self.Pac
-            )
-        return self._cellDiffxStencil
+        return self._cellDiffStencil('x')
 
     @property
     def cellDiffyStencil(self):
@@ -469,28 +492,17 @@ class RegularizationMesh(Props.BaseSimPEG):
         """
         if self.dim < 2:
             return None
-        if getattr(self, '_cellDiffyStencil', None) is None:
-
-            self._cellDiffyStencil = (
-                self.Pafy.T * self.mesh._cellGradyStencil * self.Pac
-            )
-        return self._cellDiffyStencil
+        return self._cellDiffStencil('y')
 
     @property
     def cellDiffzStencil(self):
         """
         cell centered difference stencil (no cell lengths include) in the
-        y-direction
+        z-direction
 
         :rtype: scipy.sparse.csr_matrix
-        :return: differencing matrix for active cells in the y-direction
+        :return: differencing matrix for active cells in the z-direction
         """
         if self.dim < 3:
             return None
-        if getattr(self, '_cellDiffzStencil', None) is None:
-
-            self._cellDiffzStencil = (
-                self.Pafz.T * self.mesh._cellGradzStencil * self.Pac
-            )
-        return self._cellDiffzStencil
-
+        return self._cellDiffStencil('z')
@@ -46,6 +46,13 @@ class BaseSparse(BaseRegularization):
         default=True
     )
 
+    @properties.observer([
+        'model', 'epsilon', 'norm', 'space', 'gradientType', 'scale',
+        'scaledIRLS'
+    ])
+    def _clear_W_on_IRLS_change(self, change):
+        self._clear_W()
+
     @properties.validator('scale')
     def _validate_scale(self, change):
         if change['value'] is not None:
@@ -64,58 +71,39 @@ class BaseSparse(BaseRegularization):
     @stashedR.setter
     def stashedR(self, value):
         self._stashedR = value
+        # the weights change, f_m does not
+        keep = {
+            name: self._W_cache[name] for name in self._model_cache_names
+            if name in self._W_cache
+        }
+        self._clear_W()
+        self._W_cache.update(keep)
 
-
-class SparseSmall(BaseSparse):
-    """
-    Sparse smallness regularization
-
-    **Inputs**
-
-    :param int norm: norm on the smallness
-    """
-
-    _multiplier_pair = 'alpha_s'
-
-    def __init__(self, mesh, **kwargs):
-        super(SparseSmall, self).__init__(
-            mesh=mesh, **kwargs
-        )
-
-    # Give the option to scale or not
-    scaledIRLS = properties.Bool(
-        "Scale the gradients of the IRLS norms",
-        default=True
-    )
+    #: Cached values that only depend on the model
+    _model_cache_names = ['f_m', 'mapped_model', 'total_gradient']
 
     @property
     def f_m(self):
+        """
+        Quantity the norm is measured on at the current model, e.g. the
+        model or its gradient. Kept until the model (or anything else it
+        depends on) changes.
+        """
+        return self._cached('f_m', self._compute_f_m)
 
-        return self.mapping * self._delta_m(self.model)
+    def _compute_f_m(self):
+        raise NotImplementedError(
+            '_compute_f_m is not implemented for {}'.format(
+                self.__class__.__name__
+            )
+        )
 
     @property
-    def W(self):
-        if getattr(self, 'model', None) is None:
-            R = Utils.speye(self.mapping.shape[0])
-        else:
-            r = self.R(self.f_m)
-            R = Utils.sdiag(r)
-
-        if self.scale is None:
-            self.scale = np.ones(self.mapping.shape[0])
-
-        if self.cell_weights is not None:
-            return Utils.sdiag((self.scale *
-                                self.cell_weights)**0.5) * R
-
-        else:
-            return Utils.sdiag((self.scale * self.regmesh.vol)**0.5) * R
-
-    def R(self, f_m):
-        # if R is stashed, return that instead
-        if getattr(self, 'stashedR') is not None:
-            return self.stashedR
+    def _irls_epsilon(self):
+        return self.epsilon
 
+    def _irls_weights(self, f_m):
+        """Scaled IRLS weights for f_m"""
         # Default
         eta = np.ones_like(f_m)
 
@@ -130,39 +118,112 @@ class SparseSmall(BaseSparse):
             )
             maxGrad = (
                 maxVal /
-                (maxVal**2. + self.epsilon**2.)**(1.-self.norm/2.)
+                (maxVal**2. + self._irls_epsilon**2.)**(1.-self.norm/2.)
             )
             # Scaling factor
             eta[maxGrad != 0] = np.abs(f_m).max()/maxGrad[maxGrad != 0]
 
         # Scaled IRLS weights
-        r = (eta / (f_m**2. + self.epsilon**2.)**(1.-self.norm/2.))**0.5
+        return (
+            eta / (f_m**2. + self._irls_epsilon**2.)**(1.-self.norm/2.)
+        )**0.5
+
+    def R(self, f_m):
+        # if R is stashed, return that instead
+        if getattr(self, 'stashedR') is not None:
+            return self.stashedR
 
+        r = self._irls_weights(f_m)
         self.stashedR = r  # stash on the first calculation
         return r
 
-    @Utils.timeIt
-    def deriv(self, m):
+    @property
+    def irls_state(self):
         """
+        IRLS quantities at the current model, computed together and kept
+        until the model, the weights or the norms change:
 
-        The regularization is:
+        - f_m: see :attr:`f_m`
+        - R: the IRLS weights (the stashed ones if any), nothing is stashed
+        - phi: the approximated norm of f_m, sum(f_m**2 / (f_m**2 + epsilon**2)**(1 - norm/2))
+        - value: the objective function at the current model
 
-        .. math::
+        :rtype: dict
+        """
+        return self._cached('irls_state', self._compute_irls_state)
 
-            R(m) = \\frac{1}{2}\mathbf{(m-m_\\text{ref})^\\top W^\\top
-                   W(m-m_\\text{ref})}
+    def _compute_irls_state(self):
+        if self.scale is None:
+            self.scale = np.ones(self.mapping.shape[0])
+        f_m = self.f_m
+        if self.stashedR is not None:
+            r = self.stashedR
+        else:
+            r = self._irls_weights(f_m)
+        v = self._irls_residual(f_m, r)
+        return {
+            'f_m': f_m,
+            'R': r,
+            'phi': np.sum(
+                f_m**2. / (f_m**2. + self.epsilon**2.)**(1 - self.norm/2.)
+            ),
+            'value': 0.5 * v.dot(v),
+        }
+
+    def _irls_residual(self, f_m, r):
+        """W * (mapping * m) for the IRLS weights r, from f_m"""
+        raise NotImplementedError(
+            '_irls_residual is not implemented for {}'.format(
+                self.__class__.__name__
+            )
+        )
 
-        So the derivative is straight forward:
 
-        .. math::
+class SparseSmall(BaseSparse):
+    """
+    Sparse smallness regularization
 
-            R(m) = \mathbf{W^\\top W (m-m_\\text{ref})}
+    **Inputs**
 
-        """
+    :param int norm: norm on the smallness
+    """
+
+    _multiplier_pair = 'alpha_s'
+
+    def __init__(self, mesh, **kwargs):
+        super(SparseSmall, self).__init__(
+            mesh=mesh, **kwargs
+        )
+
+    # Give the option to scale or not
+    scaledIRLS = properties.Bool(
+        "Scale the gradients of the IRLS norms",
+        default=True
+    )
 
-        mD = self.mapping.deriv(self._delta_m(m))
-        r = self.W * (self.mapping * (self._delta_m(m)))
-        return mD.T * (self.W.T * r)
+    def _compute_f_m(self):
+        return self.mapping * self._delta_m(self.model)
+
+    def _weights(self, r):
+        if self.scale is None:
+            self.scale = np.ones(self.mapping.shape[0])
+
+        if self.cell_weights is not None:
+            return (self.scale * self.cell_weights)**0.5 * r
+
+        else:
+            return (self.scale * self.regmesh.vol)**0.5 * r
+
+    @property
+    def _W_factors(self):
+        if getattr(self, 'model', None) is None:
+            r = 1.
+        else:
+            r = self.R(self.f_m)
+        return self._weights(r), None
+
+    def _irls_residual(self, f_m, r):
+        return self._weights(r) * f_m
 
 
 class SparseDeriv(BaseSparse):
@@ -184,6 +245,10 @@ class SparseDeriv(BaseSparse):
         default=True
     )
 
+    @properties.observer('mrefInSmooth')
+    def _clear_W_on_mrefInSmooth(self, change):
+        self._clear_W()
+
     @Utils.timeIt
     def __call__(self, m):
         """
@@ -203,66 +268,18 @@ class SparseDeriv(BaseSparse):
             self.scale = np.ones(self.mapping.shape[0])
 
         if self.space == 'spherical':
-            Ave = getattr(self.regmesh, 'aveCC2F{}'.format(self.orientation))
-
-            if getattr(self, 'model', None) is None:
-                R = Utils.speye(self.cellDiffStencil.shape[0])
-
-            else:
-                r = self.R(self.f_m)
-                R = Utils.sdiag(r)
-
-            if self.cell_weights is not None:
-                W = (
-                    Utils.sdiag(
-                        (Ave*(self.scale * self.cell_weights))**0.5
-                    ) *
-                    R
-                )
-
-            else:
-                W = Utils.sdiag(
-                    (Ave * (self.scale * self.regmesh.vol))**0.5
-                ) * R
-
             theta = self.cellDiffStencil * (self.mapping * f_m)
             dmdx = Utils.matutils.coterminal(theta)
-            r = W * dmdx
+            r = self._weights() * dmdx
 
         else:
-            r = self.W * (self.mapping * f_m)
+            r = self._W_times(self.mapping * f_m)
 
         return 0.5 * r.dot(r)
 
-    def R(self, f_m):
-        # if R is stashed, return that instead
-        if getattr(self, 'stashedR') is not None:
-            return self.stashedR
-
-        # Default
-        eta = np.ones_like(f_m)
-
-        if self.scaledIRLS:
-            # Eta scaling is important for mix-norms...do not mess with it
-            # Scale on l2-norm gradient: f_m.max()
-            maxVal = np.ones_like(f_m) * np.abs(f_m).max()
-
-            # Compute theoritical maximum gradients for p < 1
-            maxVal[self.norm < 1] = (
-                self.epsilon / np.sqrt(1.-self.norm[self.norm < 1])
-            )
-            maxGrad = (
-                maxVal /
-                (maxVal**2. + (self.epsilon*self.length_scales)**2.)**(1.-self.norm/2.)
-            )
-
-            # Scaling Factor
-            eta[maxGrad != 0] = np.abs(f_m).max()/maxGrad[maxGrad != 0]
-
-        # Scaled-IRLS weights
-        r = (eta / (f_m**2. + (self.epsilon*self.length_scales)**2.)**(1.-self.norm/2.))**0.5
-        self.stashedR = r  # stash on the first calculation
-        return r
+    @property
+    def _irls_epsilon(self):
+        return self.epsilon * self.length_scales
 
     @Utils.timeIt
     def deriv(self, m):
@@ -293,122 +310,108 @@ class SparseDeriv(BaseSparse):
             self.scale = np.ones(self.mapping.shape[0])
 
         if self.space == 'spherical':
-            Ave = getattr(self.regmesh, 'aveCC2F{}'.format(self.orientation))
-
-            if getattr(self, 'model', None) is None:
-                R = Utils.speye(self.cellDiffStencil.shape[0])
-
-            else:
-                r = self.R(self.f_m)
-                R = Utils.sdiag(r)
-
-            if self.cell_weights is not None:
-                W = (
-                    Utils.sdiag(
-                        ((Ave * (self.scale * self.cell_weights)))**0.5
-                    ) *
-                    R
-                )
-
-            else:
-                W = Utils.sdiag(
-                    (Ave * (self.scale * self.regmesh.vol))**0.5
-                ) * R
-
             theta = self.cellDiffStencil * (self.mapping * model)
             dmdx = Utils.matutils.coterminal(theta)
 
-            r = W * dmdx
+            r = self._weights() * dmdx
 
         else:
-            r = self.W * (self.mapping * model)
+            r = self._W_times(self.mapping * model)
 
         mD = self.mapping.deriv(model)
-        return mD.T * (self.W.T * r)
+        return mD.T * self._Wt_times(r)
 
     @property
     def _multiplier_pair(self):
         return 'alpha_{orientation}'.format(orientation=self.orientation)
 
-    @property
-    def f_m(self):
-
-        if self.mrefInSmooth:
-
-            f_m = self._delta_m(self.model)
-
-        else:
-            f_m = self.model
-
-        if self.space == 'spherical':
-            theta = self.cellDiffStencil * (self.mapping * f_m)
-            dmdx = Utils.matutils.coterminal(theta)
-
-        else:
-
-            if self.gradientType == 'total':
-                Ave = getattr(
-                    self.regmesh,
-                    'aveCC2F{}'.format(self.orientation)
+    def _mapped_model(self):
+        """mapping * m, with m the model, relative to mref if mrefInSmooth"""
+        def compute():
+            if self.mrefInSmooth:
+                return self.mapping * self._delta_m(self.model)
+            return self.mapping * self.model
+        return self._cached('mapped_model', compute)
+
+    def _total_gradient(self):
+        """Sum of the absolute gradients, averaged to the cell centers"""
+        def compute():
+            x = self._mapped_model()
+            dmdx = np.abs(
+                self.regmesh.aveFx2CC * (self.regmesh.cellDiffxStencil * x)
+            )
+            if self.regmesh.dim > 1:
+                dmdx += np.abs(
+                    self.regmesh.aveFy2CC *
+                    (self.regmesh.cellDiffyStencil * x)
                 )
+            if self.regmesh.dim > 2:
+                dmdx += np.abs(
+                    self.regmesh.aveFz2CC *
+                    (self.regmesh.cellDiffzStencil * x)
+                )
+            return dmdx
+        return self._cached('total_gradient', compute)
 
-                dmdx = np.abs(self.regmesh.aveFx2CC *
-                              self.regmesh.cellDiffxStencil *
-                              (self.mapping * f_m)
-                              )
+    def _compute_f_m(self):
+        if self.space == 'spherical':
+            theta = self.cellDiffStencil * self._mapped_model()
+            return Utils.matutils.coterminal(theta)
 
-                if self.regmesh.dim > 1:
+        if self.gradientType == 'total':
+            Ave = getattr(
+                self.regmesh, 'aveCC2F{}'.format(self.orientation)
+            )
+            return Ave * self._total_gradient()
 
-                    dmdx += np.abs(self.regmesh.aveFy2CC *
-                                   self.regmesh.cellDiffyStencil *
-                                   (self.mapping * f_m)
-                                   )
+        return self.cellDiffStencil * self._mapped_model()
 
-                if self.regmesh.dim > 2:
+    def _irls_residual(self, f_m, r):
+        if self.space != 'spherical' and self.gradientType == 'total':
+            return self._weights(r) * (
+                self.cellDiffStencil * self._mapped_model()
+            )
+        # f_m is the scaled stencil times the model, as in W
+        return self._weights(r) * f_m
 
-                    dmdx += np.abs(self.regmesh.aveFz2CC *
-                                   self.regmesh.cellDiffzStencil *
-                                   (self.mapping * f_m)
-                                   )
+    @property
+    def cellDiffStencil(self):
+        return self._cached('cellDiffStencil', lambda: (
+            Utils.sdiag(self.length_scales) * getattr(
+                self.regmesh, 'cellDiff{}Stencil'.format(self.orientation)
+            )
+        ))
 
-                dmdx = Ave * dmdx
+    def _weights(self, r=None):
+        """
+        IRLS and cell weights on the faces, W without the stencil, for the
+        IRLS weights r (those of the current model if None)
+        """
+        def compute(r):
+            Ave = getattr(
+                self.regmesh, 'aveCC2F{}'.format(self.orientation)
+            )
+            if self.scale is None:
+                self.scale = np.ones(self.mapping.shape[0])
+            if self.cell_weights is not None:
+                return (Ave*(self.scale * self.cell_weights))**0.5 * r
+            return (Ave*(self.scale * self.regmesh.vol))**0.5 * r
 
-            else:
-                dmdx = self.cellDiffStencil * (self.mapping * f_m)
+        if r is not None:
+            return compute(r)
 
-        return dmdx
+        def current():
+            if getattr(self, 'model', None) is None:
+                return compute(1.)
+            return compute(self.R(self.f_m))
+        return self._cached('weights', current)
 
     @property
-    def cellDiffStencil(self):
-        return Utils.sdiag(self.length_scales) * getattr(
+    def _W_factors(self):
+        return self._weights() * self.length_scales, getattr(
             self.regmesh, 'cellDiff{}Stencil'.format(self.orientation)
         )
 
-    @property
-    def W(self):
-
-        Ave = getattr(self.regmesh, 'aveCC2F{}'.format(self.orientation))
-
-        if getattr(self, 'model', None) is None:
-            R = Utils.speye(self.cellDiffStencil.shape[0])
-
-        else:
-            r = self.R(self.f_m)
-            R = Utils.sdiag(r)
-        if self.scale is None:
-            self.scale = np.ones(self.mapping.shape[0])
-        if self.cell_weights is not None:
-            return (
-                Utils.sdiag(
-                    (Ave*(self.scale * self.cell_weights))**0.5
-                ) *
-                R * self.cellDiffStencil
-            )
-        else:
-            return Utils.sdiag(
-                (Ave*(self.scale * self.regmesh.vol))**0.5
-                ) * R * self.cellDiffStencil
-
     @property
     def length_scales(self):
         """
@@ -431,6 +434,7 @@ class SparseDeriv(BaseSparse):
     @length_scales.setter
     def length_scales(self, value):
         self._length_scales = value
+        self._clear_W()
 
 class Sparse(BaseComboRegularization):
     """
@@ -591,6 +595,42 @@ class Sparse(BaseComboRegularization):
                 )
             )
 
+    @property
+    def irls_state(self):
+        """
+        IRLS state (see :attr:`BaseSparse.irls_state`) of each objective
+        function at the current model. For gradientType 'total', the
+        gradient is computed once and shared by the derivatives.
+
+        :rtype: list
+        """
+        derivs = [
+            objfct for objfct in self.objfcts
+            if isinstance(objfct, SparseDeriv)
+        ]
+        if (
+            self.gradientType == 'total' and len(derivs) > 1 and
+            all(objfct.space != 'spherical' for objfct in derivs)
+        ):
+            first = derivs[0]
+            for objfct in derivs[1:]:
+                if (
+                    objfct.cache_W and
+                    'total_gradient' not in objfct._W_cache and
+                    objfct.regmesh is first.regmesh and
+                    objfct.mapping is first.mapping and
+                    objfct.mrefInSmooth == first.mrefInSmooth and
+                    np.array_equal(objfct.model, first.model) and
+                    (
+                        not first.mrefInSmooth or
+                        np.array_equal(objfct.mref, first.mref)
+                    )
+                ):
+                    objfct._W_cache['total_gradient'] = (
+                        first._total_gradient()
+                    )
+        return [objfct.irls_state for objfct in self.objfcts]
+
     # Observers
     @properties.observer('scales')
     def _mirror_scale_to_objfcts(self, change):
@@ -49,17 +49,22 @@ class SimpleSmall(BaseRegularization):
             mesh=mesh, **kwargs
         )
 
+    @property
+    def _W_factors(self):
+        if self.cell_weights is not None:
+            return np.sqrt(self.cell_weights), None
+        elif self._nC_residual != '*':
+            return np.ones(self._nC_residual), None
+        return None
+
     @property
     def W(self):
         """
         Weighting matrix
         """
-        if self.cell_weights is not None:
-            return Utils.sdiag(np.sqrt(self.cell_weights))
-        elif self._nC_residual != '*':
-            return sp.eye(self._nC_residual)
-        else:
+        if self._factors() is None:
             return Utils.Identity()
+        return super(SimpleSmall, self).W
 
 
 class SimpleSmoothDeriv(BaseRegularization):
@@ -113,33 +118,23 @@ class SimpleSmoothDeriv(BaseRegularization):
         return 'alpha_{orientation}'.format(orientation=self.orientation)
 
     @property
-    def W(self):
+    def _W_factors(self):
         """
-        Weighting matrix that takes the first spatial difference
-        with normalized length scales in the specified orientation
+        The first spatial difference with normalized length scales in the
+        specified orientation
         """
         Ave = getattr(self.regmesh, 'aveCC2F{}'.format(self.orientation))
-        W = Utils.sdiag(self.length_scales) * getattr(
+        if self.cell_weights is not None:
+            w = (Ave*(self.cell_weights))**0.5
+        else:
+            w = (Ave*self.regmesh.vol)**0.5
+
+        return w * self.length_scales, getattr(
             self.regmesh,
             "cellDiff{orientation}Stencil".format(
                 orientation=self.orientation
             )
         )
-        if self.cell_weights is not None:
-
-            W = (
-                Utils.sdiag(
-                    (Ave*(self.cell_weights))**0.5
-                ) * W
-            )
-        else:
-            W = (
-                Utils.sdiag(
-                    (Ave*self.regmesh.vol)**0.5
-                ) * W
-            )
-
-        return W
 
     @property
     def length_scales(self):
@@ -163,6 +158,7 @@ class SimpleSmoothDeriv(BaseRegularization):
     @length_scales.setter
     def length_scales(self, value):
         self._length_scales = value
+        self._clear_W()
 
 class Simple(BaseComboRegularization):
 
@@ -283,13 +279,10 @@ class Small(BaseRegularization):
         )
 
     @property
-    def W(self):
-        """
-        Weighting matrix
-        """
+    def _W_factors(self):
         if self.cell_weights is not None:
-            return Utils.sdiag(np.sqrt(self.regmesh.vol * self.cell_weights))
-        return Utils.sdiag(np.sqrt(self.regmesh.vol))
+            return np.sqrt(self.regmesh.vol * self.cell_weights), None
+        return np.sqrt(self.regmesh.vol), None
 
 
 class SmoothDeriv(BaseRegularization):
@@ -347,10 +340,9 @@ class SmoothDeriv(BaseRegularization):
         return 'alpha_{orientation}'.format(orientation=self.orientation)
 
     @property
-    def W(self):
+    def _W_factors(self):
         """
-        Weighting matrix that constructs the first spatial derivative stencil
-        in the specified orientation
+        The first spatial derivative stencil in the specified orientation
         """
         vol = self.regmesh.vol.copy()
         if self.cell_weights is not None:
@@ -365,7 +357,7 @@ class SmoothDeriv(BaseRegularization):
 
         Ave = getattr(self.regmesh, 'aveCC2F{}'.format(self.orientation))
 
-        return Utils.sdiag(np.sqrt(Ave * vol)) * D
+        return np.sqrt(Ave * vol), D
 
 
 class SmoothDeriv2(BaseRegularization):
@@ -415,17 +407,15 @@ class SmoothDeriv2(BaseRegularization):
         )
 
     @property
-    def W(self):
+    def _W_factors(self):
         """
-        Weighting matrix that takes the second spatial derivative in the
-        specified orientation
+        The second spatial derivative in the specified orientation
         """
         vol = self.regmesh.vol.copy()
         if self.cell_weights is not None:
             vol *= self.cell_weights
 
-        W = (
-            Utils.sdiag(vol**0.5) *
+        D2 = (
             getattr(
                 self.regmesh,
                 'faceDiff{orientation}'.format(
@@ -439,7 +429,7 @@ class SmoothDeriv2(BaseRegularization):
                 )
             )
         )
-        return W
+        return vol**0.5, D2
 
 
 class Tikhonov(BaseComboRegularization):
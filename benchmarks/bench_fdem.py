@@ -0,0 +1,54 @@
+"""
+Forward and sensitivity benchmarks of the FDEM problems.
+"""
+import numpy as np
+
+from SimPEG import Maps
+from SimPEG.EM import FDEM
+
+from .common import Solver, get_mesh, surface_grid
+
+
+class FDEMProblem(object):
+
+    params = [['e', 'b', 'h', 'j'], ['tensor', 'tree'], [8, 16]]
+    param_names = ['formulation', 'mesh', 'n']
+    number = 1
+    timeout = 600
+
+    def setup(self, formulation, mesh_type, n):
+        np.random.seed(0)
+        mesh = get_mesh(mesh_type, n)
+        rxList = [
+            FDEM.Rx.Point_b(surface_grid(n), 'z', component)
+            for component in ['real', 'imag']
+        ]
+        srcList = [
+            FDEM.Src.MagDipole(rxList, freq, np.r_[0., 0., 30.])
+            for freq in [1., 100.]
+        ]
+        survey = FDEM.Survey(srcList)
+        self.prob = getattr(FDEM, 'Problem3D_{}'.format(formulation))(
+            mesh, sigmaMap=Maps.ExpMap(mesh), Solver=Solver
+        )
+        self.prob.pair(survey)
+
+        self.m = np.log(1e-2)*np.ones(mesh.nC)
+        self.f = self.prob.fields(self.m)
+        self.v = np.random.rand(mesh.nC)
+        self.w = np.random.rand(survey.nD)
+
+    def time_fields(self, *args):
+        self.prob.fields(self.m)
+
+    def peakmem_fields(self, *args):
+        self.prob.fields(self.m)
+
+    def time_Jvec(self, *args):
+        self.prob.Jvec(self.m, self.v, f=self.f)
+
+    def time_Jtvec(self, *args):
+        self.prob.Jtvec(self.m, self.w, f=self.f)
+
+    def peakmem_Jtvec(self, *args):
+        self.prob.Jtvec(self.m, self.w, f=self.f)
@@ -0,0 +1,46 @@
+"""
+Benchmarks of the Richards equation forward problem.
+"""
+import numpy as np
+
+from SimPEG import Maps, Mesh
+from SimPEG.FLOW import Richards
+
+from .common import Solver
+
+
+class RichardsFields(object):
+
+    params = [[1, 2, 3], [8, 16]]
+    param_names = ['dim', 'n']
+    number = 1
+    timeout = 900
+
+    def setup(self, dim, n):
+        mesh = Mesh.TensorMesh([np.ones(n)]*dim)
+        mesh.setCellGradBC(['neumann']*(dim-1) + ['dirichlet'])
+
+        params = Richards.Empirical.HaverkampParams().celia1990
+        k_fun, theta_fun = Richards.Empirical.haverkamp(mesh, **params)
+        k_fun.KsMap = Maps.ExpMap(nP=mesh.nC)
+
+        # no flow through the sides, pressure head on the bottom and top
+        nSide = [mesh.nC//mesh.vnC[d] for d in range(dim)]
+        bc = np.r_[
+            np.zeros(2*sum(nSide[:-1])),
+            -61.5*np.ones(nSide[-1]), -20.7*np.ones(nSide[-1])
+        ]
+        self.prob = Richards.RichardsProblem(
+            mesh, hydraulic_conductivity=k_fun, water_retention=theta_fun,
+            boundary_conditions=bc, initial_conditions=-61.5*np.ones(mesh.nC),
+            do_newton=False, method='mixed', debug=False,
+            Solver=Solver
+        )
+        self.prob.timeSteps = [(40, 3), (60, 3)]
+        self.m = np.log(params['Ks'])*np.ones(mesh.nC)
+
+    def time_fields(self, *args):
+        self.prob.fields(self.m)
+
+    def peakmem_fields(self, *args):
+        self.prob.fields(self.m)
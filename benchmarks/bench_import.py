@@ -0,0 +1,23 @@
+"""
+Benchmarks of the time it takes to import SimPEG and its subpackages in a
+fresh interpreter.
+"""
+
+
+class Import(object):
+
+    params = [
+        'SimPEG', 'SimPEG.EM', 'SimPEG.PF', 'SimPEG.FLOW', 'SimPEG.SEIS',
+        'SimPEG.VRM'
+    ]
+    param_names = ['module']
+    repeat = 10
+
+    def timeraw_import(self, module):
+        return "import {}".format(module)
+
+
+class ImportInversion(object):
+
+    def timeraw_import(self):
+        return "from SimPEG import Directives, Inversion, Optimization"
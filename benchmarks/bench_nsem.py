@@ -0,0 +1,61 @@
+"""
+Forward and sensitivity benchmarks of the 3D NSEM problem.
+"""
+import numpy as np
+
+from SimPEG import Maps, Mesh
+from SimPEG.EM import NSEM
+
+from .common import Solver, surface_grid
+
+
+class NSEM3D(object):
+
+    params = [[8, 12], [2, 5]]
+    param_names = ['n', 'nFreq']
+    number = 1
+    timeout = 900
+
+    def setup(self, n, nFreq):
+        np.random.seed(0)
+        h = 100.
+        pad = [(h, 5, -1.5), (h, n), (h, 5, 1.5)]
+        mesh = Mesh.TensorMesh([pad, pad, pad], x0='CCC')
+
+        sigma = 1e-2*np.ones(mesh.nC)
+        sigma[mesh.gridCC[:, 2] > 0.] = 1e-8
+        sigma1d = mesh.r(sigma, 'CC', 'CC', 'M')[0, 0, :]
+
+        rx_loc = surface_grid(n, h=h)
+        rxList = [
+            NSEM.Rx.Point_impedance3D(rx_loc, orientation, component)
+            for orientation in ['xy', 'yx']
+            for component in ['real', 'imag']
+        ]
+        srcList = [
+            NSEM.Src.Planewave_xy_1Dprimary(rxList, freq)
+            for freq in np.logspace(1, -2, nFreq)
+        ]
+        survey = NSEM.Survey(srcList)
+
+        self.prob = NSEM.Problem3D_ePrimSec(
+            mesh, sigmaPrimary=sigma1d, sigmaMap=Maps.ExpMap(mesh),
+            Solver=Solver
+        )
+        self.prob.pair(survey)
+        self.m = np.log(sigma)
+        self.f = self.prob.fields(self.m)
+        self.v = np.random.rand(mesh.nC)
+        self.w = np.random.rand(survey.nD)
+
+    def time_fields(self, *args):
+        self.prob.fields(self.m)
+
+    def peakmem_fields(self, *args):
+        self.prob.fields(self.m)
+
+    def time_Jvec(self, *args):
+        self.prob.Jvec(self.m, self.v, f=self.f)
+
+    def time_Jtvec(self, *args):
+        self.prob.Jtvec(self.m, self.w, f=self.f)
@@ -0,0 +1,55 @@
+"""
+Benchmarks of the construction of the potential field sensitivities.
+"""
+import numpy as np
+
+from SimPEG import Maps, PF
+
+from .common import get_mesh, surface_grid
+
+
+class _BaseIntegral(object):
+
+    params = [['tensor', 'tree'], [16, 32], [2, 1]]
+    param_names = ['mesh', 'n', 'rx_spacing']
+    number = 1
+    timeout = 900
+
+    def active(self, mesh):
+        return mesh.gridCC[:, 2] < 0.
+
+    def time_G(self, *args):
+        self.prob._G = None
+        self.prob.G
+
+    def peakmem_G(self, *args):
+        self.prob._G = None
+        self.prob.G
+
+
+class GravityIntegral(_BaseIntegral):
+
+    def setup(self, mesh_type, n, rx_spacing):
+        mesh = get_mesh(mesh_type, n)
+        actv = self.active(mesh)
+        rxLoc = PF.BaseGrav.RxObs(surface_grid(n, spacing=rx_spacing) + 1.)
+        survey = PF.BaseGrav.LinearSurvey(PF.BaseGrav.SrcField([rxLoc]))
+        self.prob = PF.Gravity.GravityIntegral(
+            mesh, rhoMap=Maps.IdentityMap(nP=int(actv.sum())), actInd=actv
+        )
+        self.prob.pair(survey)
+
+
+class MagneticIntegral(_BaseIntegral):
+
+    def setup(self, mesh_type, n, rx_spacing):
+        mesh = get_mesh(mesh_type, n)
+        actv = self.active(mesh)
+        rxLoc = PF.BaseMag.RxObs(surface_grid(n, spacing=rx_spacing) + 1.)
+        srcField = PF.BaseMag.SrcField([rxLoc], param=(50000., 60., 270.))
+        survey = PF.BaseMag.LinearSurvey(srcField)
+        self.prob = PF.Magnetics.MagneticIntegral(
+            mesh, chiMap=Maps.IdentityMap(nP=int(actv.sum())), actInd=actv,
+            silent=True
+        )
+        self.prob.pair(survey)
@@ -0,0 +1,44 @@
+"""
+Benchmarks of the regularization derivatives.
+"""
+import numpy as np
+
+from SimPEG import Maps, Regularization
+
+from .common import get_mesh
+
+
+class RegularizationDeriv(object):
+
+    params = [
+        ['Tikhonov', 'Sparse'], ['tensor', 'tree'], [16, 32]
+    ]
+    param_names = ['regularization', 'mesh', 'n']
+    number = 1
+    timeout = 600
+
+    def setup(self, regularization, mesh_type, n):
+        np.random.seed(0)
+        mesh = get_mesh(mesh_type, n)
+        self.reg = getattr(Regularization, regularization)(
+            mesh, indActive=np.ones(mesh.nC, dtype=bool),
+            mapping=Maps.IdentityMap(nP=mesh.nC)
+        )
+        if regularization == 'Sparse':
+            self.reg.norms = np.c_[0., 1., 1., 1.]
+        self.m = np.random.rand(mesh.nC)
+        self.v = np.random.rand(mesh.nC)
+        # build the operators, the benchmarks time their application
+        self.reg.deriv2(self.m, v=self.v)
+
+    def time_deriv(self, *args):
+        self.reg.deriv(self.m)
+
+    def time_deriv2(self, *args):
+        self.reg.deriv2(self.m, v=self.v)
+
+    def time_deriv2_matrix(self, *args):
+        self.reg.deriv2(self.m)
+
+    def peakmem_deriv2_matrix(self, *args):
+        self.reg.deriv2(self.m)
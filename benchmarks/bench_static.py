@@ -0,0 +1,152 @@
+"""
+Forward and sensitivity benchmarks of the DC, IP and SIP problems.
+"""
+import numpy as np
+
+from SimPEG import Maps
+from SimPEG.EM.Static import DC, IP, SIP
+
+from .common import Solver, get_mesh, surface_grid
+
+
+def dc_sources(n, dim=3, h=25., nSrc=3, ky=False):
+    """
+        Pole sources on the surface, measured by dipoles on a surface grid.
+    """
+    rx = surface_grid(n, dim=dim, h=h)
+    shift = np.r_[h/2., np.zeros(dim-1)]
+    Rx = DC.Rx.Dipole_ky if ky else DC.Rx.Dipole
+    rxList = [Rx(rx - shift, rx + shift)]
+    x = np.linspace(-n*h/2., n*h/2., nSrc)
+    return [
+        DC.Src.Pole(rxList, np.r_[xi, np.zeros(dim-1)]) for xi in x
+    ]
+
+
+class _BaseStaticProblem(object):
+
+    number = 1
+    timeout = 600
+
+    def time_fields(self, *args):
+        self.prob.fields(self.m)
+
+    def peakmem_fields(self, *args):
+        self.prob.fields(self.m)
+
+    def time_Jvec(self, *args):
+        self.prob.Jvec(self.m, self.v, f=self.f)
+
+    def time_Jtvec(self, *args):
+        self.prob.Jtvec(self.m, self.w, f=self.f)
+
+    def pair(self, prob, survey, m):
+        np.random.seed(0)
+        self.prob = prob
+        self.prob.pair(survey)
+        self.m = m
+        self.f = self.prob.fields(self.m)
+        self.v = np.random.rand(self.m.size)
+        self.w = np.random.rand(survey.nD)
+
+
+class _BaseSensitivity(_BaseStaticProblem):
+
+    def time_getJ(self, *args):
+        self.prob._Jmatrix = None
+        self.prob.getJ(self.m, f=self.f)
+
+    def peakmem_getJ(self, *args):
+        self.prob._Jmatrix = None
+        self.prob.getJ(self.m, f=self.f)
+
+
+class DC3D(_BaseSensitivity):
+
+    params = [['CC', 'N'], ['tensor', 'tree'], [8, 16]]
+    param_names = ['formulation', 'mesh', 'n']
+
+    def setup(self, formulation, mesh_type, n):
+        if formulation == 'CC' and mesh_type == 'tree':
+            raise NotImplementedError('Problem3D_CC needs a TensorMesh')
+        mesh = get_mesh(mesh_type, n)
+        prob = getattr(DC, 'Problem3D_{}'.format(formulation))(
+            mesh, sigmaMap=Maps.ExpMap(mesh), Solver=Solver
+        )
+        survey = DC.Survey(dc_sources(n))
+        self.pair(prob, survey, np.log(1e-2)*np.ones(mesh.nC))
+
+
+class DC2D(_BaseSensitivity):
+
+    params = [['CC', 'N'], ['tensor', 'tree'], [16, 64]]
+    param_names = ['formulation', 'mesh', 'n']
+
+    def setup(self, formulation, mesh_type, n):
+        if formulation == 'CC' and mesh_type == 'tree':
+            raise NotImplementedError('Problem2D_CC needs a TensorMesh')
+        mesh = get_mesh(mesh_type, n, dim=2)
+        prob = getattr(DC, 'Problem2D_{}'.format(formulation))(
+            mesh, sigmaMap=Maps.ExpMap(mesh), Solver=Solver
+        )
+        survey = DC.Survey_ky(dc_sources(n, dim=2, ky=True))
+        self.pair(prob, survey, np.log(1e-2)*np.ones(mesh.nC))
+
+
+class IP3D(_BaseSensitivity):
+
+    params = [['CC', 'N'], [8, 16]]
+    param_names = ['formulation', 'n']
+
+    def setup(self, formulation, n):
+        mesh = get_mesh('tensor', n)
+        prob = getattr(IP, 'Problem3D_{}'.format(formulation))(
+            mesh, sigma=1e-2*np.ones(mesh.nC), etaMap=Maps.IdentityMap(mesh),
+            Solver=Solver
+        )
+        survey = IP.Survey(dc_sources(n))
+        self.pair(prob, survey, 0.1*np.ones(mesh.nC))
+
+
+class SIP3D(_BaseStaticProblem):
+    """
+        SIP inversions store the sensitivity, so does the benchmark: fields
+        computes J (the getJ timing), then frees the fields and the
+        factorization.
+    """
+
+    params = [[8, 16], [5, 20]]
+    param_names = ['n', 'nT']
+
+    def setup(self, n, nT):
+        h = 25.
+        mesh = get_mesh('tensor', n)
+        rx = surface_grid(n)
+        shift = np.r_[h/2., 0., 0.]
+        times = np.logspace(-3, -1, nT)
+        rxList = [SIP.Rx.Dipole(rx - shift, rx + shift, times)]
+        srcList = [
+            SIP.Src.Pole(rxList, np.r_[x, 0., 0.])
+            for x in np.linspace(-n*h/2., n*h/2., 3)
+        ]
+        wires = Maps.Wires(('eta', mesh.nC), ('taui', mesh.nC))
+        prob = SIP.Problem3D_CC(
+            mesh, rho=100.*np.ones(mesh.nC), etaMap=wires.eta,
+            tauiMap=wires.taui, Solver=Solver, storeJ=True,
+            actinds=np.ones(mesh.nC, dtype=bool)
+        )
+        self.pair(
+            prob, SIP.Survey(srcList),
+            np.r_[0.1*np.ones(mesh.nC), 10.*np.ones(mesh.nC)]
+        )
+
+    def _reset(self):
+        self.prob._Jmatrix, self.prob._f, self.prob.Ainv = None, None, None
+
+    def time_fields(self, *args):
+        self._reset()
+        self.prob.fields(self.m)
+
+    def peakmem_fields(self, *args):
+        self._reset()
+        self.prob.fields(self.m)
@@ -0,0 +1,47 @@
+"""
+Forward and sensitivity benchmarks of the TDEM problems.
+"""
+import numpy as np
+
+from SimPEG import Maps
+from SimPEG.EM import TDEM
+
+from .common import Solver, get_mesh, surface_grid
+
+
+class TDEMProblem(object):
+
+    params = [['b', 'e'], ['tensor', 'tree'], [8, 16], [10, 30]]
+    param_names = ['formulation', 'mesh', 'n', 'nT']
+    number = 1
+    timeout = 900
+
+    def setup(self, formulation, mesh_type, n, nT):
+        np.random.seed(0)
+        mesh = get_mesh(mesh_type, n)
+        times = np.logspace(-5, -4.5, 5)
+        rxList = [TDEM.Rx.Point_dbdt(surface_grid(n), times, 'z')]
+        srcList = [TDEM.Src.MagDipole(rxList, loc=np.r_[0., 0., 30.])]
+        survey = TDEM.Survey(srcList)
+        self.prob = getattr(TDEM, 'Problem3D_{}'.format(formulation))(
+            mesh, sigmaMap=Maps.ExpMap(mesh), Solver=Solver
+        )
+        self.prob.timeSteps = [(1e-6, nT//2), (2e-5, nT - nT//2)]
+        self.prob.pair(survey)
+
+        self.m = np.log(1e-2)*np.ones(mesh.nC)
+        self.f = self.prob.fields(self.m)
+        self.v = np.random.rand(mesh.nC)
+        self.w = np.random.rand(survey.nD)
+
+    def time_fields(self, *args):
+        self.prob.fields(self.m)
+
+    def peakmem_fields(self, *args):
+        self.prob.fields(self.m)
+
+    def time_Jvec(self, *args):
+        self.prob.Jvec(self.m, self.v, f=self.f)
+
+    def time_Jtvec(self, *args):
+        self.prob.Jtvec(self.m, self.w, f=self.f)
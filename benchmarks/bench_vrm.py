@@ -0,0 +1,49 @@
+"""
+Benchmarks of the construction of the linear VRM operators.
+"""
+import numpy as np
+
+from SimPEG import VRM
+
+from .common import get_mesh, surface_grid
+
+
+class VRMLinear(object):
+
+    params = [['tensor', 'tree'], [8, 16], [0, 2]]
+    param_names = ['mesh', 'n', 'ref_factor']
+    number = 1
+    timeout = 900
+
+    def setup(self, mesh_type, n, ref_factor):
+        mesh = get_mesh(mesh_type, n)
+        times = np.logspace(-4, -2, 5)
+        waveform = VRM.WaveformVRM.SquarePulse(delt=0.002)
+        srcList = []
+        for loc in surface_grid(n, spacing=4) + np.r_[0., 0., 1.]:
+            rxList = [
+                VRM.Rx.Point(
+                    np.atleast_2d(loc), times=times, fieldType='dbdt',
+                    fieldComp='z'
+                )
+            ]
+            srcList.append(VRM.Src.CircLoop(
+                rxList, loc, 10., np.r_[0., 0.], 1., waveform
+            ))
+        self.prob = VRM.Problem_Linear(
+            mesh, ref_factor=ref_factor,
+            ref_radius=list(50.*np.arange(1, ref_factor+1))
+        )
+        self.prob.pair(VRM.Survey(srcList))
+
+    def time_A(self, *args):
+        self.prob._AisSet = False
+        self.prob.A
+
+    def peakmem_A(self, *args):
+        self.prob._AisSet = False
+        self.prob.A
+
+    def time_T(self, *args):
+        self.prob._TisSet = False
+        self.prob.T
@@ -0,0 +1,56 @@
+"""
+Meshes and solver shared by the benchmarks.
+"""
+from __future__ import division
+
+import numpy as np
+
+from SimPEG import Mesh, Utils
+
+#: Fastest direct solver available, so the benchmarks time SimPEG and not
+#: the fallback solver of a machine without Pardiso/Mumps
+Solver = Utils.SolverUtils.getSolver()
+
+
+def tensor_mesh(n, dim=3, h=25., npad=3):
+    """
+        Tensor mesh with a core of n cells along every axis, centered
+        horizontally, with the surface at z=0, and npad padding cells.
+    """
+    pad = [(h, npad, -1.3), (h, n), (h, npad, 1.3)]
+    vertical = [(h, npad, -1.3), (h, n)]
+    return Mesh.TensorMesh(
+        [pad]*(dim-1) + [vertical], x0='C'*(dim-1) + 'N'
+    )
+
+
+def tree_mesh(n, dim=3, h=25.):
+    """
+        Octree (quadtree) mesh of 4n cells along every axis at the finest
+        level, refined to the finest level in the central n**dim block
+        below the surface at z=0.
+    """
+    mesh = Mesh.TreeMesh([h*np.ones(4*n)]*dim, x0='C'*(dim-1) + 'N')
+    mesh.x0 = np.r_[mesh.x0[:-1], -2.*n*h]
+    core = [np.linspace(-n/2., n/2., n+1)*h]*(dim-1) + [
+        np.linspace(-n, 0, n+1)*h
+    ]
+    points = Utils.ndgrid(*core)
+    mesh.insert_cells(points, mesh.max_level*np.ones(points.shape[0]))
+    return mesh
+
+
+def get_mesh(mesh_type, n, dim=3):
+    if mesh_type == 'tensor':
+        return tensor_mesh(n, dim=dim)
+    return tree_mesh(n, dim=dim)
+
+
+def surface_grid(n, dim=3, h=25., spacing=2):
+    """
+        Receiver locations every spacing cells on the surface of the core.
+    """
+    x = np.arange(-n/2., n/2.+1, spacing)*h
+    if dim == 2:
+        return np.c_[x, np.zeros_like(x)]
+    return Utils.ndgrid(x, x, np.r_[0.])
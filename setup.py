@@ -31,7 +31,7 @@ with open("README.rst") as f:
 setup(
     name="SimPEG",
     version="0.13.1",
-    packages=find_packages(exclude=['tests*']),
+    packages=find_packages(exclude=['tests*', 'benchmarks*']),
     install_requires=[
         'numpy>=1.7',
         'scipy>=0.13',
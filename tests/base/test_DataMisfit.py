@@ -5,7 +5,9 @@ import unittest
 import numpy as np
 import scipy.sparse as sp
 
-from SimPEG import Mesh, DataMisfit, Maps, Utils
+from SimPEG import (
+    Mesh, DataMisfit, Maps, Utils, Regularization, InvProblem, Optimization
+)
 from SimPEG.EM.Static import DC
 
 np.random.seed(17)
@@ -84,5 +86,36 @@ class DataMisfitTest(unittest.TestCase):
         self.assertTrue(epstest)
         self.assertTrue(Wtest)
 
+    def test_shared_dpred(self):
+        calls = []
+        dpred = self.survey.dpred
+
+        def count(m=None, f=None):
+            calls.append(1)
+            return dpred(m, f=f)
+
+        self.survey.dpred = count
+
+        invProb = InvProblem.BaseInvProblem(
+            self.dmis, Regularization.Tikhonov(self.mesh),
+            Optimization.InexactGaussNewton()
+        )
+        invProb.phi_d = invProb.phi_m = np.nan
+        m = self.model + 0.1
+        phi, g, H = invProb.evalFunction(m)
+        f = self.prob.fields(m)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(np.all(invProb.dpred == dpred(m, f=f)))
+        self.assertTrue(
+            np.all(self.dmis.deriv(m, f=f) == self.dmis.deriv(m, f=f))
+        )
+        self.assertEqual(len(calls), 2)
+
+        # line-search fields are found again from a copy of the model
+        invProb.evalFunction(m, return_g=False, return_H=False)
+        f = invProb.warmstart[0][1]
+        self.assertTrue(invProb.getFields(m.copy()) is f)
+        self.assertEqual(invProb.warmstart, [])
+
 if __name__ == '__main__':
     unittest.main()
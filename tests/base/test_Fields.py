@@ -424,6 +424,164 @@ class FieldsTest_Time_Aliased(unittest.TestCase):
         F[[self.Src0, self.Src1], 'b', 1]
         self.assertTrue(count[0] == 1)  # ensure that this is called only once.
 
+    def test_aliasCache(self):
+        nT = self.F.survey.prob.nT + 1
+        count = [0]
+
+        def alias(e, srcInd, timeInd):
+            count[0] += 1
+            return self.F.mesh.edgeCurl * e
+        F = Problem.TimeFields(self.F.mesh, self.F.survey,
+                               knownFields={'e': 'E'},
+                               aliasFields={'b': ['e', 'F', alias]},
+                               cache_aliases=True)
+        e = np.random.rand(F.mesh.nE, 5, nT)
+        F[:, 'e', :] = e
+        b = np.rollaxis(
+            np.array([F.mesh.edgeCurl * e[:, :, i] for i in range(nT)]), 0, 3
+        )
+        self.assertTrue(np.allclose(F[self.Src1, 'b', 2].ravel(), b[:, 1, 2]))
+        self.assertTrue(np.allclose(F[:, 'b', :], b))
+        # one call per time step, and one for the first source
+        self.assertTrue(count[0] == nT + 1)
+        self.assertTrue(np.allclose(F[self.Src0, 'b', :], b[:, 0, :]))
+        self.assertTrue(count[0] == nT + 1)
+
+
+class FieldsTest_Storage(unittest.TestCase):
+
+    def setUp(self):
+        mesh = Mesh.TensorMesh([np.ones(n)*5 for n in [10, 11, 12]],
+                               [0, 0, -30])
+        srcLoc = np.r_[0., 0., 0.]
+        rx = Survey.BaseRx(np.atleast_2d(srcLoc), 'exi')
+        self.srcList = [Survey.BaseSrc([rx], loc=srcLoc) for i in range(4)]
+        self.survey = Survey.BaseSurvey(srcList=self.srcList)
+        self.mesh = mesh
+
+    def get_fields(self, **kwargs):
+        return Problem.Fields(
+            self.mesh, self.survey, knownFields={'e': 'E'},
+            aliasFields={'b': ['e', 'F', (
+                lambda e, ind: self.mesh.edgeCurl * e
+            )]}, dtype=complex, **kwargs
+        )
+
+    def test_views(self):
+        F = self.get_fields()
+        e = np.random.rand(self.mesh.nE, 4) + 1j
+        F[:, 'e'] = e
+
+        src = self.srcList[1]
+        out = F[src, 'e']
+        self.assertTrue(np.shares_memory(out, F._fields['e']))
+        self.assertFalse(out.flags.writeable)
+        self.assertTrue(np.all(out == e[:, [1]]))
+        out = F[self.srcList[1:3], 'e']
+        self.assertTrue(np.shares_memory(out, F._fields['e']))
+        self.assertTrue(np.all(out == e[:, 1:3]))
+
+        # sources that are not contiguous are copied
+        out = F[[self.srcList[0], self.srcList[2]], 'e']
+        self.assertFalse(np.shares_memory(out, F._fields['e']))
+        self.assertTrue(np.all(out == e[:, [0, 2]]))
+        self.assertTrue(np.allclose(
+            F[src, 'b'], self.mesh.edgeCurl * e[:, [1]]
+        ))
+
+    def test_single(self):
+        F = self.get_fields(precision='single')
+        e = np.random.rand(self.mesh.nE, 4) + 1j
+        F[:, 'e'] = e
+        self.assertEqual(F[:, 'e'].dtype, np.complex64)
+        self.assertTrue(np.allclose(F[:, 'e'], e, rtol=1e-6))
+
+        # options of the problem
+        prob = Problem.BaseProblem(self.mesh)
+        prob.fieldsOpts = {'precision': 'single'}
+        prob.pair(self.survey)
+        F = self.get_fields()
+        F[:, 'e'] = e
+        self.assertEqual(F[:, 'e'].dtype, np.complex64)
+
+    def test_memmap(self):
+        F = self.get_fields(storage='memmap')
+        e = np.random.rand(self.mesh.nE, 4) + 1j
+        F[:, 'e'] = e
+        F[self.srcList[2], 'e'] = 2*e[:, 2]
+        self.assertIsInstance(F._fields['e'], np.memmap)
+        self.assertTrue(np.all(F[self.srcList[2], 'e'] == 2*e[:, [2]]))
+        self.assertTrue(np.all(F[self.srcList[:2], 'e'] == e[:, :2]))
+        self.assertEqual(type(F[:, 'e']), np.ndarray)
+        self.assertTrue(np.allclose(
+            F[:, 'b'], self.mesh.edgeCurl * F[:, 'e']
+        ))
+
+        self.assertRaises(
+            AssertionError, self.get_fields, storage='disk'
+        )
+
+    def test_alias_cache(self):
+        count = [0]
+
+        def alias(e, srcList):
+            count[0] += 1
+            return self.mesh.edgeCurl * e
+
+        prob = Problem.BaseProblem(self.mesh)
+        prob.pair(self.survey)
+        F = Problem.Fields(
+            self.mesh, self.survey, knownFields={'e': 'E'},
+            aliasFields={'b': ['e', 'F', alias]}, cache_aliases=True
+        )
+        e = np.random.rand(self.mesh.nE, 4)
+        F[:, 'e'] = e
+        b = self.mesh.edgeCurl * e
+
+        self.assertTrue(np.allclose(F[self.srcList[1], 'b'], b[:, [1]]))
+        self.assertTrue(np.allclose(F[:, 'b'], b))
+        self.assertEqual(count[0], 2)  # the missing sources in one call
+        self.assertTrue(np.allclose(F[self.srcList[2:], 'b'], b[:, 2:]))
+        self.assertEqual(count[0], 2)
+        self.assertEqual(F.alias_cache_stats['hits'], 3)
+        self.assertEqual(F.alias_cache_stats['misses'], 4)
+
+        # setting the known fields or the model clears the cache
+        F[self.srcList[0], 'e'] = 2*e[:, 0]
+        self.assertTrue(np.allclose(F[self.srcList[0], 'b'], 2*b[:, [0]]))
+        self.assertEqual(count[0], 3)
+        prob.model = np.ones(self.mesh.nC)
+        F[self.srcList[0], 'b']
+        self.assertEqual(count[0], 4)
+
+        # least recently used sources are removed from a full cache
+        F.alias_cache_size = 2.5 * self.mesh.nF * 8 / 1024.**2
+        F.clearAliasCache()
+        F[:, 'b']
+        self.assertEqual(F.alias_cache_stats['size'], 2)
+        count[0] = 0
+        F[self.srcList[2:], 'b']
+        self.assertEqual(count[0], 0)
+        F[self.srcList[1], 'b']
+        self.assertEqual(count[0], 1)
+
+    def test_time_memmap(self):
+        prob = Problem.BaseTimeProblem(self.mesh)
+        prob.timeSteps = [(1e-3, 5)]
+        prob.pair(self.survey)
+        nT = prob.nT + 1
+        F = Problem.TimeFields(
+            self.mesh, self.survey, knownFields={'e': 'E'},
+            storage='memmap', precision='single'
+        )
+        e = np.random.rand(self.mesh.nE, 4, nT)
+        F[:, 'e', :] = e
+        self.assertEqual(F[:, 'e', :].dtype, np.float32)
+        out = F[self.srcList[1], 'e', 2]
+        self.assertFalse(out.flags.writeable)
+        self.assertTrue(np.allclose(out.ravel(), e[:, 1, 2]))
+        self.assertTrue(np.allclose(F[self.srcList[3], 'e', :], e[:, 3, :]))
+
 
 if __name__ == '__main__':
     unittest.main()
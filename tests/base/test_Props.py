@@ -277,6 +277,33 @@ class TestPropMaps(unittest.TestCase):
         PM = NestedModels()
         assert PM._has_nested_models is True
 
+    def test_property_cache(self):
+        expMap = Maps.ExpMap(nP=10)
+        PM = ReciprocalMappingExample(sigmaMap=expMap)
+        m = np.random.rand(10)
+        PM.model = m
+
+        sigma = PM.sigma
+        self.assertIs(PM.sigma, sigma)
+        self.assertIs(PM.rho, PM.rho)
+        self.assertIs(PM.sigmaDeriv, PM.sigmaDeriv)
+        self.assertTrue(np.allclose(PM.rho, 1./np.exp(m)))
+        self.assertEqual(
+            PM.property_cache_stats['sigma'], {'hits': 1, 'misses': 1}
+        )
+        self.assertEqual(PM.property_cache_stats['rho']['misses'], 1)
+
+        # cached values are read-only, the model is not
+        with self.assertRaises(ValueError):
+            PM.sigma[0] = 1.
+        m[0] = 1.
+
+        PM.model = m
+        self.assertTrue(np.allclose(PM.sigma, np.exp(m)))
+        PM.sigmaMap = Maps.IdentityMap(nP=10)
+        self.assertTrue(np.allclose(PM.sigma, m))
+        self.assertEqual(PM.property_cache_stats['sigma']['misses'], 3)
+
 
 if __name__ == '__main__':
     unittest.main()
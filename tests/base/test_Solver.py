@@ -1,5 +1,8 @@
 import unittest
-from SimPEG import Mesh, Solver, SolverDiag, SolverCG, SolverLU, Utils
+from SimPEG import (
+    Mesh, Solver, SolverDiag, SolverCG, SolverLU, SolverBlockCG, Utils
+)
+from SimPEG.Utils import SolverUtils
 from discretize import TensorMesh
 from SimPEG.Utils import sdiag
 import numpy as np
@@ -54,6 +57,89 @@ class TestSolver(unittest.TestCase):
     def test_iterative_cg_1(self): self.assertLess(dotest(SolverCG, False),TOLI)
     def test_iterative_cg_M(self): self.assertLess(dotest(SolverCG, True),TOLI)
 
+    def test_iterative_blockcg_1(self): self.assertLess(dotest(SolverBlockCG, False),TOLI)
+    def test_iterative_blockcg_M(self): self.assertLess(dotest(SolverBlockCG, True),TOLI)
+
+    def test_direct_splu_columns(self):
+        SolverLUColumns = SolverUtils.SolverWrapD(
+            sparse.linalg.splu, factorize=True, blockSolve=False
+        )
+        self.assertLess(dotest(SolverLUColumns, False), TOLD)
+
+    def test_accuracy_sample(self):
+        self.assertLess(dotest(SolverLU, False, accuracySample=2), TOLD)
+        self.assertLess(dotest(SolverLU, False, checkAccuracy=False), TOLD)
+
+        # the sample does not consume the global random state
+        Ainv = SolverLU(sparse.eye(10).tocsc(), accuracySample=2)
+        state = np.random.get_state()
+        expected = np.random.rand()
+        np.random.set_state(state)
+        Ainv * np.ones((10, 5))
+        self.assertEqual(np.random.rand(), expected)
+
+
+class TestSolverIterative(unittest.TestCase):
+
+    def test_preconditioners(self):
+        for method, preconditioner in [
+            ('cg', 'jacobi'), ('cg', None), ('bicgstab', 'ilu'),
+            ('gmres', 'ilu')
+        ]:
+            self.assertLess(dotest(
+                SolverUtils.SolverIterative, False, method=method,
+                preconditioner=preconditioner, tol=1e-10
+            ), TOLI)
+
+    def test_curl_curl(self):
+        M = TensorMesh([8, 8, 8])
+        Me = M.getEdgeInnerProduct(1e-2*np.ones(M.nC))
+        Mf = M.getFaceInnerProduct()
+        G = M.nodalGrad
+        cache = SolverUtils.PreconditionerCache(reuse_tol=0.5)
+        counter = Utils.Counter()
+        x = np.random.rand(M.nE)
+        for omega in [1e4, 1.2e4]:
+            A = (
+                M.edgeCurl.T*Mf*M.edgeCurl + 1j*omega*4e-7*np.pi*Me
+            )*1e6
+            Ainv = SolverUtils.SolverIterative(
+                A, preconditioner='ams', G=G, tol=1e-10, cache=cache,
+                counter=counter
+            )
+            self.assertLess(np.linalg.norm(Ainv*(A*x) - x, np.inf), TOLI)
+
+        counts = counter._countList
+        self.assertEqual(counts['SolverIterative.preconditioner_build'], 1)
+        self.assertEqual(counts['SolverIterative.preconditioner_reuse'], 1)
+        self.assertEqual(counts['SolverIterative.solves'], 2)
+
+
+class TestSolverRegistry(unittest.TestCase):
+
+    def test_get_solver(self):
+        self.assertIs(SolverUtils.getSolver('SolverLU'), SolverLU)
+        self.assertIn('SolverLU', SolverUtils.availableSolvers())
+        self.assertIn(
+            SolverUtils.getSolver().__name__, SolverUtils.DEFAULT_SOLVERS
+        )
+        with self.assertRaises(KeyError):
+            SolverUtils.getSolver('NotASolver')
+
+    def test_optional_solver(self):
+        SolverUtils.registerSolver(
+            'Missing', ('simpeg_missing_module', 'Solver')
+        )
+        self.assertNotIn('Missing', SolverUtils.availableSolvers())
+        with self.assertRaises(ImportError):
+            SolverUtils.getSolver('Missing')
+        del SolverUtils.SOLVERS['Missing']
+
+    def test_problem_solver_by_name(self):
+        from SimPEG import Problem
+        prob = Problem.BaseProblem(Mesh.TensorMesh([4]), Solver='SolverLU')
+        self.assertIs(prob.Solver, SolverLU)
+
 
 
 if __name__ == '__main__':
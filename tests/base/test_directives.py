@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import unittest
 import warnings
 import pytest
@@ -5,7 +8,7 @@ import numpy as np
 
 from SimPEG import (
     Mesh, Maps, Directives, Regularization, DataMisfit, Optimization,
-    Inversion, InvProblem
+    Inversion, InvProblem, Problem, Survey, Utils
 )
 from SimPEG import PF
 
@@ -54,6 +57,10 @@ class DirectivesValidation(unittest.TestCase):
 class ValidationInInversion(unittest.TestCase):
 
     def setUp(self):
+        # seeded for a reproducible number of iterations, the random state
+        # is restored in tearDown
+        self.random_state = np.random.get_state()
+        np.random.seed(0)
         mesh = Mesh.TensorMesh([4, 4, 4])
 
         # Magnetic inducing field parameter (A,I,D)
@@ -101,6 +108,9 @@ class ValidationInInversion(unittest.TestCase):
         self.mesh = mesh
         self.invProb = invProb
 
+    def tearDown(self):
+        np.random.set_state(self.random_state)
+
     def test_validation_in_inversion(self):
         betaest = Directives.BetaEstimate_ByEig()
 
@@ -125,5 +135,127 @@ class ValidationInInversion(unittest.TestCase):
             inv.directiveList = [betaest, update_Jacobi, IRLS]
 
 
+    def run_save_output(self, maxIter):
+        """Run the inversion saving the output, return the directives"""
+        self.invProb.opt.maxIter = maxIter
+        self.invProb.reg.mapping = Maps.IdentityMap(nP=self.mesh.nC)
+        save_model = Directives.SaveModelEveryIteration(name='model')
+        save_output = Directives.SaveOutputEveryIteration(name='output')
+        save_dict = Directives.SaveOutputDictEveryIteration(
+            name='dict', saveOnDisk=True
+        )
+        inv = Inversion.BaseInversion(
+            self.invProb, directiveList=[
+                Directives.BetaEstimate_ByEig(), save_model, save_output,
+                save_dict
+            ]
+        )
+        inv.run(np.ones(self.mesh.nC) * 1e-4)
+        return save_model, save_output, save_dict
+
+    def test_save_output(self):
+        cwd = os.getcwd()
+        directory = tempfile.mkdtemp()
+        try:
+            os.chdir(directory)
+            save_model, save_output, save_dict = self.run_save_output(2)
+
+            # the writers are closed at the end of the inversion
+            records = Utils.read_records(save_dict.fileName + '.rec')
+            self.assertEqual(len(records), self.invProb.opt.iter)
+            for record in records:
+                saved = save_dict.outDict[record['iter']]
+                self.assertTrue(np.all(record['m'] == saved['m']))
+                self.assertTrue(np.all(record['dpred'] == saved['dpred']))
+                self.assertEqual(record['phi_d'], saved['phi_d'])
+
+            model = np.load('{:03d}-{}.npy'.format(
+                self.invProb.opt.iter, save_model.fileName
+            ))
+            self.assertTrue(np.all(model == records[-1]['m']))
+
+            save_output.load_results()
+            self.assertEqual(len(save_output.phi_d), self.invProb.opt.iter)
+
+            # components of the last evaluation, not evaluated again
+            reg = self.invProb.reg
+            values = [fct(self.invProb.model) for fct in reg.objfcts]
+            self.assertTrue(np.allclose(
+                reg.last_values(self.invProb.model), values, rtol=1e-12
+            ))
+            self.assertTrue(np.isclose(
+                save_output.phi_m_small[-1], reg.alpha_s * values[0],
+                rtol=1e-4
+            ))
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(directory)
+
+    def test_save_output_one_iteration(self):
+        cwd = os.getcwd()
+        directory = tempfile.mkdtemp()
+        try:
+            os.chdir(directory)
+            _, save_output, _ = self.run_save_output(1)
+            self.assertEqual(self.invProb.opt.iter, 1)
+
+            # a single row of results
+            save_output.load_results()
+            self.assertEqual(len(save_output.beta), 1)
+            self.assertEqual(len(save_output.phi_m_smooth), 1)
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(directory)
+
+
+class BetaEstimate(unittest.TestCase):
+
+    def setUp(self):
+        # the estimate seeds numpy, leave the random state as it was
+        self.random_state = np.random.get_state()
+        mesh = Mesh.TensorMesh([8, 7, 6])
+        np.random.seed(0)
+        G = np.random.randn(30, mesh.nC) * np.exp(-3*mesh.gridCC[:, 2])
+        prob = Problem.LinearProblem(mesh, G=G)
+        survey = Survey.LinearSurvey()
+        survey.pair(prob)
+        survey.makeSyntheticData(0.1*np.ones(mesh.nC), std=0.01)
+
+        dmis = DataMisfit.l2_DataMisfit(survey)
+        reg = Regularization.Tikhonov(mesh)
+        opt = Optimization.ProjectedGNCG(maxIter=1)
+        self.invProb = InvProblem.BaseInvProblem(dmis, reg, opt)
+        self.invProb.startup(1e-2*np.ones(mesh.nC))
+
+        # ratio of the largest eigenvalues
+        WG = dmis.W * G
+        self.ratio = (
+            np.linalg.eigvalsh(WG.T.dot(WG)).max() /
+            np.linalg.eigvalsh(reg.deriv2(self.invProb.model).toarray()).max()
+        )
+
+    def tearDown(self):
+        np.random.set_state(self.random_state)
+
+    def estimate(self, **kwargs):
+        betaest = Directives.BetaEstimate_ByEig(beta0_ratio=1., **kwargs)
+        inv = Inversion.BaseInversion(self.invProb, directiveList=[betaest])
+        betaest.initialize()
+        self.assertEqual(self.invProb.beta, betaest.beta0)
+        return betaest
+
+    def test_methods(self):
+        rayleigh = self.estimate()
+        lanczos = self.estimate(method='Lanczos', nVectors=4, n_cpu=2)
+        power = self.estimate(method='Power', nVectors=2, nIter=10)
+
+        # a single Rayleigh quotient underestimates the ratio
+        self.assertTrue(rayleigh.beta0 < 0.1*self.ratio)
+        for betaest in [lanczos, power]:
+            low, high = betaest.beta0_band
+            self.assertTrue(low <= betaest.beta0 <= high)
+            self.assertTrue(abs(betaest.beta0 - self.ratio) < 0.1*self.ratio)
+
+
 if __name__ == '__main__':
     unittest.main()
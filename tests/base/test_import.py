@@ -0,0 +1,52 @@
+from __future__ import print_function
+
+import subprocess
+import sys
+import unittest
+
+
+def imported_modules(statement, modules):
+    """
+        The modules of `modules` that are imported after running
+        `statement` in a fresh interpreter.
+    """
+    code = "import sys; {}; print(' '.join(m for m in {!r} if m in sys.modules))"
+    out = subprocess.check_output(
+        [sys.executable, '-c', code.format(statement, modules)]
+    )
+    return out.decode().split()
+
+
+class TestLazyImport(unittest.TestCase):
+
+    lazy = [
+        'SimPEG.Optimization', 'SimPEG.Directives', 'SimPEG.Inversion',
+        'SimPEG.EM.Analytics', 'geoana', 'IPython', 'ipywidgets'
+    ]
+
+    def test_import(self):
+        for module in ['SimPEG', 'SimPEG.EM', 'SimPEG.PF']:
+            self.assertEqual(
+                imported_modules('import {}'.format(module), self.lazy), []
+            )
+
+    def test_access(self):
+        self.assertEqual(
+            imported_modules(
+                'import SimPEG; SimPEG.Inversion; import SimPEG.EM as EM; '
+                'EM.Analytics.hzAnalyticDipoleF', self.lazy[:4]
+            ),
+            self.lazy[:4]
+        )
+
+    def test_from_import(self):
+        import SimPEG
+        from SimPEG import Directives, Inversion, Optimization
+        self.assertIs(SimPEG.Inversion, Inversion)
+        self.assertIn('Directives', dir(SimPEG))
+        with self.assertRaises(AttributeError):
+            SimPEG.NotASubmodule
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from SimPEG import (
+    Mesh, Maps, Directives, Regularization, DataMisfit, Optimization,
+    Inversion, InvProblem, Problem, Survey
+)
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.random_state = np.random.get_state()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        np.random.set_state(self.random_state)
+
+    def inversion(self, maxIter):
+        mesh = Mesh.TensorMesh([10, 8])
+        rand = np.random.RandomState(0)
+        G = rand.randn(20, mesh.nC) * np.exp(-2*mesh.gridCC[:, 1])
+        prob = Problem.LinearProblem(mesh, G=G)
+        survey = Survey.LinearSurvey()
+        survey.pair(prob)
+        model = np.zeros(mesh.nC)
+        model[30:50] = 0.1
+        survey.dobs = prob.fields(model) + 1e-3 * rand.randn(20)
+        survey.std, survey.eps = 0., 1e-3
+
+        dmis = DataMisfit.l2_DataMisfit(survey)
+        reg = Regularization.Sparse(
+            mesh, mapping=Maps.IdentityMap(nP=mesh.nC)
+        )
+        reg.mref = np.zeros(mesh.nC)
+        reg.norms = np.c_[0, 1, 1, 1]
+        opt = Optimization.ProjectedGNCG(
+            maxIter=maxIter, lower=-1., upper=1., maxIterCG=10
+        )
+        invProb = InvProblem.BaseInvProblem(dmis, reg, opt)
+        directives = [
+            Directives.BetaEstimate_ByEig(beta0_ratio=1e-4),
+            Directives.Update_IRLS(
+                f_min_change=1e-4, minGNiter=1, betaSearch=False
+            ),
+            Directives.UpdatePreconditioner()
+        ]
+        return Inversion.BaseInversion(invProb, directiveList=directives)
+
+    def test_resume(self):
+        m0 = np.ones(20*4) * 1e-4
+        fname = os.path.join(self.directory, 'inversion.chk')
+
+        expected = self.inversion(maxIter=8).run(m0)
+
+        inv = self.inversion(maxIter=4)
+        inv.checkpointFile = fname
+        inv.checkpointOperators = True
+        inv.run(m0)
+        self.assertTrue(os.path.exists(fname))
+        self.assertFalse(os.path.exists(fname + '.tmp'))
+
+        inv = self.inversion(maxIter=8)
+        mrec = inv.run(m0, resume=fname)
+        self.assertEqual(inv.opt.iter, 8)
+        self.assertTrue(np.all(mrec == expected))
+
+        # the checkpoint must be of the same inversion
+        inv = self.inversion(maxIter=8)
+        inv.directiveList = inv.directiveList.dList[:2]
+        with self.assertRaises(AssertionError):
+            inv.run(m0, resume=fname)
+
+
+if __name__ == '__main__':
+    unittest.main()
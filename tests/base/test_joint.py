@@ -66,6 +66,31 @@ class DataMisfitTest(unittest.TestCase):
         self.dmis1.test()
         self.dmiscobmo.test(x=self.model)
 
+    def test_concurrent(self):
+        m = self.model
+        v = np.random.RandomState(1).rand(len(m))
+        f = [self.prob0.fields(m), self.prob1.fields(m)]
+
+        serial = [
+            self.dmiscobmo(m, f=f), self.dmiscobmo.deriv(m, f=f),
+            self.dmiscobmo.deriv2(m, v, f=f)
+        ]
+        self.dmiscobmo.n_cpu = 2
+        threaded = [
+            self.dmiscobmo(m, f=f), self.dmiscobmo.deriv(m, f=f),
+            self.dmiscobmo.deriv2(m, v, f=f)
+        ]
+        for a, b in zip(serial, threaded):
+            self.assertTrue(np.all(a == b))
+
+        invProb = InvProblem.BaseInvProblem(
+            self.dmiscobmo, Regularization.Tikhonov(self.mesh),
+            Optimization.InexactGaussNewton()
+        )
+        dpred = invProb.get_dpred(m, invProb.getFields(m))
+        self.assertTrue(np.all(dpred[0] == self.survey0.dpred(m)))
+        self.assertTrue(np.all(dpred[1] == self.survey1.dpred(m)))
+
     def test_inv(self):
         reg = Regularization.Tikhonov(self.mesh)
         opt = Optimization.InexactGaussNewton(maxIter=10)
@@ -410,6 +410,61 @@ class MapTests(unittest.TestCase):
         mapping = Maps.Projection(nP, np.r_[1, 2, 6, 1, 3, 5, 4, 9, 9, 8, 0])
         mapping.test()
 
+    def test_deriv_operator(self):
+        M = Mesh.TensorMesh([4, 5, 6])
+        indActive = M.gridCC[:, 2] < 0.6
+        nP = int(indActive.sum())
+        combos = [
+            Maps.ExpMap(M) * Maps.InjectActiveCells(M, indActive, 0.) *
+            Maps.Weighting(nP=nP, weights=np.random.rand(nP) + 1.),
+            Maps.ReciprocalMap(M) * Maps.ExpMap(M) *
+            Maps.SurjectVertical1D(M),
+            Maps.ChiMap(nP=4) * Maps.LogMap(nP=4) *
+            Maps.Projection(6, np.r_[0, 2, 2, 5]),
+        ]
+        for mapping in combos:
+            m = np.random.rand(mapping.nP) + 0.5
+            D = mapping._deriv_chain(m)
+            J = mapping.deriv_operator(m)
+            v = np.random.rand(mapping.nP)
+            w = np.random.rand(D.shape[0])
+
+            self.assertTrue(np.allclose(J * v, D * v))
+            self.assertTrue(np.allclose(J.T * w, D.T * w))
+            self.assertTrue(np.allclose(mapping.deriv(m, v), D * v))
+            self.assertTrue(mapping.test(m))
+
+    def test_combo_cache(self):
+        M = Mesh.TensorMesh([10])
+        mapping = Maps.ExpMap(M) * Maps.Weighting(M, weights=np.arange(10.))
+        m = np.random.rand(10)
+        D = mapping.deriv(m)
+        self.assertIs(mapping.deriv(m.copy()), D)
+        m[0] += 1.
+        self.assertIsNot(mapping.deriv(m), D)
+        self.assertTrue(np.allclose(mapping * m, np.exp(np.arange(10.) * m)))
+
+        # changing a parameter of a map invalidates the cache
+        mapping.maps[1].weights = np.ones(10)
+        self.assertTrue(np.allclose(mapping * m, np.exp(m)))
+        self.assertTrue(np.allclose(mapping.deriv(m).diagonal(), np.exp(m)))
+
+        M = Mesh.TensorMesh([4])
+        inj = Maps.InjectActiveCells(
+            M, np.r_[True, True, False, False], np.log(1e-8)
+        )
+        mapping = Maps.ExpMap(M) * inj
+        m = np.zeros(2)
+        self.assertTrue(np.allclose(mapping * m, [1., 1., 1e-8, 1e-8]))
+        inj.valInactive = np.log(np.r_[1., 1., 1e-2, 1e-2])
+        self.assertTrue(np.allclose(mapping * m, [1., 1., 1e-2, 1e-2]))
+
+        # the shape and dtype of the model are part of the key
+        self.assertEqual((mapping * m[:, None]).shape, (4,))
+        m = np.r_[1e-300, 0.]
+        self.assertTrue(np.allclose(mapping * m, [1., 1., 1e-2, 1e-2]))
+        self.assertTrue(np.isinf(mapping * m.view(np.int64))[0])
+
 
 class TestWires(unittest.TestCase):
 
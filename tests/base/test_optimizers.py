@@ -52,6 +52,38 @@ class TestOptimizers(unittest.TestCase):
         print('x_true: ', x_true)
         self.assertTrue(np.linalg.norm(xopt-x_true,2) < TOL, True)
 
+    def test_ProjGNCG_quadraticBounded(self):
+        PG = Optimization.ProjectedGNCG(maxIterCG=20, tolCG=1e-6)
+        PG.lower, PG.upper = -2, 2
+        myB = np.array([-5, 1])
+        xopt = PG.minimize(getQuadratic(self.A, myB), np.array([0, 0]))
+        x_true = np.array([2., -1.])
+        print('xopt: ', xopt)
+        print('x_true: ', x_true)
+        self.assertTrue(np.linalg.norm(xopt-x_true, 2) < TOL, True)
+
+    def test_BFGS_quadratic(self):
+        A = sp.diags(np.linspace(1, 10, 20)).tocsr()
+        b = np.ones(20)
+        opt = Optimization.BFGS(
+            maxIter=100, nbfgs=4, tolF=1e-10, tolX=1e-10, tolG=1e-10
+        )
+        opt.remember('f', ('norm_g', lambda M: np.linalg.norm(M.g)))
+        opt.rememberWindow = 3
+        xopt = opt.minimize(getQuadratic(A, b), np.zeros(20))
+        self.assertTrue(np.linalg.norm(xopt + b/A.diagonal()) < TOL)
+
+        # the memory is a circular buffer of nbfgs pairs
+        self.assertEqual(opt._bfgsS.shape, (20, 4))
+        self.assertTrue(opt._bfgscnt > 4)
+        # secant condition on the newest pair
+        k = np.mod(opt._bfgscnt, 4)
+        s, y = opt._bfgsS[:, k], opt._bfgsY[:, k]
+        self.assertTrue(np.allclose(opt.bfgs(y), s))
+        self.assertTrue(np.allclose(A*s, y))
+        self.assertEqual(len(opt.recall('f')), 3)
+        self.assertEqual(len(opt.recall('norm_g')), 3)
+
     def test_NewtonRoot(self):
         fun = lambda x, return_g=True: np.sin(x) if not return_g else ( np.sin(x), sdiag( np.cos(x) ) )
         x = np.array([np.pi-0.3, np.pi+0.1, 0])
@@ -1,6 +1,7 @@
 import unittest
 from SimPEG import Mesh, Problem, Maps
 import numpy as np
+import scipy.sparse as sp
 
 
 class TestTimeProblem(unittest.TestCase):
@@ -34,5 +35,85 @@ class TestTimeProblem(unittest.TestCase):
             self.prob.mapping = Maps.IdentityMap(self.mesh)
 
 
+class MatrixFreeProblem(Problem.BaseProblem):
+    """J is only available through Jvec and Jtvec"""
+
+    def __init__(self, mesh, G, **kwargs):
+        super(MatrixFreeProblem, self).__init__(mesh, **kwargs)
+        self.G = G
+        self.nJtvec = 0
+
+    def fields(self, m):
+        return self.G.dot(m)
+
+    def Jvec(self, m, v, f=None):
+        return self.G.dot(v)
+
+    def Jtvec(self, m, v, f=None):
+        self.nJtvec += 1
+        return self.G.T.dot(v)
+
+
+class TestJtJdiag(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(1)
+        mesh = Mesh.TensorMesh([20])
+        self.G = np.random.randn(30, mesh.nC)
+        self.W = sp.diags(np.random.rand(30) + 0.5)
+        self.m = np.random.rand(mesh.nC)
+        self.JtJdiag = np.sum((self.W * self.G)**2, axis=0)
+        self.prob = MatrixFreeProblem(mesh, self.G)
+
+        class Survey(object):
+            nD = 30
+        self.prob._survey = Survey()
+
+    def test_linear(self):
+        prob = Problem.LinearProblem(self.prob.mesh, G=self.G)
+        self.assertTrue(np.allclose(
+            prob.getJtJdiag(self.m, W=self.W), self.JtJdiag
+        ))
+        V = np.random.randn(20, 3)
+        self.assertTrue(np.allclose(
+            prob.Jvec_block(self.m, V), self.G.dot(V)
+        ))
+
+    def test_exact(self):
+        self.prob.JtJdiagOpts = {'approach': 'Exact', 'blockSize': 7}
+        JtJdiag = self.prob.getJtJdiag(self.m, W=self.W)
+        self.assertTrue(np.allclose(JtJdiag, self.JtJdiag))
+        self.assertEqual(self.prob.nJtvec, 30)
+
+        # threads give the same columns
+        V = np.random.randn(30, 5)
+        self.assertTrue(np.allclose(
+            self.prob.Jtvec_block(self.m, V, n_cpu=3), self.G.T.dot(V)
+        ))
+
+    def test_estimates(self):
+        for approach in ['Ones', 'Random', 'Probing']:
+            self.prob._JtJdiagCache = None
+            self.prob.JtJdiagOpts = {'approach': approach, 'k': 2000}
+            JtJdiag = self.prob.getJtJdiag(self.m, W=self.W)
+            err = np.linalg.norm(JtJdiag - self.JtJdiag)
+            print(
+                'Testing {}. {}'.format(
+                    approach, err/np.linalg.norm(self.JtJdiag)
+                )
+            )
+            self.assertTrue(err < 0.1*np.linalg.norm(self.JtJdiag))
+
+    def test_refresh(self):
+        self.prob.JtJdiagOpts = {'approach': 'Exact', 'refresh': 2}
+        JtJdiag = self.prob.getJtJdiag(self.m, W=self.W)
+        self.assertTrue(self.prob.getJtJdiag(self.m, W=self.W) is JtJdiag)
+        # the diagonal of the first model is used for the next one
+        self.assertTrue(self.prob.getJtJdiag(2*self.m, W=self.W) is JtJdiag)
+        self.assertTrue(self.prob.getJtJdiag(2*self.m, W=self.W) is JtJdiag)
+        self.assertFalse(self.prob.getJtJdiag(3*self.m, W=self.W) is JtJdiag)
+        self.assertEqual(self.prob.nJtvec, 60)
+
+
 if __name__ == '__main__':
     unittest.main()
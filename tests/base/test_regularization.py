@@ -8,6 +8,9 @@ import unittest
 from SimPEG import Mesh, Maps, Regularization, Utils, Tests, ObjectiveFunction
 from scipy.sparse.linalg import dsolve
 import inspect
+import os
+import shutil
+import tempfile
 
 TOL = 1e-7
 testReg = True
@@ -385,5 +388,146 @@ class RegularizationTests(unittest.TestCase):
          reg = Regularization.Simple(mesh, indActive=active)
          self.assertTrue(reg._nC_residual == len(active.nonzero()[0]))
 
+    def test_W_cache(self):
+        mesh = Mesh.TensorMesh([8, 7, 6])
+        nC = mesh.nC
+        m = np.random.rand(nC)
+        v = np.random.rand(nC)
+
+        reg = Regularization.Tikhonov(mesh)
+        for fct in reg.objfcts:
+            W = fct.W
+            self.assertTrue(fct.W is W)
+            self.assertTrue(np.allclose(fct.deriv2(m, v), W.T * (W * v)))
+            self.assertTrue(np.allclose(fct.deriv2(m) * v, W.T * (W * v)))
+
+        # cell weights are mirrored to the objective functions
+        W = reg.objfcts[1].W
+        reg.cell_weights = np.random.rand(nC) + 1.
+        self.assertFalse(reg.objfcts[1].W is W)
+        self.assertTrue(np.allclose(
+            reg.objfcts[0].W.diagonal(),
+            np.sqrt(mesh.vol * reg.cell_weights)
+        ))
+
+        # the IRLS weights are rebuilt with the model or when unstashed
+        reg = Regularization.Sparse(mesh, mapping=Maps.IdentityMap(nP=nC))
+        reg.norms = np.c_[0., 1., 1., 1.]
+        reg.eps_p, reg.eps_q = 0.1, 0.1
+        reg.model = m
+        fct = reg.objfcts[1]
+        W = fct.W
+        self.assertTrue(fct.W is W)
+        self.assertTrue(np.allclose(fct.deriv2(m, v), W.T * (W * v)))
+        fct.stashedR = None
+        reg.model = 2*m
+        W2 = fct.W
+        self.assertFalse(W2 is W)
+        self.assertFalse(np.allclose((W2 - W).data, 0.))
+
+        fct.cache_W = False
+        self.assertFalse(fct.W is fct.W)
+        self.assertTrue(np.allclose((fct.W - W2).data, 0.))
+
+    def test_irls_state(self):
+        mesh = Mesh.TensorMesh([8, 7, 6])
+        nC = mesh.nC
+        m = np.random.randn(nC)
+
+        for gradientType in ['components', 'total']:
+            reg = Regularization.Sparse(
+                mesh, mapping=Maps.IdentityMap(nP=nC),
+                gradientType=gradientType
+            )
+            reg.norms = np.c_[0., 1., 0.5, 2.]
+            reg.eps_p, reg.eps_q = 0.1, 0.1
+            reg.model = m
+
+            states = reg.irls_state
+            self.assertTrue(reg.irls_state[1] is states[1])
+            for fct, state in zip(reg.objfcts, states):
+                # nothing is stashed by the state
+                self.assertTrue(fct.stashedR is None)
+                self.assertTrue(fct.f_m is state['f_m'])
+                self.assertTrue(np.allclose(
+                    state['phi'],
+                    np.sum(
+                        fct.f_m**2. /
+                        (fct.f_m**2. + fct.epsilon**2.)**(1 - fct.norm/2.)
+                    )
+                ))
+                self.assertTrue(np.allclose(state['value'], fct(m)))
+                self.assertTrue(np.allclose(state['R'], fct.stashedR))
+
+            # kept until the model or the weights change
+            states = reg.irls_state
+            reg.model = 2*m
+            self.assertFalse(reg.irls_state[1] is states[1])
+
+            if gradientType == 'total':
+                self.assertTrue(
+                    reg.objfcts[1]._total_gradient() is
+                    reg.objfcts[2]._total_gradient()
+                )
+
+    def test_regularizationMesh_store(self):
+        mesh = Mesh.TensorMesh([8, 7, 6])
+        indActive = mesh.gridCC[:, 2] < 0.6
+
+        regmesh = Regularization.RegularizationMesh(
+            mesh, indActive=indActive
+        )
+        other = Regularization.RegularizationMesh(
+            mesh, indActive=indActive.copy()
+        )
+        # operators are shared by the regularization meshes of the same setup
+        self.assertTrue(regmesh.cellDiffx is other.cellDiffx)
+        self.assertTrue(regmesh.Pac is other.Pac)
+
+        # and match the projected operators of the mesh
+        Pac = Utils.speye(mesh.nC)[:, indActive]
+        indActive_Fy = (mesh.aveFy2CC.T * indActive) >= 1
+        Pafy = Utils.speye(mesh.nFy)[:, indActive_Fy]
+        self.assertTrue(np.allclose((regmesh.Pac - Pac).data, 0.))
+        self.assertTrue(np.allclose((regmesh.Pafy - Pafy).data, 0.))
+        self.assertTrue(np.allclose(
+            (regmesh.cellDiffy - Pafy.T * mesh.cellGrady * Pac).data, 0.
+        ))
+        self.assertTrue(np.allclose(
+            (regmesh.aveFy2CC - Pac.T * mesh.aveFy2CC * Pafy).data, 0.
+        ))
+
+        # new active cells use other operators
+        other.indActive = mesh.gridCC[:, 2] < 0.4
+        self.assertFalse(regmesh.cellDiffx is other.cellDiffx)
+        self.assertEqual(other.cellDiffx.shape[1], other.nC)
+
+        # save and load
+        directory = tempfile.mkdtemp()
+        fname = os.path.join(directory, 'regmesh_operators.npz')
+        regmesh.save_operators(fname)
+        try:
+            loaded = Regularization.RegularizationMesh(
+                Mesh.TensorMesh([8, 7, 6]), indActive=indActive
+            )
+            loaded.load_operators(fname)
+            for name in ['vol', 'Pafz', 'aveCC2Fx', 'faceDiffz',
+                         'cellDiffyStencil']:
+                A, B = getattr(loaded, name), getattr(regmesh, name)
+                if hasattr(A, 'toarray'):
+                    A, B = A.toarray(), B.toarray()
+                self.assertTrue(np.allclose(A, B))
+            self.assertRaises(ValueError, other.load_operators, fname)
+
+            # loaded operators replace the ones already built
+            loaded = Regularization.RegularizationMesh(
+                Mesh.TensorMesh([8, 7, 6]), indActive=indActive
+            )
+            loaded._stored_operators['Pac'] = Utils.speye(loaded.nC)
+            loaded.load_operators(fname)
+            self.assertEqual(loaded.Pac.shape, (mesh.nC, loaded.nC))
+        finally:
+            shutil.rmtree(directory)
+
 if __name__ == '__main__':
     unittest.main()
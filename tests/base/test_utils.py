@@ -3,14 +3,22 @@ import unittest
 import numpy as np
 import scipy.sparse as sp
 import os
+import json
 import shutil
+import tempfile
+import threading
+import time
+import gc
+import weakref
 from SimPEG.Utils import (
     sdiag, sub2ind, ndgrid, mkvc, inv2X2BlockDiagonal,
     inv3X3BlockDiagonal, invPropertyTensor, makePropertyTensor, indexCube,
-    ind2sub, asArray_N_x_Dim, TensorType, diagEst, count, timeIt, Counter,
-    download, surface2ind_topo
+    ind2sub, asArray_N_x_Dim, TensorType, diagEst, diagEstAtA, eigEstMax,
+    count, timeIt, Counter, download, surface2ind_topo, get_surface_index,
+    Profiler, profiler, SolverUtils, BackgroundWriter, read_records
 )
 from SimPEG import Mesh
+from SimPEG.Utils import modelutils, io_utils
 from discretize.Tests import checkDerivative
 
 
@@ -63,6 +71,103 @@ class TestCounter(unittest.TestCase):
         self.assertTrue(True)
 
 
+class TestProfiler(unittest.TestCase):
+
+    def tearDown(self):
+        profiler.disable()
+        profiler.reset()
+
+    def test_disabled(self):
+        p = Profiler()
+        with p.span('nothing') as span:
+            span.count('solves')
+        p.count('solves')
+        self.assertEqual(p.spans, [])
+        self.assertEqual(len(p.counters), 0)
+
+    def test_spans(self):
+        class MyClass(object):
+            @timeIt
+            def outer(self):
+                with profiler.span('inner', index=1):
+                    profiler.count('matvecs', 2)
+                return self.leaf()
+
+            @timeIt
+            def leaf(self):
+                profiler.count('matvecs')
+                return 1
+
+        c = MyClass()
+        with profiler:
+            c.outer()
+            c.leaf()
+
+        self.assertEqual(
+            [span.name for span in profiler.spans],
+            ['MyClass.outer', 'MyClass.leaf']
+        )
+        outer = profiler.spans[0]
+        self.assertEqual(
+            [span.name for span in outer.children], ['inner', 'MyClass.leaf']
+        )
+        self.assertEqual(outer.children[0].attrs, {'index': 1})
+        self.assertEqual(outer.children[0].counters['matvecs'], 2)
+        self.assertEqual(profiler.counters['matvecs'], 4)
+        self.assertTrue(outer.wall >= outer.children[0].wall >= 0.)
+        self.assertTrue(outer.cpu >= 0.)
+
+        out = json.loads(profiler.to_json())
+        self.assertEqual(out['spans'][0]['children'][1]['name'], 'MyClass.leaf')
+        trace = json.loads(profiler.to_chrome_trace())['traceEvents']
+        self.assertEqual(len(trace), 4)
+        self.assertTrue(all(event['ph'] == 'X' for event in trace))
+        profiler.summary()
+
+        # closed, nothing more is recorded
+        c.outer()
+        self.assertEqual(len(profiler.spans), 2)
+
+    def test_solver(self):
+        A = sp.eye(10).tocsc() * 2.
+        with profiler:
+            Ainv = SolverUtils.SolverLU(A)
+            Ainv * np.ones(10)
+            Ainv * np.ones((10, 3))
+        self.assertEqual(profiler.counters['factorizations'], 1)
+        self.assertEqual(profiler.counters['solves'], 2)
+        self.assertEqual(profiler.counters['rhs_columns'], 4)
+        self.assertEqual(
+            [span.name for span in profiler.spans],
+            ['SolverLU.factorize', 'SolverLU.solve', 'SolverLU.solve']
+        )
+
+    def test_threads(self):
+        def work(i):
+            for j in range(50):
+                with profiler.span('work', thread=i):
+                    profiler.count('thread{}'.format(i))
+                    time.sleep(1e-4)
+
+        with profiler:
+            threads = [
+                threading.Thread(target=work, args=(i,)) for i in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(profiler.spans), 200)
+        for span in profiler.spans:
+            self.assertEqual(span.children, [])
+            self.assertEqual(
+                list(span.counters), ['thread{}'.format(span.attrs['thread'])]
+            )
+        for i in range(4):
+            self.assertEqual(profiler.counters['thread{}'.format(i)], 50)
+
+
 class TestSequenceFunctions(unittest.TestCase):
 
     def setUp(self):
@@ -305,6 +410,61 @@ class TestSequenceFunctions(unittest.TestCase):
         assert len(np.where(indtopoN)[0]) == 8212
 
 
+class TestSurfaceIndex(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(1)
+        xy = np.random.rand(2000, 2)*200. - 100.
+        self.topo = np.c_[xy, -20. + 5.*np.sin(xy[:, 0]/20.)]
+
+        def refine(cell):
+            if np.abs(cell.center[2] + 20.) < 15.:
+                return 5
+            return 3
+
+        self.mesh = Mesh.TreeMesh(
+            [[(5., 32)], [(5., 32)], [(5., 32)]], x0='CCC'
+        )
+        self.mesh.refine(refine)
+
+    def test_tree_active_cells(self):
+        mesh, topo = self.mesh, self.topo
+        actind = surface2ind_topo(mesh, topo)
+
+        # brute force nearest topography point for every cell
+        r = (
+            (mesh.gridCC[:, None, 0] - topo[None, :, 0])**2 +
+            (mesh.gridCC[:, None, 1] - topo[None, :, 1])**2
+        )
+        ztopo = topo[np.argmin(r, axis=1), 2]
+        self.assertTrue(np.all(actind == (mesh.gridCC[:, 2] < ztopo)))
+
+    def test_cache(self):
+        surface_index = get_surface_index(self.mesh, self.topo)
+        self.assertIs(
+            surface_index, get_surface_index(self.mesh, self.topo.copy())
+        )
+        actind = surface2ind_topo(self.mesh, self.topo)
+        self.assertEqual(len(surface_index._active), 1)
+
+        # drape onto the top of the active columns
+        pts = np.random.rand(10, 2)*100. - 50.
+        inds, z = surface_index.drape(pts, actind)
+        locs, elevation = surface_index.surface(actind)
+        self.assertTrue(np.allclose(z, elevation[inds]))
+
+    def test_cache_release(self):
+        mesh = Mesh.TensorMesh([8, 8, 8], x0='CCN')
+        surface2ind_topo(mesh, self.topo)
+        ref = weakref.ref(mesh)
+        n_cached = len(modelutils._SURFACE_INDEX_CACHE)
+
+        del mesh
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(len(modelutils._SURFACE_INDEX_CACHE), n_cached - 1)
+
+
 class TestDiagEst(unittest.TestCase):
 
     def setUp(self):
@@ -323,6 +483,108 @@ class TestDiagEst(unittest.TestCase):
         print('Testing probing. {}'.format(err))
         self.assertTrue(err < TOL)
 
+    def testBlocks(self):
+        Adiagtest = diagEst(self.A, self.n, 100, 'probing', blockSize=32)
+        self.assertTrue(np.allclose(
+            Adiagtest, diagEst(self.A, self.n, 100, 'probing')
+        ))
+
+    def testAtA(self):
+        B = np.random.rand(40, 60)
+        AtAdiag = np.sum(B**2, axis=0)
+        d = diagEstAtA(B.T, 40, approach='Exact', blockSize=16)
+        self.assertTrue(np.allclose(d, AtAdiag))
+        d = diagEstAtA(B.T, 40, k=4000, approach='Ones', blockSize=500)
+        self.assertTrue(
+            np.linalg.norm(d - AtAdiag) < 0.1*np.linalg.norm(AtAdiag)
+        )
+
+
+class TestEigEst(unittest.TestCase):
+
+    def test_eigEstMax(self):
+        n = 200
+        rand = np.random.RandomState(2)
+        Q = np.linalg.qr(rand.randn(n, n))[0]
+        lam = np.logspace(2, -2, n)
+        A = (Q * lam).dot(Q.T)
+
+        for approach in ['Power', 'Lanczos']:
+            est, err = eigEstMax(
+                A, n, k=3, nIter=8, approach=approach, X0=rand.rand(n, 3)
+            )
+            print('Testing {}. {} +/- {}'.format(approach, est, err))
+            self.assertTrue(est <= lam.max()*(1 + 1e-10))
+            self.assertTrue(abs(est - lam.max()) < max(err, 1e-2*lam.max()))
+
+        # the Krylov subspace of a low rank matrix is exhausted
+        B = rand.randn(n, 3)
+        est, err = eigEstMax(B.dot(B.T), n, nIter=5, X0=rand.rand(n, 2))
+        self.assertTrue(np.allclose(est, np.linalg.eigvalsh(B.T.dot(B)).max()))
+        self.assertTrue(err < 1e-6*est)
+
+
+class TestBackgroundWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_records(self):
+        fname = os.path.join(self.directory, 'out.rec')
+        writer = BackgroundWriter()
+        m = np.arange(5.)
+        for i in range(3):
+            writer.write_record(fname, {'iter': i, 'm': m, 'eps': None})
+            m += 1.  # the record keeps the values at the time of the call
+        writer.flush()
+        records = read_records(fname)
+        self.assertEqual(len(records), 3)
+        for i, record in enumerate(records):
+            self.assertEqual(sorted(record), ['iter', 'm'])
+            self.assertEqual(record['iter'], i)
+            self.assertTrue(np.all(record['m'] == np.arange(5.) + i))
+
+        # truncate and append
+        writer.write_record(fname, {'iter': 3}, mode='wb')
+        writer.write_record(fname, {'iter': 4})
+        writer.close()
+        self.assertEqual([r['iter'] for r in read_records(fname)], [3, 4])
+
+    def test_release(self):
+        # restarting and closing the writer does not keep it alive
+        fname = os.path.join(self.directory, 'out.txt')
+        writer = BackgroundWriter()
+        for i in range(3):
+            writer.write_text(fname, 'line\n')
+            self.assertIn(writer, io_utils._RUNNING_WRITERS)
+            writer.close()
+        self.assertNotIn(writer, io_utils._RUNNING_WRITERS)
+        ref = weakref.ref(writer)
+        del writer
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_text(self):
+        fname = os.path.join(self.directory, 'out.txt')
+        writer = BackgroundWriter()
+        writer.write_text(fname, 'header\n', mode='w')
+        writer.write_text(fname, 'line\n')
+        writer.save(os.path.join(self.directory, 'm'), np.ones(3))
+        writer.close()
+        with open(fname) as f:
+            self.assertEqual(f.read(), 'header\nline\n')
+
+        self.assertTrue(np.all(
+            np.load(os.path.join(self.directory, 'm.npy')) == 1.
+        ))
+
+        writer.write_text(os.path.join(self.directory, 'no', 'file'), '')
+        with self.assertRaises(IOError):
+            writer.flush()
+
 
 class TestDownload(unittest.TestCase):
     def test_downloads(self):
@@ -0,0 +1,103 @@
+from __future__ import print_function
+import unittest
+import numpy as np
+from SimPEG.Utils import uniqueRows
+from SimPEG.EM.Static import DC, Utils as DCUtils
+
+SURVEY_TYPES = ['dipole-dipole', 'pole-dipole', 'dipole-pole', 'pole-pole']
+
+
+class SurveyArraysTests(unittest.TestCase):
+
+    def setUp(self):
+        self.endl3D = np.array([[-100., -20., 0.], [100., 20., 0.]])
+        self.endl2D = np.array([[-100., 0.], [100., 0.]])
+
+    def compare_surveys(self, survey, survey_arrays):
+        self.assertEqual(survey.nD, survey_arrays.nD)
+        survey.getABMN_locations()
+        self.assertTrue(
+            np.allclose(survey.a_locations, survey_arrays.a_locations)
+        )
+        self.assertTrue(
+            np.allclose(survey.b_locations, survey_arrays.b_locations)
+        )
+        self.assertTrue(
+            np.allclose(survey.m_locations, survey_arrays.m_locations)
+        )
+        self.assertTrue(
+            np.allclose(survey.n_locations, survey_arrays.n_locations)
+        )
+
+    def test_gen_survey(self):
+        for dim, endl in zip([2, 3], [self.endl2D, self.endl3D]):
+            for survey_type in SURVEY_TYPES:
+                survey = DCUtils.gen_DCIPsurvey(
+                    endl, survey_type, 5., 5., 8, dim=dim
+                )
+                survey_arrays = DCUtils.gen_DCIPsurvey_arrays(
+                    endl, survey_type, 5., 5., 8, dim=dim
+                )
+                self.assertEqual(survey_arrays.survey_type, survey_type)
+                self.compare_surveys(survey, survey_arrays)
+
+                G = DCUtils.geometric_factor(survey, survey_type=survey_type)
+                self.assertTrue(
+                    np.allclose(G, survey_arrays.geometric_factor())
+                )
+
+                midx, midz = DCUtils.source_receiver_midpoints(
+                    survey, survey_type=survey_type, dim=dim
+                )
+                midx_arr, midz_arr = survey_arrays.source_receiver_midpoints()
+                self.assertTrue(np.allclose(midx, midx_arr))
+                self.assertTrue(np.allclose(midz, midz_arr))
+
+    def test_from_survey(self):
+        for survey_type in SURVEY_TYPES:
+            survey = DCUtils.gen_DCIPsurvey(
+                self.endl3D, survey_type, 5., 5., 8, dim=3
+            )
+            survey_arrays = DC.SurveyArrays.from_survey(survey)
+            self.assertEqual(survey_arrays.survey_type, survey_type)
+            self.compare_surveys(survey, survey_arrays)
+
+    def test_lazy_srcList(self):
+        survey_arrays = DCUtils.gen_DCIPsurvey_arrays(
+            self.endl2D, 'dipole-dipole', 5., 5., 8, dim=2
+        )
+        survey = survey_arrays.to_survey()
+        self.assertIsInstance(survey, DC.Survey_ky)
+        self.assertIsNone(getattr(survey, '_srcList', None))
+        self.assertEqual(survey.nD, survey_arrays.nD)
+
+        # geometry utilities do not expand the sources
+        G = DCUtils.geometric_factor(survey)
+        self.assertIsNone(getattr(survey, '_srcList', None))
+
+        reference = DCUtils.gen_DCIPsurvey(
+            self.endl2D, 'dipole-dipole', 5., 5., 8, dim=2
+        )
+        self.assertEqual(survey.nSrc, reference.nSrc)
+        self.assertTrue(np.all(survey.vnD == reference.vnD))
+        self.assertIsInstance(survey.srcList[0].rxList[0], DC.Rx.Dipole_ky)
+        self.assertTrue(
+            np.allclose(G, DCUtils.geometric_factor(reference))
+        )
+
+    def test_electrode_table(self):
+        survey_arrays = DCUtils.gen_DCIPsurvey_arrays(
+            self.endl3D, 'pole-dipole', 5., 5., 8, dim=3
+        )
+        self.assertTrue(np.all(survey_arrays.b == -1))
+        self.assertEqual(
+            uniqueRows(survey_arrays.electrodes)[0].shape[0],
+            survey_arrays.electrodes.shape[0]
+        )
+        sep = survey_arrays.electrode_separations(['AB', 'AM'])
+        self.assertTrue(np.all(np.isinf(sep['AB'])))
+        self.assertTrue(np.all(sep['AM'] > 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
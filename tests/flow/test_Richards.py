@@ -116,6 +116,18 @@ class BaseRichardsTest(unittest.TestCase):
         )
         self.assertTrue(passed, True)
 
+    def _dotest_jacobian_blocks(self):
+        Hs = self.prob.fields(self.mtrue)
+        blocks = self.prob.jacobian_blocks(self.mtrue, Hs)
+        self.prob.Jvec(self.mtrue, np.ones(len(self.mtrue)), f=Hs)
+        self.prob.Jtvec(self.mtrue, np.ones(self.survey.nD), f=Hs)
+        self.assertIs(self.prob.jacobian_blocks(self.mtrue, Hs), blocks)
+        self.assertTrue(all(Ainv is not None for Ainv in blocks._Ainv))
+
+        self.prob.model = self.mtrue + 0.1
+        self.assertIsNone(self.prob._jacobian_blocks)
+        self.assertTrue(all(Ainv is None for Ainv in blocks._Ainv))
+
 
 class RichardsTests1D(BaseRichardsTest):
 
@@ -157,6 +169,9 @@ class RichardsTests1D(BaseRichardsTest):
     def test_sensitivity_full(self):
         self._dotest_sensitivity_full()
 
+    def test_jacobian_blocks(self):
+        self._dotest_jacobian_blocks()
+
 
 class RichardsTests1D_Saturation(RichardsTests1D):
 
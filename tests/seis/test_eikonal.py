@@ -0,0 +1,74 @@
+import numpy as np
+import unittest
+
+from SimPEG.SEIS import Eikonal
+from SimPEG import Utils, Mesh, Maps
+
+
+class EikonalTest(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(1)
+        M = Mesh.TensorMesh([30, 25])
+        y = np.linspace(0.05, 0.95, 8)
+        rlocs = np.c_[y*0 + 0.97, y]
+        rx = Eikonal.Rx(rlocs, None)
+
+        srcList = [
+            Eikonal.Src(loc=np.r_[0.03, yi], rxList=[rx]) for yi in y[::2]
+        ]
+
+        survey = Eikonal.Survey(srcList)
+        problem = Eikonal.Problem(M, slownessMap=Maps.IdentityMap(M))
+        problem.pair(survey)
+
+        self.M = M
+        self.problem = problem
+        self.survey = survey
+        self.distance = np.hstack([
+            np.sqrt(np.sum((rlocs - src.loc)**2, axis=1)) for src in srcList
+        ])
+
+    def test_homogeneous_traveltimes(self):
+        s = 2.*np.ones(self.M.nC)
+        d = self.survey.dpred(s)
+        self.assertTrue(
+            np.allclose(d, 2.*self.distance, rtol=1e-2)
+        )
+        # the rays are straight in a homogeneous model
+        self.assertTrue(
+            np.allclose(
+                np.asarray(self.problem.A.sum(axis=1)).ravel(),
+                self.distance, rtol=1e-2
+            )
+        )
+
+    def test_fast_sweeping_3D(self):
+        M = Mesh.TensorMesh([12, 10, 8])
+        src = np.array([[0.5, 0.5, 0.5], [0.1, 0.2, 0.9]])
+        T = Eikonal.fast_sweeping(M, np.ones(M.nC), src)
+        r = np.sqrt(
+            np.sum((M.gridCC[None, :, :] - src[:, None, :])**2, axis=2)
+        )
+        self.assertEqual(T.shape, (2, M.nC))
+        self.assertLess(np.abs(T - r).max(), 0.1*r.max())
+
+    def test_adjoint(self):
+        s = np.abs(Utils.mkvc(
+            Utils.ModelBuilder.randomModel(self.M.vnC, seed=2)
+        )) + 0.5
+        v = np.random.randn(self.M.nC)
+        w = np.random.randn(self.survey.nD)
+        self.assertAlmostEqual(
+            w.dot(self.problem.Jvec(s, v)), v.dot(self.problem.Jtvec(s, w))
+        )
+
+    def test_model_update(self):
+        self.survey.dpred(np.ones(self.M.nC))
+        A = self.problem.A
+        self.problem.model = 2.*np.ones(self.M.nC)
+        self.assertIsNot(self.problem.A, A)
+
+
+if __name__ == '__main__':
+    unittest.main()
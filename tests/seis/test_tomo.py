@@ -3,6 +3,7 @@ import scipy.sparse as sp
 import unittest
 
 from SimPEG.SEIS import StraightRay
+from SimPEG.SEIS.StraightRay.StraightRayProblem import lineintegral
 from SimPEG import Tests, Utils, Mesh, Maps
 
 TOL = 1e-5
@@ -39,6 +40,52 @@ class TomoTest(unittest.TestCase):
             return self.survey.dpred(x), lambda x: self.problem.Jvec(s, x)
         return Tests.checkDerivative(fun, s, num=4, plotIt=False, eps=FLR)
 
+
+class RayTracingTest(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(2)
+
+    def test_lineintegral_2D(self):
+        M = Mesh.TensorMesh([np.random.rand(12)+0.5, np.random.rand(10)+0.5])
+        src = np.random.rand(20, 2)*np.r_[M.hx.sum(), M.hy.sum()]
+        rx = np.random.rand(20, 2)*np.r_[M.hx.sum(), M.hy.sum()]
+
+        A = StraightRay.ray_integral_matrix(M, src, rx).toarray()
+        A_loop = np.zeros_like(A)
+        for i in range(src.shape[0]):
+            inds, V = lineintegral(M, src[i, :], rx[i, :])
+            A_loop[i, inds] = V
+        self.assertTrue(np.allclose(A, A_loop))
+
+    def test_ray_length_3D(self):
+        src = np.random.rand(500, 3) - 0.5
+        rx = np.random.rand(500, 3) - 0.5
+        length = np.linalg.norm(rx - src, axis=1)
+
+        M = Mesh.TensorMesh([16, 12, 10], x0='CCC')
+        A = StraightRay.ray_integral_matrix(
+            M, src, rx, parallelized=True, n_cpu=2, chunk_size=100
+        )
+        self.assertTrue(np.allclose(A.sum(axis=1).A1, length))
+
+        # rays leaving the mesh only count the length inside
+        A = StraightRay.ray_integral_matrix(M, 2*src, 2*rx)
+        self.assertTrue(np.all(A.sum(axis=1).A1 <= 2*length + 1e-10))
+
+    def test_tree(self):
+        src = np.random.rand(100, 3)
+        rx = np.random.rand(100, 3)
+
+        M = Mesh.TreeMesh([[(1./16, 16)], [(1./16, 16)], [(1./16, 16)]])
+        M.insert_cells(np.r_[[[0.5, 0.5, 0.5]]], [4], finalize=True)
+        A = StraightRay.ray_integral_matrix(M, src, rx)
+        self.assertEqual(A.shape, (100, M.nC))
+        self.assertTrue(
+            np.allclose(A.sum(axis=1).A1, np.linalg.norm(rx - src, axis=1))
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
 